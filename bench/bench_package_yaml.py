@@ -0,0 +1,207 @@
+#!/usr/local/bin/asicpy
+####################################################################################
+#   Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved.
+#   The following information is considered proprietary and confidential to Facebook,
+#   and may not be disclosed to any third party nor be used for any purpose other
+#   than to full fill service obligations to Facebook
+####################################################################################
+
+"""
+!@package bench_package_yaml
+bench_package_yaml.py times gen_package_yaml_file on a synthetic top, by default
+200 instances of 40 ports each spread over 800 nets. The SHA-1 of the generated
+inst_conns JSON and package YAML is printed with the time, so running it with
+--repo pointing at another checkout (for example a git worktree of an older
+commit) compares both the run time and the output of two versions.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import os
+import os.path
+import random
+import shutil
+import sys
+import tempfile
+import time
+import types
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_cmd_line_args():
+    """!
+    Parse the command line arguments of the benchmark.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Time gen_package_yaml_file on a synthetic top."
+    )
+
+    parser.add_argument(
+        "-r",
+        "--repo",
+        default=REPO_DIR,
+        dest="repo_dir",
+        help="veripy checkout to benchmark. Defaults to this checkout.",
+    )
+
+    parser.add_argument(
+        "-i",
+        "--instances",
+        type=int,
+        default=200,
+        dest="instances",
+        help="Number of instances of the top. Defaults to 200.",
+    )
+
+    parser.add_argument(
+        "-p",
+        "--ports",
+        type=int,
+        default=40,
+        dest="ports",
+        help="Number of ports of each instance. Defaults to 40.",
+    )
+
+    parser.add_argument(
+        "-n",
+        "--nets",
+        type=int,
+        default=800,
+        dest="nets",
+        help="Number of nets connecting the instances. Defaults to 800.",
+    )
+
+    parser.add_argument(
+        "-s",
+        "--seed",
+        type=int,
+        default=1,
+        dest="seed",
+        help="Seed of the synthetic top. Defaults to 1.",
+    )
+
+    return parser.parse_args()
+
+
+def gen_synthetic_top(seed, num_insts, num_ports, num_nets):
+    """!
+    Generate the arguments of gen_package_yaml_file for a synthetic top. The
+    instance ports are tied off, floating, or connected to a top port, a net
+    or a bit of a bus, and a few instance names are reused.
+
+    @param seed seed of the random generator
+    @param num_insts number of instances
+    @param num_ports number of ports of each instance
+    @param num_nets number of nets connecting the instances
+    """
+
+    rng = random.Random(seed)
+
+    ports = {f"p{i}": {"bitdef": rng.choice(["", "3:0"])} for i in range(5)}
+    ports["NC_a"] = {"bitdef": "1:0"}
+    ports["VDD_x"] = {"bitdef": ""}
+
+    inst_files = {}
+    inst_modules = []
+    inst_ports = {}
+
+    for inst_index in range(num_insts):
+        inst_name = f"u{inst_index}"
+        if num_insts > 3 and rng.random() < 0.05:
+            inst_name = f"u{inst_index % (num_insts - 1)}"
+
+        instantiation = (f"m{inst_index % 7}", inst_name, inst_index)
+        inst_modules.append(instantiation)
+        inst_files[instantiation] = f"/x/infra_asic_fpga/m{inst_index % 7}.sv"
+        inst_ports[instantiation] = {}
+
+        for port_index in range(num_ports):
+            topname = rng.choice(
+                [
+                    None,
+                    "",
+                    "'0",
+                    "VDD_x",
+                    f"p{rng.randrange(5)}",
+                    f"n{rng.randrange(num_nets)}",
+                    f"e{rng.randrange(3)}[{rng.randrange(3)}]",
+                ]
+            )
+            inst_ports[instantiation][f"q{port_index}"] = {
+                "topname": topname,
+                "topbitdef": rng.choice(["", "3:0", None]),
+                "bitdef": rng.choice(["", "1:0"]),
+            }
+
+    cmdline = types.SimpleNamespace(chip="zeus")
+
+    return ("top", ports, cmdline, inst_files, inst_modules, inst_ports)
+
+
+def get_file_digest(file_name):
+    """!
+    Get the SHA-1 of a file.
+
+    @param file_name file to hash
+    """
+
+    with open(file_name, "rb") as digest_file:
+        return hashlib.sha1(digest_file.read()).hexdigest()
+
+
+def main():
+    """
+    Main function to run in script.
+    """
+
+    cmdline = get_cmd_line_args()
+    repo_dir = os.path.abspath(cmdline.repo_dir)
+
+    os.environ.setdefault("FB_CHIP", "zeus")
+    os.environ.setdefault("ASIC_VENDOR", "brcm_apd_n3")
+    sys.path.insert(0, repo_dir)
+
+    import veripy
+
+    top_args = gen_synthetic_top(
+        cmdline.seed, cmdline.instances, cmdline.ports, cmdline.nets
+    )
+
+    work_dir = tempfile.mkdtemp(prefix="package_yaml_bench")
+    saved_cwd = os.getcwd()
+
+    try:
+        os.chdir(work_dir)
+        veripy.output_file = os.path.join(work_dir, "top.sv")
+        veripy.inst_conns = {}
+        veripy.inst_conn_set = set()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            start_time = time.perf_counter()
+            veripy.gen_package_yaml_file(*top_args)
+            run_time = time.perf_counter() - start_time
+
+        json_digest = get_file_digest("top_inst_conns.json")
+        yaml_digest = get_file_digest("top.yaml")
+    finally:
+        os.chdir(saved_cwd)
+        shutil.rmtree(work_dir)
+
+    print(
+        "### "
+        + str(cmdline.instances)
+        + " instances x "
+        + str(cmdline.ports)
+        + " ports: gen_package_yaml_file ran in "
+        + f"{run_time:.2f}s"
+    )
+    print("  # inst_conns JSON sha1: " + json_digest)
+    print("  # package YAML sha1: " + yaml_digest)
+
+
+if __name__ == "__main__":
+    main()
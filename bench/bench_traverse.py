@@ -0,0 +1,163 @@
+#!/usr/local/bin/asicpy
+####################################################################################
+#   Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved.
+#   The following information is considered proprietary and confidential to Facebook,
+#   and may not be disclosed to any third party nor be used for any purpose other
+#   than to full fill service obligations to Facebook
+####################################################################################
+
+"""
+!@package bench_traverse
+bench_traverse.py times the processing of the systemverilog CST
+(verilog_parser.process, the traverse_veripy_nodes walk) on synthetic modules.
+Each module has an always_ff block with N nonblocking assignments, and the
+module is compiled in-process once per size. The time per statement stays
+flat when the traversal is linear in the size of the tree. Point --repo at
+another checkout (for example a git worktree of an older commit) to compare
+two versions.
+verible-verilog-syntax is run from the PATH, as for veripy.py.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import os.path
+import shutil
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_cmd_line_args():
+    """!
+    Parse the command line arguments of the benchmark.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Time the CST traversal on synthetic modules of several sizes."
+    )
+
+    parser.add_argument(
+        "-r",
+        "--repo",
+        default=REPO_DIR,
+        dest="repo_dir",
+        help="veripy checkout to benchmark. Defaults to this checkout.",
+    )
+
+    parser.add_argument(
+        "-s",
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[2500, 5000, 10000, 20000],
+        dest="sizes",
+        help="Number of statements of the synthetic modules. \
+            Defaults to 2500 5000 10000 20000.",
+    )
+
+    return parser.parse_args()
+
+
+def gen_synthetic_module(module_name, num_stmts):
+    """!
+    Generate a module with an always_ff block of nonblocking assignments.
+
+    @param module_name name of the module
+    @param num_stmts number of nonblocking assignments
+    """
+
+    lines = [
+        "module " + module_name + " (",
+        " input clk,",
+        " input [31:0] a,",
+        " output reg [31:0] q",
+        ");",
+        "always_ff @(posedge clk) begin",
+    ]
+
+    for stmt_index in range(num_stmts):
+        lines.append("  q <= a + " + str(stmt_index) + ";")
+
+    lines.append("end")
+    lines.append("endmodule")
+
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    """
+    Main function to run in script.
+    """
+
+    cmdline = get_cmd_line_args()
+    repo_dir = os.path.abspath(cmdline.repo_dir)
+
+    os.environ.setdefault("FB_CHIP", "zeus")
+    os.environ.setdefault("ASIC_VENDOR", "brcm_apd_n3")
+    sys.path.insert(0, repo_dir)
+
+    import veripy
+    import src.verilog_parser
+
+    code = veripy.load_main_code()
+    tables = veripy.snapshot_module_tables()
+
+    process_stats = {"calls": 0, "time": 0.0}
+    sv_process = src.verilog_parser.verilog_parser.process
+
+    def timed_process(self, *args, **kwargs):
+        start_time = time.perf_counter()
+
+        try:
+            return sv_process(self, *args, **kwargs)
+        finally:
+            process_stats["calls"] += 1
+            process_stats["time"] += time.perf_counter() - start_time
+
+    src.verilog_parser.verilog_parser.process = timed_process
+
+    work_dir = tempfile.mkdtemp(prefix="traverse_bench")
+    saved_cwd = os.getcwd()
+
+    print("### CST processing time of an always_ff with N nonblocking assignments")
+
+    try:
+        os.chdir(work_dir)
+
+        for num_stmts in cmdline.sizes:
+            module_name = "bench_traverse_" + str(num_stmts)
+            with open(module_name + ".psv", "w") as psv_file:
+                psv_file.write(gen_synthetic_module(module_name, num_stmts))
+
+            process_stats["calls"] = 0
+            process_stats["time"] = 0.0
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                with contextlib.redirect_stderr(io.StringIO()):
+                    try:
+                        veripy.run_main(code, [module_name + ".psv"], tables)
+                    except SystemExit:
+                        pass
+
+            if not process_stats["calls"]:
+                print("  # N = " + str(num_stmts) + ": no CST was processed")
+                continue
+
+            print(
+                "  # N = "
+                + str(num_stmts)
+                + ": "
+                + f"{process_stats['time']:.2f}s, "
+                + f"{process_stats['time'] * 1e6 / num_stmts:.1f}us per statement"
+            )
+    finally:
+        os.chdir(saved_cwd)
+        shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/local/bin/asicpy
+####################################################################################
+#   Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved.
+#   The following information is considered proprietary and confidential to Facebook,
+#   and may not be disclosed to any third party nor be used for any purpose other
+#   than to full fill service obligations to Facebook
+####################################################################################
+
+"""
+!@package bench_vp_parse
+bench_vp_parse.py times the parse of the veripy construct sections
+(veripy_parser.parse) over the demo/ and unit_tests/ .psv files. The files are
+compiled in-process, in a copy of their directory, and only the time spent in
+veripy_parser.parse is reported. Point --repo at another checkout (for example
+a git worktree of an older commit) to compare two versions.
+verible-verilog-syntax is run from the PATH, as for veripy.py.
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import os.path
+import shutil
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_cmd_line_args():
+    """!
+    Parse the command line arguments of the benchmark.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Time veripy_parser.parse over the demo/ and unit_tests/ \
+            .psv files."
+    )
+
+    parser.add_argument(
+        "-r",
+        "--repo",
+        default=REPO_DIR,
+        dest="repo_dir",
+        help="veripy checkout to benchmark. Defaults to this checkout.",
+    )
+
+    parser.add_argument(
+        "-n",
+        "--passes",
+        type=int,
+        default=3,
+        dest="passes",
+        help="Number of passes over the files. Defaults to 3.",
+    )
+
+    return parser.parse_args()
+
+
+def get_psv_files(repo_dir):
+    """!
+    Get the .psv files of the demo/ and unit_tests/ directories.
+
+    @param repo_dir veripy checkout
+    """
+
+    return sorted(
+        glob.glob(os.path.join(repo_dir, "unit_tests", "case*", "*.psv"))
+        + glob.glob(os.path.join(repo_dir, "demo", "*", "*.psv"))
+    )
+
+
+def main():
+    """
+    Main function to run in script.
+    """
+
+    cmdline = get_cmd_line_args()
+    repo_dir = os.path.abspath(cmdline.repo_dir)
+
+    os.environ.setdefault("FB_CHIP", "zeus")
+    os.environ.setdefault("ASIC_VENDOR", "brcm_apd_n3")
+    sys.path.insert(0, repo_dir)
+
+    import veripy
+    import src.veripy_parser
+
+    code = veripy.load_main_code()
+    tables = veripy.snapshot_module_tables()
+
+    parse_stats = {"calls": 0, "time": 0.0}
+    vp_parse = src.veripy_parser.veripy_parser.parse
+
+    def timed_parse(self, *args, **kwargs):
+        start_time = time.perf_counter()
+
+        try:
+            return vp_parse(self, *args, **kwargs)
+        finally:
+            parse_stats["calls"] += 1
+            parse_stats["time"] += time.perf_counter() - start_time
+
+    src.veripy_parser.veripy_parser.parse = timed_parse
+
+    psv_files = get_psv_files(repo_dir)
+    work_dir = tempfile.mkdtemp(prefix="vp_parse_bench")
+    saved_cwd = os.getcwd()
+
+    try:
+        for psv_file in psv_files:
+            psv_dir = os.path.relpath(os.path.dirname(psv_file), repo_dir)
+            shutil.copytree(
+                os.path.dirname(psv_file),
+                os.path.join(work_dir, psv_dir.replace(os.sep, "_")),
+                dirs_exist_ok=True,
+            )
+
+        for c_pass in range(cmdline.passes):
+            for psv_file in psv_files:
+                psv_dir = os.path.relpath(os.path.dirname(psv_file), repo_dir)
+                os.chdir(os.path.join(work_dir, psv_dir.replace(os.sep, "_")))
+
+                with contextlib.redirect_stdout(io.StringIO()):
+                    with contextlib.redirect_stderr(io.StringIO()):
+                        try:
+                            veripy.run_main(
+                                code, [os.path.basename(psv_file)], tables
+                            )
+                        except SystemExit:
+                            pass
+    finally:
+        os.chdir(saved_cwd)
+        shutil.rmtree(work_dir)
+
+    print(
+        "### "
+        + str(len(psv_files))
+        + " files x "
+        + str(cmdline.passes)
+        + " passes: "
+        + str(parse_stats["calls"])
+        + " vp construct sections parsed in "
+        + f"{parse_stats['time']:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
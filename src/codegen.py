@@ -21,6 +21,7 @@ import subprocess
 import sys
 from .utils import *
 from .regex import *
+from .const_expr import g_const_expr
 from collections import OrderedDict
 from csv import reader
 from math import ceil, log
@@ -28,6 +29,7 @@ from typing import Dict, Set
 
 import oyaml as yaml
 
+from .file_index import g_file_index_store
 from .memgen import memgen
 from verilog_generator import *
 
@@ -59,6 +61,7 @@ class codegen:
         self.remove_code = rm_code
         self.incl_dirs = incl_dirs
         self.files = files
+        self.files_index = None
         self.debug = debug_en
         self.debug_file = debug_file + ".codegen"
         self.gen_dependencies = gen_dependencies
@@ -181,16 +184,16 @@ class codegen:
 
     def find_in_files(self, filename):
         """
-        Function to print a debug string in a debug dump file
+        Function to find a file in the files list
         """
 
-        for c_file in self.files:
-            file_search_regex = "\\b" + filename + "$"
-            RE_SEARCH_FILE_REGEX = re.compile(file_search_regex)
-            search_file_regex = RE_SEARCH_FILE_REGEX.search(c_file)
+        if self.files_index is None:
+            self.files_index = g_file_index_store.get_index(
+                [(None, c_file) for c_file in self.files]
+            )
 
-            if search_file_regex:
-                return c_file
+        for tag, c_file in self.files_index.find_file(filename):
+            return c_file
         return
 
     def hash_def_getval(self, hash_def_exp):
@@ -205,14 +208,18 @@ class codegen:
         hash_eval_string = ""
         for hash_split in hash_def_exp_split:
             if hash_split in self.hash_defines:
-                hash_eval_string = hash_eval_string + str(
-                    self.hash_defines[hash_split]["val"]
-                )
-            else:
-                hash_eval_string = hash_eval_string + hash_split
+                hash_split = str(self.hash_defines[hash_split]["val"])
+
+            # Keep the words apart, as in A and not B
+            if RE_WORD_END.search(hash_eval_string) and RE_WORD_START.match(
+                hash_split
+            ):
+                hash_eval_string = hash_eval_string + " "
+
+            hash_eval_string = hash_eval_string + hash_split
 
         try:
-            hash_eval_string_val = eval(hash_eval_string)
+            hash_eval_string_val = g_const_expr.evaluate(hash_eval_string)
         except (SyntaxError, NameError, TypeError, ZeroDivisionError):
             hash_eval_string_val = ""
 
@@ -310,6 +317,15 @@ class codegen:
             return hash_ifdef_str in self.hash_defines
         else:
             ifdef_exp_val = self.hash_def_getval(hash_ifdef_str)
+
+            # Unsupported syntax or unknown names would drop the branch silently
+            if ifdef_exp_val[0] != "NUMBER":
+                print(
+                    "\nWarning: Unable to evaluate the following #if expression"
+                    + " to a number, its branch is not taken\n"
+                    + hash_ifdef_str
+                )
+
             return ifdef_exp_val[0] == "NUMBER" and ifdef_exp_val[1]
 
     def hash_ifdef_proc(self, hash_ifdef_type, hash_ifdef_str):
@@ -0,0 +1,431 @@
+####################################################################################
+#   Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved.
+#   The following information is considered proprietary and confidential to Facebook,
+#   and may not be disclosed to any third party nor be used for any purpose other
+#   than to full fill service obligations to Facebook
+####################################################################################
+
+import ast
+import re
+
+# Entries kept in each memo of the evaluator before it is cleared
+CONST_EXPR_MEMO_SIZE = 65536
+
+RE_CONST_EXPR_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<based>(?:\d[\d_]*\s*)?'[sS]?[bBoOdDhH]\s*[0-9a-fA-FxXzZ?_]+)
+      | (?P<unbased>'[01xXzZ](?![\w']))
+      | (?P<number>0[xX][0-9a-fA-F_]+|0[oO][0-7_]+|0[bB][01_]+
+          |(?:\d[\d_]*(?:\.[\d_]*)?|\.\d[\d_]*)(?:[eE][+-]?\d+)?)
+      | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<name>\$?[A-Za-z_]\w*)
+      | (?P<op><<<|>>>|===|!==|\*\*|//|<<|>>|<=|>=|==|!=|&&|\|\||~\^|\^~
+          |[-+*/%<>!~&|^?:(),])
+    )""",
+    re.VERBOSE,
+)
+RE_CONST_EXPR_BASED = re.compile(
+    r"^(?:(\d[\d_]*)\s*)?'[sS]?([bBoOdDhH])\s*([0-9a-fA-FxXzZ?_]+)$"
+)
+
+# Binary operators by precedence, lowest first. All of them are left associative.
+CONST_EXPR_BINARY_OPS = [
+    ["||"],
+    ["&&"],
+    ["|"],
+    ["^", "^~", "~^"],
+    ["&"],
+    ["==", "!=", "===", "!=="],
+    ["<", "<=", ">", ">="],
+    ["<<", ">>", "<<<", ">>>"],
+    ["+", "-"],
+    ["*", "/", "//", "%"],
+    ["**"],
+]
+
+CONST_EXPR_BASES = {"b": 2, "o": 8, "d": 10, "h": 16}
+
+# Python constants and keyword operators, which the eval based code accepted
+CONST_EXPR_CONSTANTS = {"True": True, "False": False, "None": None}
+CONST_EXPR_KEYWORD_OPS = ["and", "or", "not"]
+
+
+def const_expr_clog2(value):
+    """
+    Function to return the ceiling log base two of a value, like $clog2
+    """
+    if isinstance(value, str) or value < 0:
+        raise TypeError("$clog2 expects a positive number")
+
+    addr_size, shifter = 0, 1
+    while value > shifter:
+        shifter <<= 1
+        addr_size += 1
+
+    return addr_size
+
+
+# $clog2 and the Python builtins the eval based code was used with
+CONST_EXPR_FUNCTIONS = {
+    "$clog2": const_expr_clog2,
+    "abs": abs,
+    "float": float,
+    "int": int,
+    "max": max,
+    "min": min,
+    "round": round,
+}
+
+
+def const_expr_binary(op, left, right):
+    """
+    Function to apply a binary operator. Arithmetic is Python's, so / still
+    returns a real number and the callers truncate it like before.
+    """
+    if op == "+":
+        return left + right
+    elif op == "-":
+        return left - right
+    elif op == "*":
+        return left * right
+    elif op == "/":
+        return left / right
+    elif op == "//":
+        return left // right
+    elif op == "%":
+        return left % right
+    elif op == "**":
+        return left**right
+    elif op in ["<<", "<<<"]:
+        return left << right
+    elif op in [">>", ">>>"]:
+        return left >> right
+    elif op == "&":
+        return left & right
+    elif op == "|":
+        return left | right
+    elif op == "^":
+        return left ^ right
+    elif op in ["^~", "~^"]:
+        return ~(left ^ right)
+    elif op in ["==", "==="]:
+        return int(left == right)
+    elif op in ["!=", "!=="]:
+        return int(left != right)
+    elif op == "<":
+        return int(left < right)
+    elif op == "<=":
+        return int(left <= right)
+    elif op == ">":
+        return int(left > right)
+    elif op == ">=":
+        return int(left >= right)
+
+    raise SyntaxError("unsupported operator " + op)
+
+
+################################################################################
+# Parser of SystemVerilog constant expressions
+#
+# An expression is parsed into a tree of tuples:
+#   ("num", value), ("name", name), ("unary", op, expr),
+#   ("binary", op, left, right), ("cond", cond, if_true, if_false),
+#   ("call", function, [args]) and, for the Python keyword operators,
+#   ("and", left, right), ("or", left, right) and ("not", expr)
+# The keyword operators bind looser than all the SV operators, and not
+# looser than and, like in Python.
+# Parse errors are raised as SyntaxError, like eval did.
+################################################################################
+class const_expr_parser:
+    def __init__(self, expr):
+        self.expr = expr
+        self.tokens = self.tokenize(expr)
+        self.pos = 0
+
+    def tokenize(self, expr):
+        tokens = []
+        pos = 0
+        end = len(expr.rstrip())
+
+        while pos < end:
+            token_regex = RE_CONST_EXPR_TOKEN.match(expr, pos)
+
+            if not token_regex or token_regex.end() == pos:
+                raise SyntaxError("invalid constant expression " + expr)
+
+            kind = token_regex.lastgroup
+            tokens.append((kind, token_regex.group(kind)))
+            pos = token_regex.end()
+
+        return tokens
+
+    def peek(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+
+        return (None, None)
+
+    def take(self, op=None):
+        kind, text = self.peek()
+
+        if kind is None or (op is not None and (kind != "op" or text != op)):
+            raise SyntaxError("invalid constant expression " + self.expr)
+
+        self.pos += 1
+
+        return kind, text
+
+    def parse(self):
+        tree = self.parse_cond()
+
+        if self.pos != len(self.tokens):
+            raise SyntaxError("invalid constant expression " + self.expr)
+
+        return tree
+
+    def parse_cond(self):
+        cond = self.parse_or()
+
+        if self.peek() == ("op", "?"):
+            self.take("?")
+            if_true = self.parse_cond()
+            self.take(":")
+            if_false = self.parse_cond()
+
+            return ("cond", cond, if_true, if_false)
+
+        return cond
+
+    def parse_or(self):
+        left = self.parse_and()
+
+        while self.peek() == ("name", "or"):
+            self.take()
+            left = ("or", left, self.parse_and())
+
+        return left
+
+    def parse_and(self):
+        left = self.parse_not()
+
+        while self.peek() == ("name", "and"):
+            self.take()
+            left = ("and", left, self.parse_not())
+
+        return left
+
+    def parse_not(self):
+        if self.peek() == ("name", "not"):
+            self.take()
+
+            return ("not", self.parse_not())
+
+        return self.parse_binary(0)
+
+    def parse_binary(self, level):
+        if level == len(CONST_EXPR_BINARY_OPS):
+            return self.parse_unary()
+
+        left = self.parse_binary(level + 1)
+
+        while True:
+            kind, text = self.peek()
+
+            if kind != "op" or text not in CONST_EXPR_BINARY_OPS[level]:
+                return left
+
+            self.take()
+            left = ("binary", text, left, self.parse_binary(level + 1))
+
+    def parse_unary(self):
+        kind, text = self.peek()
+
+        if kind == "op" and text in ["+", "-", "!", "~"]:
+            self.take()
+
+            return ("unary", text, self.parse_unary())
+
+        return self.parse_primary()
+
+    def parse_primary(self):
+        kind, text = self.take()
+
+        if kind == "op" and text == "(":
+            tree = self.parse_cond()
+            self.take(")")
+
+            return tree
+        elif kind == "number":
+            return ("num", self.get_number(text))
+        elif kind == "based":
+            return ("num", self.get_based_number(text))
+        elif kind == "unbased":
+            if text != "'0":
+                raise SyntaxError("unsized literal " + text + " has no value")
+
+            return ("num", 0)
+        elif kind == "string":
+            return ("num", ast.literal_eval(text))
+        elif kind == "name" and text not in CONST_EXPR_KEYWORD_OPS:
+            if self.peek() == ("op", "("):
+                self.take("(")
+                args = [self.parse_cond()]
+
+                while self.peek() == ("op", ","):
+                    self.take(",")
+                    args.append(self.parse_cond())
+
+                self.take(")")
+
+                return ("call", text, args)
+
+            return ("name", text)
+
+        raise SyntaxError("invalid constant expression " + self.expr)
+
+    def get_number(self, text):
+        text = text.replace("_", "")
+
+        if text[:2].lower() in ["0x", "0o", "0b"]:
+            return int(text, 0)
+        elif "." in text or "e" in text.lower():
+            return float(text)
+
+        return int(text, 10)
+
+    def get_based_number(self, text):
+        based_regex = RE_CONST_EXPR_BASED.match(text)
+        digits = based_regex.group(3).replace("_", "")
+
+        try:
+            value = int(digits, CONST_EXPR_BASES[based_regex.group(2).lower()])
+        except ValueError:
+            # x/z/? digits have no value
+            raise SyntaxError("literal " + text + " has no value")
+
+        if based_regex.group(1) is not None:
+            value &= (1 << int(based_regex.group(1).replace("_", ""))) - 1
+
+        return value
+
+
+################################################################################
+# Evaluator of the constant expressions of `define, parameter and bitdef math
+#
+# Expressions are parsed once and their results are memoized. The callers
+# substitute the parameter and `define values in the expression text first, so
+# the text of an expression is its own key, and the only names left are the
+# Python constants eval accepted.
+#
+# Errors are raised with the types eval raised (SyntaxError, NameError,
+# TypeError, ZeroDivisionError), which the callers already handle.
+################################################################################
+class const_expr_evaluator:
+    def __init__(self):
+        self.trees = {}
+        self.values = {}
+
+    def parse(self, expr):
+        """
+        Function to return the parse tree of an expression
+        """
+        tree = self.trees.get(expr)
+
+        if tree is None:
+            try:
+                tree = const_expr_parser(expr).parse()
+            except SyntaxError as error:
+                tree = ("error", SyntaxError, str(error))
+
+            if len(self.trees) >= CONST_EXPR_MEMO_SIZE:
+                self.trees.clear()
+
+            self.trees[expr] = tree
+
+        return tree
+
+    def evaluate(self, expr):
+        """
+        Function to return the value of a constant expression
+        """
+        value = self.values.get(expr)
+
+        if value is None:
+            try:
+                value = ("value", self.get_value(self.parse(expr)))
+            except (SyntaxError, NameError, TypeError, ZeroDivisionError) as error:
+                value = ("error", type(error), str(error))
+            except (ValueError, OverflowError, RecursionError) as error:
+                value = ("error", TypeError, str(error))
+
+            if len(self.values) >= CONST_EXPR_MEMO_SIZE:
+                self.values.clear()
+
+            self.values[expr] = value
+
+        if value[0] == "error":
+            raise value[1](value[2])
+
+        return value[1]
+
+    def get_value(self, tree):
+        node = tree[0]
+
+        if node == "num":
+            return tree[1]
+        elif node == "name":
+            if tree[1] in CONST_EXPR_CONSTANTS:
+                return CONST_EXPR_CONSTANTS[tree[1]]
+
+            raise NameError("name '" + tree[1] + "' is not defined")
+        elif node == "unary":
+            value = self.get_value(tree[2])
+
+            if tree[1] == "-":
+                return -value
+            elif tree[1] == "+":
+                return +value
+            elif tree[1] == "~":
+                return ~value
+
+            return int(not value)
+        elif node == "binary":
+            op = tree[1]
+            left = self.get_value(tree[2])
+
+            # Logical operators only evaluate the right side when needed
+            if op == "&&":
+                return int(bool(left) and bool(self.get_value(tree[3])))
+            elif op == "||":
+                return int(bool(left) or bool(self.get_value(tree[3])))
+
+            return const_expr_binary(op, left, self.get_value(tree[3]))
+        elif node == "and":
+            # Like Python, the value of the operand deciding the result
+            return self.get_value(tree[1]) and self.get_value(tree[2])
+        elif node == "or":
+            return self.get_value(tree[1]) or self.get_value(tree[2])
+        elif node == "not":
+            return not self.get_value(tree[1])
+        elif node == "cond":
+            if self.get_value(tree[1]):
+                return self.get_value(tree[2])
+
+            return self.get_value(tree[3])
+        elif node == "call":
+            if tree[1] not in CONST_EXPR_FUNCTIONS:
+                raise NameError("function '" + tree[1] + "' is not supported")
+
+            return CONST_EXPR_FUNCTIONS[tree[1]](
+                *[self.get_value(arg) for arg in tree[2]]
+            )
+
+        raise tree[1](tree[2])
+
+    def clear(self):
+        self.trees = {}
+        self.values = {}
+
+
+# Constant expressions are shared by all the parser and codegen objects
+g_const_expr = const_expr_evaluator()
@@ -0,0 +1,270 @@
+####################################################################################
+#   Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved.
+#   The following information is considered proprietary and confidential to Facebook,
+#   and may not be disclosed to any third party nor be used for any purpose other
+#   than to full fill service obligations to Facebook
+####################################################################################
+
+import bisect
+import hashlib
+import json
+import os
+import os.path
+import re
+import tempfile
+
+from .package_store import g_package_store, is_private_stat
+from .regex import RE_IP_FILE_REGEX
+
+# Bumped when the layout of the index changes
+FILE_INDEX_VERSION = 2
+
+RE_WORD_START = re.compile(r"(?<!\w)\w")
+RE_PLAIN_FILE_NAME = re.compile(r"^\w[\w./-]*$")
+RE_PLAIN_MODULE_NAME = re.compile(r"^\w+$")
+RE_MODULE_DECL = re.compile(r"^\s*module\s+(\w+)")
+
+
+################################################################################
+# Index of the files of a filelist
+#
+# The files are looked up by name, matching the end of the path on a word
+# boundary the way the "\b<name>$" search over the filelist did, and by module
+# name, matching the files whose name starts with the module name and the IP
+# release files. Lookups return the matching files in filelist order, so the
+# first match is the one the linear search found.
+#
+# Indexes are built once per filelist content and shared by all the parser,
+# codegen and spec_flow objects of the process. With a package store cache
+# directory, their tables are also written to disk as JSON for the next runs.
+# Module declarations are only scanned in the files matching the module name.
+################################################################################
+class file_index:
+    def __init__(self, entries, tables=None):
+        self.entries = entries
+        self.names = {}
+        self.roots = {}
+        self.ip_files = []
+
+        if tables is not None:
+            self.set_tables(tables)
+            return
+
+        for order, (tag, c_file) in enumerate(entries):
+            c_file_base = os.path.basename(c_file)
+
+            # Every word boundary suffix of the file name
+            for word_start in RE_WORD_START.finditer(c_file_base):
+                self.names.setdefault(c_file_base[word_start.start() :], []).append(
+                    order
+                )
+
+            c_file_root, c_file_ext = os.path.splitext(c_file)
+            self.roots.setdefault(c_file_ext, []).append(
+                (os.path.basename(c_file_root), order)
+            )
+
+            if RE_IP_FILE_REGEX.search(c_file):
+                self.ip_files.append(order)
+
+        for c_file_ext in self.roots:
+            self.roots[c_file_ext].sort()
+
+    def get_tables(self):
+        """
+        Function to return the tables of the index as plain JSON data
+        """
+        return {"names": self.names, "roots": self.roots, "ip_files": self.ip_files}
+
+    def set_tables(self, tables):
+        """
+        Function to set the tables of the index from the JSON data
+        """
+        self.names = tables["names"]
+        self.roots = {
+            c_file_ext: [tuple(root) for root in roots]
+            for c_file_ext, roots in tables["roots"].items()
+        }
+        self.ip_files = tables["ip_files"]
+
+    def find_file(self, filename):
+        """
+        Function to return the (tag, file) entries ending with the file name
+        """
+        if not RE_PLAIN_FILE_NAME.match(filename) or not RE_WORD_START.match(
+            os.path.basename(filename)
+        ):
+            RE_SEARCH_FILE_REGEX = re.compile("\\b" + filename + "$")
+
+            return [
+                (tag, c_file)
+                for tag, c_file in self.entries
+                if RE_SEARCH_FILE_REGEX.search(c_file)
+            ]
+
+        matches = []
+
+        for order in self.names.get(os.path.basename(filename), []):
+            tag, c_file = self.entries[order]
+
+            if "/" not in filename or (
+                c_file.endswith(filename)
+                and (
+                    len(c_file) == len(filename)
+                    or not re.match(r"\w", c_file[-len(filename) - 1])
+                )
+            ):
+                matches.append((tag, c_file))
+
+        return matches
+
+    def find_module(self, module_name, module_ext):
+        """
+        Function to return the (tag, file) entries defining the module
+        """
+        if RE_PLAIN_MODULE_NAME.match(module_name):
+            roots = self.roots.get(module_ext, [])
+            orders = set(self.ip_files)
+
+            index = bisect.bisect_left(roots, (module_name,))
+            while index < len(roots) and roots[index][0].startswith(module_name):
+                orders.add(roots[index][1])
+                index += 1
+
+            candidates = [self.entries[order] for order in sorted(orders)]
+        else:
+            candidates = []
+
+            for tag, c_file in self.entries:
+                c_file_root, c_file_ext = os.path.splitext(c_file)
+
+                if RE_IP_FILE_REGEX.search(c_file) or (
+                    re.match(f"^{module_name}", os.path.basename(c_file_root))
+                    and module_ext == c_file_ext
+                ):
+                    candidates.append((tag, c_file))
+
+        return [
+            (tag, c_file)
+            for tag, c_file in candidates
+            if g_file_index_store.find_module_in_file(module_name, c_file)
+        ]
+
+
+################################################################################
+# File indexes and module declarations of the process
+#
+# Kept in an object rather than module level tables, so a compile server keeps
+# them warm between runs.
+################################################################################
+class file_index_store:
+    def __init__(self):
+        self.indexes = {}
+        self.module_defs = {}
+
+    def get_index(self, entries):
+        """
+        Function to return the index of a list of (tag, file) entries, building
+        it only once per filelist content
+        """
+        key = hashlib.sha1(repr((FILE_INDEX_VERSION, entries)).encode()).hexdigest()
+        index = self.indexes.get(key)
+
+        if index is not None:
+            return index
+
+        cache_file = None
+
+        if g_package_store.cache_dir != "":
+            cache_file = os.path.join(g_package_store.cache_dir, "files", key + ".json")
+
+            try:
+                with open(cache_file, "r") as cache_data:
+                    # Files other users could have written are not trusted
+                    if is_private_stat(os.fstat(cache_data.fileno())):
+                        index = file_index(list(entries), json.load(cache_data))
+            except Exception:
+                # Missing or truncated file, rewritten below
+                index = None
+
+        if index is None:
+            index = file_index(list(entries))
+
+            if cache_file is not None:
+                self.write_cache_file(cache_file, index)
+
+        self.indexes[key] = index
+
+        return index
+
+    def write_cache_file(self, cache_file, index):
+        """
+        Function to write a file index to the on-disk store
+        """
+        tmp_file = None
+
+        try:
+            os.makedirs(os.path.dirname(cache_file), mode=0o700, exist_ok=True)
+            fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(cache_file))
+
+            with os.fdopen(fd, "w") as cache_data:
+                json.dump(index.get_tables(), cache_data)
+
+            os.replace(tmp_file, cache_file)
+        except (OSError, TypeError, ValueError):
+            print("    Warning: Unable to write the file index " + cache_file)
+
+            if tmp_file is not None and os.path.isfile(tmp_file):
+                os.remove(tmp_file)
+
+    def find_module_in_file(self, module_name, file_name):
+        """
+        Function to check if a file declares the module. The declarations of a
+        file are scanned once and kept until the file changes.
+        """
+        try:
+            st = os.stat(file_name)
+        except OSError:
+            return False
+
+        stat_key = (st.st_size, st.st_mtime_ns)
+        cached = self.module_defs.get(file_name)
+
+        if cached is None or cached[0] != stat_key:
+            module_defs = set()
+
+            try:
+                with open(file_name) as fp:
+                    for line in fp:
+                        module_decl_regex = RE_MODULE_DECL.match(line)
+
+                        if module_decl_regex:
+                            module_defs.add(module_decl_regex.group(1))
+            except (UnicodeDecodeError, OSError):
+                # Declarations before an undecodable line are still found
+                pass
+
+            cached = (stat_key, module_defs)
+            self.module_defs[file_name] = cached
+
+        if RE_PLAIN_MODULE_NAME.match(module_name):
+            return module_name in cached[1]
+
+        # Module names with regex characters keep the original line match
+        try:
+            with open(file_name) as fp:
+                for line in fp:
+                    if re.match(f"^\\s*module\\s+{module_name}\\b.*$", line):
+                        return True
+        except (UnicodeDecodeError, OSError):
+            pass
+
+        return False
+
+    def clear(self):
+        self.indexes = {}
+        self.module_defs = {}
+
+
+# File lookups are shared by all the parser instances of the process
+g_file_index_store = file_index_store()
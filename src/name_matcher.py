@@ -0,0 +1,108 @@
+####################################################################################
+#   Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved.
+#   The following information is considered proprietary and confidential to Facebook,
+#   and may not be disclosed to any third party nor be used for any purpose other
+#   than to full fill service obligations to Facebook
+####################################################################################
+
+import re
+
+from .regex import RE_REGEX_SLASH
+
+
+################################################################################
+# Set of name patterns, each a plain name or a /regular expression/
+#
+# Plain names are looked up in a dict. The regular expressions without groups
+# are joined in a single alternation, which matches a name when any of them
+# does, so a name matching no pattern costs a lookup and one regex search.
+# Regular expressions with groups, whose back references would be renumbered
+# in the alternation, are searched one by one.
+#
+# With empty_regex False, "//" is a plain name like in the &Force commands,
+# otherwise it is the empty regular expression matching every name.
+################################################################################
+class name_matcher:
+    def __init__(self, patterns=(), empty_regex=True):
+        self.empty_regex = empty_regex
+        self.names = {}
+        self.regexes = []
+        self.combined = None
+        self.grouped = None
+        self.count = 0
+
+        for pattern in patterns:
+            self.add(pattern)
+
+    def add(self, pattern):
+        """
+        Function to add a pattern, compiled once here
+        """
+        slash_regex = RE_REGEX_SLASH.search(pattern)
+
+        if slash_regex and (slash_regex.group(1) != "" or self.empty_regex):
+            self.regexes.append((self.count, re.compile(slash_regex.group(1))))
+
+            # Rebuilt by the next lookup
+            self.combined = None
+            self.grouped = None
+        else:
+            self.names.setdefault(pattern, []).append(self.count)
+
+        self.count += 1
+
+    def compile_regexes(self):
+        alternatives = [regex for index, regex in self.regexes if regex.groups == 0]
+        self.grouped = [regex for index, regex in self.regexes if regex.groups != 0]
+        self.combined = False
+
+        if alternatives:
+            try:
+                self.combined = re.compile(
+                    "|".join("(?:" + regex.pattern + ")" for regex in alternatives)
+                )
+            except re.error:
+                # e.g. global inline flags, only allowed at the start
+                self.grouped = [regex for index, regex in self.regexes]
+
+    def match(self, name):
+        """
+        Function to check if any pattern matches the name
+        """
+        if name in self.names:
+            return True
+
+        if not self.regexes:
+            return False
+
+        if self.combined is None:
+            self.compile_regexes()
+
+        if self.combined and self.combined.search(name):
+            return True
+
+        return any(regex.search(name) for regex in self.grouped)
+
+    def matches(self, name):
+        """
+        Function to return the indexes of the patterns matching the name, in the
+        order they were added
+        """
+        indexes = self.names.get(name, [])
+
+        if not self.regexes:
+            return indexes
+
+        if self.combined is None:
+            self.compile_regexes()
+
+        if self.grouped or (self.combined and self.combined.search(name)):
+            indexes = sorted(
+                indexes
+                + [index for index, regex in self.regexes if regex.search(name)]
+            )
+
+        return indexes
+
+    def __len__(self):
+        return self.count
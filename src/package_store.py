@@ -0,0 +1,423 @@
+####################################################################################
+#   Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved.
+#   The following information is considered proprietary and confidential to Facebook,
+#   and may not be disclosed to any third party nor be used for any purpose other
+#   than to full fill service obligations to Facebook
+####################################################################################
+
+import copy
+import glob
+import hashlib
+import marshal
+import os
+import os.path
+import stat
+import tempfile
+from collections import OrderedDict, defaultdict
+
+import oyaml as yaml
+
+# Bumped when the layout of the entries changes
+PACKAGE_STORE_VERSION = 4
+
+# First item of the tuples standing for the containers marshal cannot write
+MARSHAL_TAG = b"package_store"
+
+# Default factories of the defaultdict tables written to disk
+MARSHAL_FACTORIES = {"dict": dict, "int": int, "list": list, "set": set}
+
+
+def is_private_stat(st):
+    """
+    Function to check that a file or directory is owned by the current user and
+    that no other user can write to it
+    """
+    return st.st_uid == os.getuid() and not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def to_marshal(value):
+    """
+    Function to convert the tables to the core types marshal writes. OrderedDict
+    and defaultdict tables are written as tagged tuples, other types are left
+    to marshal, which rejects them with a ValueError.
+    """
+    if isinstance(value, OrderedDict):
+        items = [(to_marshal(key), to_marshal(item)) for key, item in value.items()]
+        return (MARSHAL_TAG, "OrderedDict", items)
+
+    if isinstance(value, defaultdict):
+        factory = getattr(value.default_factory, "__name__", None)
+
+        if MARSHAL_FACTORIES.get(factory) is not value.default_factory:
+            raise ValueError("unmarshallable defaultdict factory")
+
+        items = [(to_marshal(key), to_marshal(item)) for key, item in value.items()]
+        return (MARSHAL_TAG, "defaultdict", factory, items)
+
+    if type(value) is dict:
+        return {to_marshal(key): to_marshal(item) for key, item in value.items()}
+
+    if type(value) is list:
+        return [to_marshal(item) for item in value]
+
+    if type(value) is tuple:
+        if value and value[0] == MARSHAL_TAG:
+            return (MARSHAL_TAG, "tuple", [to_marshal(item) for item in value])
+
+        return tuple(to_marshal(item) for item in value)
+
+    return value
+
+
+def from_marshal(value):
+    """
+    Function to convert the tables read from disk back to their types
+    """
+    if type(value) is dict:
+        return {from_marshal(key): from_marshal(item) for key, item in value.items()}
+
+    if type(value) is list:
+        return [from_marshal(item) for item in value]
+
+    if type(value) is not tuple:
+        return value
+
+    if not value or value[0] != MARSHAL_TAG:
+        return tuple(from_marshal(item) for item in value)
+
+    if value[1] == "OrderedDict":
+        return OrderedDict(
+            (from_marshal(key), from_marshal(item)) for key, item in value[2]
+        )
+
+    if value[1] == "defaultdict":
+        table = defaultdict(MARSHAL_FACTORIES[value[2]])
+        table.update((from_marshal(key), from_marshal(item)) for key, item in value[3])
+        return table
+
+    return tuple(from_marshal(item) for item in value[2])
+
+
+################################################################################
+# Store of parsed package/`include file results
+#
+# A package or `include file parse is a pure function of the file contents and
+# the parser tables it reads and writes. Each entry records the resulting
+# tables, keyed by the file and a fingerprint of the tables before the load,
+# so repeated loads (every sub-module instance, every request of a compile
+# server) are replayed instead of re-parsed. Entries are validated against the
+# content hash of every file read during the original parse.
+#
+# As the key holds the fingerprint of the tables before the load, an entry only
+# records the table entries the load added, changed or removed. They are kept
+# as marshal data, an immutable table shared by all the runs, and a hit loads
+# a copy of them over the tables of the run.
+#
+# The ports and tables of a sub-module are kept the same way, so repeated
+# instances of a module only parse it once.
+#
+# Interface spec and def YAML files are kept the same way.
+#
+# With a cache directory, entries are also written to disk, so the next runs
+# replay them instead of parsing the packages again. Disk entries are keyed by
+# the entry key and the content hash of the parser sources. They only hold
+# plain tables written with marshal, OrderedDict and defaultdict tables are
+# converted to tagged tuples and back. Only directories and files owned by
+# the user and not writable by others are used, so a shared directory cannot
+# feed forged entries to the parser.
+################################################################################
+class package_store:
+    def __init__(self):
+        self.entries = {}
+        self.yaml_files = {}
+        self.stat_index = {}
+        self.cache_dir = ""
+        self.tool_hash = None
+        self.hits = 0
+        self.misses = 0
+
+    def set_cache_dir(self, cache_dir):
+        """
+        Function to set the directory of the on-disk store. An empty directory
+        keeps the store in memory only, as does a directory other users can
+        write to.
+        """
+        if cache_dir != "":
+            cache_dir = os.path.abspath(os.path.expandvars(cache_dir))
+
+            if os.path.exists(cache_dir) and not is_private_stat(os.stat(cache_dir)):
+                print(
+                    "    Warning: Ignoring the package store directory "
+                    + cache_dir
+                    + ", other users can write to it"
+                )
+                cache_dir = ""
+
+        self.cache_dir = cache_dir
+
+    def file_hash(self, fname):
+        """
+        Function to return the content hash of a file, skipping the read when
+        size and mtime did not change since the last call
+        """
+        try:
+            st = os.stat(fname)
+        except OSError:
+            return None
+
+        stat_key = (st.st_size, st.st_mtime_ns)
+        cached = self.stat_index.get(fname)
+
+        if cached is not None and cached[0] == stat_key:
+            return cached[1]
+
+        with open(fname, "rb") as f_data:
+            digest = hashlib.sha1(f_data.read()).hexdigest()
+
+        self.stat_index[fname] = (stat_key, digest)
+
+        return digest
+
+    def fingerprint(self, values):
+        """
+        Function to return a fingerprint of the parser tables
+        """
+        return hashlib.sha1(repr(values).encode()).hexdigest()
+
+    def cache_file(self, key):
+        """
+        Function to return the on-disk file of an entry
+        """
+        if self.tool_hash is None:
+            src_hash = hashlib.sha1()
+
+            src_files = glob.glob(os.path.join(os.path.dirname(__file__), "*.py"))
+
+            for fname in sorted(src_files):
+                src_hash.update(str(self.file_hash(fname)).encode())
+
+            self.tool_hash = src_hash.hexdigest()
+
+        digest = hashlib.sha1(
+            repr((PACKAGE_STORE_VERSION, marshal.version, self.tool_hash, key)).encode()
+        ).hexdigest()
+
+        return os.path.join(self.cache_dir, digest[:2], digest + ".entry")
+
+    def lookup(self, key, resolve):
+        """
+        Function to return a valid entry for the key or None
+        """
+        entry = self.entries.get(key)
+
+        if entry is None and self.cache_dir != "":
+            try:
+                with open(self.cache_file(key), "rb") as cache_data:
+                    # Files other users could have written are not trusted
+                    if is_private_stat(os.fstat(cache_data.fileno())):
+                        entry = from_marshal(marshal.load(cache_data))
+            except Exception:
+                # Missing, truncated or stale file, rewritten on the next store
+                entry = None
+
+            if entry is not None:
+                self.entries[key] = entry
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        for fname, digest in entry["files"]:
+            if self.file_hash(fname) != digest:
+                del self.entries[key]
+                self.misses += 1
+                return None
+
+        # Nested imports must still resolve to the same files
+        for inc_file, tick_inc_file in entry["loads"]:
+            if resolve(inc_file) != tick_inc_file:
+                del self.entries[key]
+                self.misses += 1
+                return None
+
+        self.hits += 1
+
+        return entry
+
+    def snapshot(self, values):
+        """
+        Function to return the fingerprints of the entries of the parser tables,
+        so the store records only the entries a load changes
+        """
+        return [
+            {key: self.fingerprint(item) for key, item in value.items()}
+            if isinstance(value, dict)
+            else None
+            for value in values
+        ]
+
+    def get_changes(self, before, value):
+        """
+        Function to return the changes of a parser table since its snapshot. The
+        whole table is recorded when it is not a table, or when the changes do
+        not keep the order of its entries.
+        """
+        if before is None or not isinstance(value, dict):
+            return {"value": value}
+
+        kept = [key for key in before if key in value]
+        added = [key for key in value if key not in before]
+
+        if list(value) != kept + added:
+            return {"value": value}
+
+        updated = {
+            key: item
+            for key, item in value.items()
+            if key not in before or before[key] != self.fingerprint(item)
+        }
+
+        return {
+            "update": updated,
+            "remove": [key for key in before if key not in value],
+        }
+
+    def freeze(self, value):
+        """
+        Function to return an immutable copy of a table, its marshal data. The
+        tables marshal cannot write are deep-copied instead.
+        """
+        try:
+            return marshal.dumps(to_marshal(value))
+        except ValueError:
+            return [copy.deepcopy(value)]
+
+    def thaw(self, frozen):
+        """
+        Function to return a new copy of a table recorded by freeze()
+        """
+        if not isinstance(frozen, bytes):
+            return copy.deepcopy(frozen[0])
+
+        value = marshal.loads(frozen)
+
+        # Only the data holding tagged tuples needs converting
+        if MARSHAL_TAG in frozen:
+            value = from_marshal(value)
+
+        return value
+
+    def store(
+        self, key, files, filelist, loads, attrs, state, functions, output, before=None
+    ):
+        """
+        Function to record the result of a package/`include file load. With the
+        snapshot of the tables before the load, only the changed entries of the
+        tables are recorded.
+        """
+        digests = []
+
+        for fname in files:
+            digest = self.file_hash(fname)
+
+            if digest is None:
+                return
+
+            digests.append((fname, digest))
+
+        if before is None:
+            before = [None] * len(state)
+
+        entry = {
+            "files": digests,
+            "filelist": list(filelist),
+            "loads": loads,
+            "attrs": list(attrs),
+            "state": [
+                self.freeze(self.get_changes(table_before, value))
+                for table_before, value in zip(before, state)
+            ],
+            "functions": copy.deepcopy(functions),
+            "output": output,
+        }
+
+        self.entries[key] = entry
+
+        if self.cache_dir != "":
+            self.write_cache_file(key, entry)
+
+    def write_cache_file(self, key, entry):
+        """
+        Function to write an entry to the on-disk store. The file is replaced
+        atomically, as parallel runs share the store.
+        """
+        cache_file = self.cache_file(key)
+        tmp_file = None
+
+        try:
+            os.makedirs(os.path.dirname(cache_file), mode=0o700, exist_ok=True)
+            fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(cache_file))
+
+            with os.fdopen(fd, "wb") as cache_data:
+                marshal.dump(to_marshal(entry), cache_data)
+
+            os.replace(tmp_file, cache_file)
+        except (OSError, ValueError):
+            print("    Warning: Unable to write the package store file " + cache_file)
+
+            if tmp_file is not None and os.path.isfile(tmp_file):
+                os.remove(tmp_file)
+
+    def load_yaml(self, fname):
+        """
+        Function to load a YAML file, parsing it only when it changed since
+        the last load
+        """
+        digest = self.file_hash(fname)
+        cached = self.yaml_files.get(fname)
+
+        if cached is None or cached[0] != digest:
+            with open(fname, "r") as yaml_data:
+                cached = (digest, yaml.load(yaml_data.read(), Loader=yaml.FullLoader))
+
+            self.yaml_files[fname] = cached
+
+        return copy.deepcopy(cached[1])
+
+    def restore(self, obj, attrs, changes):
+        """
+        Function to restore the recorded tables of an entry. Tables are updated
+        in place as other objects may hold references to them. Only the changed
+        entries are loaded, the tables of the run already hold the others.
+        """
+        for attr, frozen_changes in zip(attrs, changes):
+            table_changes = self.thaw(frozen_changes)
+            curr_value = getattr(obj, attr, None)
+
+            if "value" not in table_changes:
+                for key in table_changes["remove"]:
+                    del curr_value[key]
+
+                curr_value.update(table_changes["update"])
+                continue
+
+            value = table_changes["value"]
+
+            if isinstance(value, dict) and isinstance(curr_value, dict):
+                curr_value.clear()
+                curr_value.update(value)
+            elif isinstance(value, list) and isinstance(curr_value, list):
+                curr_value[:] = value
+            else:
+                setattr(obj, attr, value)
+
+    def clear(self):
+        self.entries = {}
+        self.yaml_files = {}
+        self.stat_index = {}
+        self.hits = 0
+        self.misses = 0
+
+
+# Package loads are shared by all the parser instances of the process
+g_package_store = package_store()
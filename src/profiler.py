@@ -0,0 +1,376 @@
+####################################################################################
+#   Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved.
+#   The following information is considered proprietary and confidential to Facebook,
+#   and may not be disclosed to any third party nor be used for any purpose other
+#   than to full fill service obligations to Facebook
+####################################################################################
+
+import atexit
+import json
+import os
+import re
+import sys
+import time
+
+# Number of entries of each table in the printed report
+PROFILE_TOP_N = 10
+
+# re functions timed when called through the module level re
+RE_FUNCTIONS = ["search", "match", "fullmatch", "sub", "subn", "findall", "split"]
+
+
+def record_time(table, key, elapsed_time):
+    """
+    Function to add a call to the hits/total/max entry of a key
+    """
+    stats = table.get(key)
+
+    if stats is None:
+        table[key] = {"hits": 1, "total_time": elapsed_time, "max_time": elapsed_time}
+    else:
+        stats["hits"] += 1
+        stats["total_time"] += elapsed_time
+        if elapsed_time > stats["max_time"]:
+            stats["max_time"] = elapsed_time
+
+
+class profiled_pattern:
+    """
+    Compiled pattern timing its calls. Anything else is the compiled pattern's.
+    """
+
+    def __init__(self, profiler, name, pattern):
+        self.profiler = profiler
+        self.name = name
+        self.compiled = pattern
+
+    def __getattr__(self, attr):
+        return getattr(self.compiled, attr)
+
+    def search(self, *args, **kwargs):
+        return self.profiler.call(self.name, self.compiled.search, args, kwargs)
+
+    def match(self, *args, **kwargs):
+        return self.profiler.call(self.name, self.compiled.match, args, kwargs)
+
+    def fullmatch(self, *args, **kwargs):
+        return self.profiler.call(self.name, self.compiled.fullmatch, args, kwargs)
+
+    def sub(self, *args, **kwargs):
+        return self.profiler.call(self.name, self.compiled.sub, args, kwargs)
+
+    def subn(self, *args, **kwargs):
+        return self.profiler.call(self.name, self.compiled.subn, args, kwargs)
+
+    def findall(self, *args, **kwargs):
+        return self.profiler.call(self.name, self.compiled.findall, args, kwargs)
+
+    def finditer(self, *args, **kwargs):
+        return self.profiler.call(self.name, self.compiled.finditer, args, kwargs)
+
+    def split(self, *args, **kwargs):
+        return self.profiler.call(self.name, self.compiled.split, args, kwargs)
+
+
+class profiled_re:
+    """
+    Stand-in for the re module in the profiled modules, timing the module level
+    functions and compiling timed patterns. Anything else is the re module's.
+    """
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+        for func_name in RE_FUNCTIONS:
+            setattr(self, func_name, self.get_function(getattr(re, func_name)))
+
+    def __getattr__(self, attr):
+        return getattr(re, attr)
+
+    def get_function(self, func):
+        profiler = self.profiler
+
+        def profiled_function(pattern, *args, **kwargs):
+            if isinstance(pattern, profiled_pattern):
+                return profiler.call(pattern.name, func, (pattern.compiled,) + args, kwargs)
+
+            return profiler.call(
+                profiler.get_pattern_name(pattern), func, (pattern,) + args, kwargs
+            )
+
+        return profiled_function
+
+    def finditer(self, pattern, *args, **kwargs):
+        if isinstance(pattern, profiled_pattern):
+            pattern = pattern.compiled
+
+        return self.profiler.call(
+            self.profiler.get_pattern_name(pattern), re.finditer, (pattern,) + args, kwargs
+        )
+
+    def compile(self, pattern, flags=0):
+        if isinstance(pattern, profiled_pattern):
+            return pattern
+
+        return self.profiler.get_profiled_pattern(re.compile(pattern, flags))
+
+
+class null_phase:
+    """
+    Phase of a disabled profiler
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+NULL_PHASE = null_phase()
+
+
+class profiled_phase:
+    """
+    Phase of an enabled profiler
+    """
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.begin_phase(self.name)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.end_phase(self.name)
+        return False
+
+
+################################################################################
+# Profiler of the run phases and regular expressions
+#
+# When started, the compiled patterns (RE_* and the lists/dicts of patterns) and
+# the re module of the profiled modules are swapped with timed stand-ins, and
+# restored when stopped. A disabled profiler patches nothing, so only the
+# phase() calls remain, which return a shared no-op context.
+#
+# Phases are inclusive, a phase started within another one is also counted in
+# the outer one. The report has hits, total and max time per phase, per pattern,
+# per caller and per caller/pattern pair. It is written in JSON and the top
+# entries are printed.
+################################################################################
+class profiler:
+    def __init__(self):
+        self.enabled = False
+        self.profile_file = ""
+        self.label = ""
+        self.patched = []
+        self.patterns = {}
+        self.pattern_names = {}
+        self.open_phases = []
+        self.clear_stats()
+        self.exit_registered = False
+
+    def clear_stats(self):
+        self.start_time = 0
+        self.phase_stats = {}
+        self.pattern_stats = {}
+        self.caller_stats = {}
+        self.pattern_caller_stats = {}
+
+    def start(self, profile_file, label, namespaces):
+        """
+        Function to start profiling the phases and the regular expressions of the
+        module namespaces
+        """
+        if self.enabled:
+            self.stop()
+
+        self.enabled = True
+        self.profile_file = profile_file
+        self.label = label
+        self.open_phases = []
+        self.clear_stats()
+
+        # Pattern names from the namespaces, src.regex names come first
+        for namespace in namespaces:
+            for name, value in namespace.items():
+                if isinstance(value, re.Pattern):
+                    self.pattern_names.setdefault(id(value), name)
+
+        re_stand_in = profiled_re(self)
+
+        for namespace in namespaces:
+            if namespace is globals():
+                continue
+
+            for name, value in list(namespace.items()):
+                if value is re:
+                    self.patch(namespace, name, re_stand_in)
+                elif isinstance(value, re.Pattern):
+                    self.patch(namespace, name, self.get_profiled_pattern(value))
+                elif isinstance(value, list) and value:
+                    if all(isinstance(item, re.Pattern) for item in value):
+                        for index, item in enumerate(value):
+                            self.patch(value, index, self.get_profiled_pattern(item))
+                elif isinstance(value, dict) and value:
+                    if all(isinstance(item, re.Pattern) for item in value.values()):
+                        for key, item in list(value.items()):
+                            self.patch(value, key, self.get_profiled_pattern(item))
+
+        if not self.exit_registered:
+            atexit.register(self.stop)
+            self.exit_registered = True
+
+        self.start_time = time.perf_counter()
+
+    def start_phases(self, label):
+        """
+        Function to start timing the run phases only, without a report. Nothing
+        is changed when profiling is already started.
+        """
+        if self.enabled:
+            return
+
+        self.enabled = True
+        self.profile_file = ""
+        self.label = label
+        self.open_phases = []
+        self.clear_stats()
+        self.start_time = time.perf_counter()
+
+    def patch(self, container, key, value):
+        self.patched.append((container, key, container[key]))
+        container[key] = value
+
+    def get_pattern_name(self, pattern):
+        if isinstance(pattern, re.Pattern):
+            return self.pattern_names.get(id(pattern), pattern.pattern)
+
+        return str(pattern)
+
+    def get_profiled_pattern(self, pattern):
+        profiled = self.patterns.get(id(pattern))
+
+        if profiled is None:
+            profiled = profiled_pattern(self, self.get_pattern_name(pattern), pattern)
+            # The pattern is kept, so its id is not reused
+            self.patterns[id(pattern)] = profiled
+
+        return profiled
+
+    def call(self, name, func, args, kwargs):
+        """
+        Function to time a regular expression call and record it for the
+        pattern and the caller of the pattern method or re function
+        """
+        time1 = time.perf_counter()
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed_time = time.perf_counter() - time1
+
+            code = sys._getframe(2).f_code
+            caller = os.path.basename(code.co_filename) + ":" + code.co_name
+
+            record_time(self.pattern_stats, name, elapsed_time)
+            record_time(self.caller_stats, caller, elapsed_time)
+            record_time(self.pattern_caller_stats, caller + " -> " + name, elapsed_time)
+
+    def phase(self, name):
+        """
+        Function to return a context timing a phase of the run
+        """
+        if not self.enabled:
+            return NULL_PHASE
+
+        return profiled_phase(self, name)
+
+    def begin_phase(self, name):
+        if self.enabled:
+            self.open_phases.append((name, time.perf_counter()))
+
+    def end_phase(self, name):
+        if not self.enabled:
+            return
+
+        # Phases left open by an error are closed with the enclosing one
+        while self.open_phases:
+            phase_name, time1 = self.open_phases.pop()
+            record_time(self.phase_stats, phase_name, time.perf_counter() - time1)
+
+            if phase_name == name:
+                break
+
+    def stop(self):
+        """
+        Function to stop profiling, restore the patched patterns and write the
+        report
+        """
+        if not self.enabled:
+            return
+
+        total_time = time.perf_counter() - self.start_time
+
+        while self.open_phases:
+            self.end_phase(self.open_phases[-1][0])
+
+        for container, key, value in reversed(self.patched):
+            container[key] = value
+
+        self.patched = []
+        self.patterns = {}
+        self.pattern_names = {}
+        self.enabled = False
+
+        # Phases only, read by the caller
+        if self.profile_file == "":
+            return
+
+        report = {
+            "label": self.label,
+            "total_time": total_time,
+            "phases": self.phase_stats,
+            "patterns": self.pattern_stats,
+            "callers": self.caller_stats,
+            "pattern_callers": self.pattern_caller_stats,
+        }
+
+        try:
+            with open(self.profile_file, "w") as profile_data:
+                json.dump(report, profile_data, indent=2)
+        except OSError:
+            print("  # Warning: Unable to write the profile report " + self.profile_file)
+        else:
+            print("  # Generated profile report " + self.profile_file)
+
+        self.print_report(report)
+
+    def print_report(self, report):
+        """
+        Function to print the top entries of the report
+        """
+        print(f"  # Profile of {report['label']}: total time {report['total_time']:.6f}s")
+
+        for table_name in ["phases", "patterns", "callers", "pattern_callers"]:
+            table = report[table_name]
+
+            if not table:
+                continue
+
+            print(f"    - Top {table_name} by total time:")
+
+            for key, stats in sorted(
+                table.items(), key=lambda item: item[1]["total_time"], reverse=True
+            )[:PROFILE_TOP_N]:
+                print(
+                    f"        {key}: hits {stats['hits']}, "
+                    f"total {stats['total_time']:.6f}s, max {stats['max_time']:.6f}s"
+                )
+
+
+# The profiler is shared by all the modules of the process
+g_profiler = profiler()
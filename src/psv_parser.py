@@ -6,8 +6,11 @@
 ####################################################################################
 
 import argparse
+import contextlib
+import copy
 import csv
 import datetime, time
+import functools
 import io
 import itertools
 import json
@@ -25,6 +28,11 @@ from .regex import *
 from .veripy_parser import veripy_parser
 from .verilog_parser import verilog_parser
 from .psv_prep import psv_prep
+from .const_expr import g_const_expr
+from .file_index import g_file_index_store
+from .name_matcher import name_matcher
+from .package_store import g_package_store
+from .profiler import g_profiler
 
 
 from collections import OrderedDict
@@ -35,6 +43,76 @@ from typing import Dict, Set
 import oyaml as yaml
 
 
+# Parser tables read and written while loading a package or `include file
+PACKAGE_STATE_ATTRS = [
+    "params",
+    "typedef_enums",
+    "typedef_logics",
+    "typedef_structs",
+    "typedef_unions",
+    "typedef_bindings",
+    "packages",
+    "classes",
+    "tick_defines",
+    "tick_ifdef_en",
+    "tick_decisions",
+    "tick_types",
+    "tick_served",
+    "tick_curr_decision",
+    "tick_curr_type",
+    "tick_curr_served",
+    "last_tick_loc",
+    "sub_params",
+    "sub_typedef_enums",
+    "sub_typedef_logics",
+    "sub_typedef_structs",
+    "sub_typedef_unions",
+    "sub_typedef_bindings",
+    "sub_packages",
+    "sub_classes",
+    "sub_tick_defines",
+    "sub_tick_ifdef_en",
+    "sub_tick_ifdef_arr",
+    "sub_tick_decisions",
+    "sub_tick_types",
+    "sub_tick_served",
+    "sub_tick_curr_decision",
+    "sub_tick_curr_type",
+    "sub_tick_curr_served",
+    "sub_last_tick_loc",
+]
+
+# Parser settings read while loading a package or `include file
+PACKAGE_CONTEXT_ATTRS = [
+    "hash_defines",
+    "incl_dirs",
+    "files",
+    "flist_lib",
+    "gen_dependencies",
+]
+
+# Parser tables read and written while gathering the ports of a sub-module. The
+# SUB tables are reset for every instance, and the package names are the only
+# TOP table read and written.
+PORTS_STATE_ATTRS = [attr for attr in PACKAGE_STATE_ATTRS if attr.startswith("sub_")]
+PORTS_STATE_ATTRS += ["sub_ports", "packages"]
+
+# Parser settings read while gathering the ports of a sub-module. The include
+# directories and file lists are not needed, the store checks that the packages
+# and `include files still resolve to the same files.
+PORTS_CONTEXT_ATTRS = [
+    "hash_defines",
+    "gen_dependencies",
+    "package_files",
+    "verilog_define_files",
+    "sub_include_files_list",
+    "parsing_format",
+    "tick_ifdef_dis",
+    "module_def_preps",
+]
+
+RE_PACKAGE_LOAD_MSG = re.compile(r"^\s*[-+] (Importing package|Loading `include file) ")
+
 # For Veripy specific parsing
 
 class psv_parser:
@@ -62,6 +140,7 @@ class psv_parser:
         self.incl_dirs = incl_dirs
         self.files = files
         self.flist_lib = flist_lib
+        self.file_indexes = None
         self.package_files = package_files
         self.hash_defines = hash_defines
         self.parsing_format = parsing_format
@@ -169,6 +248,7 @@ class psv_parser:
         self.always_constructs = []
         self.force_widths = []
         self.force_internals = []
+        self.force_internal_matcher = name_matcher(empty_regex=False)
         self.genvars = []
         self.integers = []
         self.generate_for_loops = {}
@@ -233,6 +313,11 @@ class psv_parser:
         # TODO: Need to assign this variable
         self.temporary_file = "TEMPFILE"
 
+        # Nested package loads of the package load in progress
+        self.package_load_trace = None
+
+        g_package_store.set_cache_dir(cmdline.package_cache_dir)
+
         ################################################################################
         # Loading SV packages
         ################################################################################
@@ -247,23 +332,6 @@ class psv_parser:
         self.profiling = profiling
         self.profiling_file = profiling_file
 
-        # Dictionaries to store performance data
-        self.time_dict = {}
-        self.all_time_dict = {
-            "total_hits": 0,
-            "total_time": 0,
-        }
-        self.all_time_callers = {
-            "total_hits": 0,
-            "total_time": 0,
-        }
-        self.all_time_caller_regex = {
-            "total_hits": 0,
-            "total_time": 0,
-        }
-
-        self.real_re_search = re.search
-
         self.gendrive0_parameter = 0
         self.genparam = 0
         self.genparam_no_gen_rtl = 0
@@ -282,83 +350,6 @@ class psv_parser:
         self.constructs = []
         self.ports_w_comment = {}
 
-    def time_re_search(self, reg, inp):
-        import time
-
-        name = str(reg)
-        t = time.process_time()
-        result = self.real_re_search(reg, inp)
-        elapsed_time = time.process_time() - t
-        if name in self.all_time_dict:
-            self.all_time_dict[name]["hits"] += 1
-            self.all_time_dict[name]["total_time"] += elapsed_time
-            self.all_time_dict[name]["max_time"] = max(
-                elapsed_time, self.all_time_dict[name]["max_time"]
-            )
-        else:
-            self.all_time_dict[name] = {
-                "hits": 1,
-                "total_time": elapsed_time,
-                "max_time": elapsed_time,
-            }
-        caller = sys._getframe().f_back.f_code.co_name
-        if caller in self.all_time_callers:
-            self.all_time_callers[caller]["hits"] += 1
-            self.all_time_callers[caller]["total_time"] += elapsed_time
-            self.all_time_callers[caller]["max_time"] = max(
-                elapsed_time, self.all_time_callers[caller]["max_time"]
-            )
-        else:
-            self.all_time_callers[caller] = {
-                "hits": 1,
-                "total_time": elapsed_time,
-                "max_time": elapsed_time,
-            }
-        caller_regex = caller + " -> " + name
-        if caller_regex in self.all_time_caller_regex:
-            self.all_time_caller_regex[caller_regex]["hits"] += 1
-            self.all_time_caller_regex[caller_regex]["total_time"] += elapsed_time
-            self.all_time_caller_regex[caller_regex]["max_time"] = max(
-                elapsed_time, self.all_time_caller_regex[caller_regex]["max_time"]
-            )
-        else:
-            self.all_time_caller_regex[caller_regex] = {
-                "hits": 1,
-                "total_time": elapsed_time,
-                "max_time": elapsed_time,
-            }
-
-        self.all_time_caller_regex["total_hits"] += 1
-        self.all_time_caller_regex["total_time"] += elapsed_time
-        self.all_time_callers["total_hits"] += 1
-        self.all_time_callers["total_time"] += elapsed_time
-        self.all_time_dict["total_hits"] += 1
-        self.all_time_dict["total_time"] += elapsed_time
-        return result
-
-    def nice_stats(self, result_dict, pfile):
-        pfile.write("Module: " + self.module_name + "\n")
-        pfile.write(f"TOTAL HITS={result_dict['total_hits']}\n")
-        pfile.write(f"TOTAL TIME={result_dict['total_time']}\n")
-        del result_dict["total_time"]
-        del result_dict["total_hits"]
-
-        pfile.write("Max hits\n")
-        for key, value in sorted(
-            result_dict.items(), key=lambda item: item[1]["hits"], reverse=True
-        )[:10]:
-            pfile.write("%s: %s\n" % (key, value))
-        pfile.write("Max total_time\n")
-        for key, value in sorted(
-            result_dict.items(), key=lambda item: item[1]["total_time"], reverse=True
-        )[:10]:
-            pfile.write("%s: %s\n" % (key, value))
-        pfile.write("Max max_time\n")
-        for key, value in sorted(
-            result_dict.items(), key=lambda item: item[1]["max_time"], reverse=True
-        )[:10]:
-            pfile.write("%s: %s\n" % (key, value))
-
     def dbg_store(self, dbg_info):
         """
         Function to print a debug string in a debug dump file
@@ -415,7 +406,47 @@ class psv_parser:
 
     def get_ports(self, submod_name, file_name):
         """
-        Function to gather ports from a module
+        Function to gather ports from a module. Repeated instances of a module
+        replay the parsed ports and tables from the package store.
+        """
+
+        file_hash = g_package_store.file_hash(file_name)
+
+        # The debug dump needs the full parse, so the package store is bypassed
+        if self.debug or file_hash is None:
+            self.parse_ports(submod_name, file_name)
+            return
+
+        # The key holds the file, its `define values and the SUB tables, which
+        # are small as they are reset for every instance. The &Param and
+        # &Connect overrides are applied per instance after the ports are read.
+        state = [getattr(self, attr) for attr in PORTS_STATE_ATTRS]
+        context = [getattr(self, attr) for attr in PORTS_CONTEXT_ATTRS]
+        context.append(os.getcwd())
+
+        key = (
+            "PORTS",
+            submod_name,
+            file_name,
+            file_hash,
+            g_package_store.fingerprint([state, context]),
+        )
+
+        self.replay_from_store(
+            key,
+            PORTS_STATE_ATTRS,
+            [file_name],
+            self.parse_ports,
+            submod_name,
+            file_name,
+            written_only=True,
+        )
+
+        return
+
+    def parse_ports(self, submod_name, file_name):
+        """
+        Function to parse ports, params and typedefs of a module
         """
 
         self.dbg("### Instantiating sub-module " + submod_name + "; FILE: " + file_name)
@@ -4077,6 +4108,51 @@ class psv_parser:
         """
         self.dbg("\n\n###: load_import_or_include_file inc_file : " + inc_file)
         self.dbg("\n\n###: " + module_type + " :: " + inc_type + " :: " + inc_file)
+
+        tick_inc_file, is_list_file, actual_pkg_file = self.find_import_or_include_file(
+            inc_file
+        )
+
+        if tick_inc_file is None:
+            if inc_type == "IMPORT_COMMANDLINE" or inc_type == "IMPORT_EMBEDDED":
+                self.dbg("\nError: Unable to find the package file " + inc_file)
+                self.dbg("  List of search directories")
+                print("\nError: Unable to find the package file " + inc_file)
+                print("  List of search directories")
+            else:
+                self.dbg("\nError: Unable to find the `include file " + inc_file)
+                self.dbg("  List of search directories")
+                print("\nError: Unable to find the `include file " + inc_file)
+                print("  List of search directories")
+
+            for dir in self.incl_dirs:
+                self.dbg("    " + str(dir))
+                print("    " + str(dir))
+            sys.exit(1)
+
+
+        # The debug dump needs the full parse, so the package store is bypassed
+        if self.debug:
+            self.parse_import_or_include_file(
+                module_type, inc_type, tick_inc_file, is_list_file, actual_pkg_file
+            )
+        else:
+            self.replay_import_or_include_file(
+                module_type, inc_type, tick_inc_file, is_list_file, actual_pkg_file
+            )
+
+        self.record_import_or_include_dependency(tick_inc_file)
+
+        if self.package_load_trace is not None:
+            self.package_load_trace.append((inc_file, tick_inc_file))
+
+        return
+
+    def find_import_or_include_file(self, inc_file):
+        """
+        Function to find a package or 'include file in the include directories
+        and file lists. Returns None for the file path if not found.
+        """
         tick_inc_file = None
         found_tick_inc_file = 0
         is_list_file = False
@@ -4136,710 +4212,854 @@ class psv_parser:
                                 found_tick_inc_file = 1
                                 tick_inc_file = inc_file_path
                                 break
-
         if found_tick_inc_file:
-            self.dbg(
-                "\n################################################################################"
-            )
-
             tick_inc_file = re.sub(r"\/\/", "/", tick_inc_file)
 
-            if inc_type == "IMPORT_COMMANDLINE" or inc_type == "IMPORT_EMBEDDED":
-                self.dbg(
-                    "###load_import_or_include_file Loading Package file"
-                    + tick_inc_file
-                    + " ###"
-                )
-                if module_type == "TOP":
-                    print("    - Importing package " + tick_inc_file)
-                else:
-                    print("      + Importing package " + tick_inc_file)
-            else:
-                self.dbg(
-                    "###load_import_or_include_file Loading `include file "
-                    + tick_inc_file
-                    + " ###"
-                )
-                if module_type == "TOP":
-                    print("    - Loading `include file " + tick_inc_file)
-                else:
-                    print("      + Loading `include file " + tick_inc_file)
+        return tick_inc_file, is_list_file, actual_pkg_file
 
-            self.dbg(
-                "################################################################################"
-            )
+    def replay_import_or_include_file(
+        self, module_type, inc_type, tick_inc_file, is_list_file, actual_pkg_file
+    ):
+        """
+        Function to replay a package or 'include file load from the package
+        store. On a miss, the file is parsed and the result is stored.
+        """
+        state = [getattr(self, attr) for attr in PACKAGE_STATE_ATTRS]
+        context = [getattr(self, attr) for attr in PACKAGE_CONTEXT_ATTRS]
+        context.append(os.getcwd())
 
-            if is_list_file:
-                file_to_parse = actual_pkg_file
-            else:
-                file_to_parse = tick_inc_file
+        # $bits() in TOP parameters is evaluated against the declared signals
+        if module_type == "TOP":
+            context.extend([self.regs, self.wires, self.signals])
+
+        key = (
+            module_type,
+            inc_type,
+            tick_inc_file,
+            is_list_file,
+            actual_pkg_file,
+            g_package_store.fingerprint([state, context]),
+        )
 
-            package_function_skip = -1
-            package_name = "default"
-            class_name = "default"
-            incl_tick_ifdef_en = 1
+        self.replay_from_store(
+            key,
+            PACKAGE_STATE_ATTRS,
+            [],
+            self.parse_import_or_include_file,
+            module_type,
+            inc_type,
+            tick_inc_file,
+            is_list_file,
+            actual_pkg_file,
+        )
 
-            with open(file_to_parse, "r") as tick_incl_data:
-                tick_incl_block_comment = 0
+        return
 
-                self.filelist.append(file_to_parse)
+    def replay_from_store(
+        self, key, state_attrs, read_files, parse_func, *args, written_only=False
+    ):
+        """
+        Function to replay the tables, filelist, functions, package loads and
+        console output of a parse from the package store. On a miss, the parse
+        is run and the table entries it changed are stored. With written_only,
+        only the tables the parse changed are stored and replayed, and the
+        parses changing tables out of state_attrs are not stored.
+        """
+        entry = g_package_store.lookup(key, self.resolve_import_or_include_file)
 
-                incl_line_no = 0
-                prev_tick_incl_line = ""
-                tick_incl_gather_till_semicolon = 0
+        if entry is not None:
+            g_package_store.restore(self, entry["attrs"], entry["state"])
+            self.functions_list.update(copy.deepcopy(entry["functions"]))
+            self.filelist.extend(entry["filelist"])
 
-                for tick_incl_line in tick_incl_data:
-                    incl_line_no = incl_line_no + 1
+            for n_inc_file, n_tick_inc_file in entry["loads"]:
+                self.record_import_or_include_dependency(n_tick_inc_file)
 
-                    # Remove space in the end
-                    tick_incl_line = tick_incl_line.rstrip()
+                if self.package_load_trace is not None:
+                    self.package_load_trace.append((n_inc_file, n_tick_inc_file))
 
-                    # Removing newline and spaces at the end
-                    tick_incl_line = tick_incl_line.rstrip()
+            sys.stdout.write(entry["output"])
+            return
 
-                    # Removing single line comment
-                    tick_incl_line = re.sub(r"\s*\/\/.*", "", tick_incl_line)
+        if written_only:
+            watched_attrs = list(dict.fromkeys(PACKAGE_STATE_ATTRS + state_attrs))
+            watched_state = [
+                g_package_store.fingerprint(getattr(self, attr))
+                for attr in watched_attrs
+            ]
 
-                    # Removing block comment in a single line
-                    tick_incl_line = remove_single_line_comment(tick_incl_line)
+        state_before = g_package_store.snapshot(
+            [getattr(self, attr) for attr in state_attrs]
+        )
+        state_before = dict(zip(state_attrs, state_before))
+        filelist_len = len(self.filelist)
+        functions_list = dict(self.functions_list)
+        found_error = self.found_error
+        parent_load_trace = self.package_load_trace
+        self.package_load_trace = []
+        output = io.StringIO()
 
-                    # Removing multiple space to single and no space at the end
-                    tick_incl_line = re.sub(r"\s+", " ", tick_incl_line)
-                    tick_incl_line = re.sub(r"\s*$", "", tick_incl_line)
+        try:
+            with contextlib.redirect_stdout(output):
+                parse_func(*args)
+        finally:
+            load_trace = self.package_load_trace
+            self.package_load_trace = parent_load_trace
+            sys.stdout.write(output.getvalue())
+
+        if parent_load_trace is not None:
+            parent_load_trace.extend(load_trace)
+
+        # Warnings and errors carry line numbers of the current file, so only
+        # clean parses are stored
+        if self.found_error != found_error:
+            return
 
-                    # if the whole line is commented from the beginning
-                    tick_incl_single_comment_begin_start_regex = (
-                        RE_SINGLE_COMMENT_BEGIN_START.search(tick_incl_line)
-                    )
-                    if tick_incl_single_comment_begin_start_regex:
-                        continue
+        for line in output.getvalue().splitlines():
+            if not RE_PACKAGE_LOAD_MSG.search(line):
+                return
 
-                    tick_incl_block_comment_begin_start_regex = (
-                        RE_BLOCK_COMMENT_BEGIN_START.search(tick_incl_line)
-                    )
-                    tick_incl_block_comment_begin_regex = RE_BLOCK_COMMENT_BEGIN.search(
-                        tick_incl_line
-                    )
-                    tick_incl_block_comment_end_regex = RE_BLOCK_COMMENT_END.search(
-                        tick_incl_line
-                    )
+        functions = {
+            name: info
+            for name, info in self.functions_list.items()
+            if functions_list.get(name) is not info
+        }
 
-                    if tick_incl_block_comment_end_regex:
-                        tick_incl_block_comment = 0
-                        # If something after the */, we need to parse
-                        if tick_incl_block_comment_end_regex.group(1) == "":
-                            continue
-                        else:
-                            tick_incl_line = tick_incl_block_comment_end_regex.group(1)
+        filelist = self.filelist[filelist_len:]
 
-                    if tick_incl_block_comment:
-                        continue
+        if written_only:
+            written_attrs = [
+                attr
+                for attr, fingerprint in zip(watched_attrs, watched_state)
+                if g_package_store.fingerprint(getattr(self, attr)) != fingerprint
+            ]
 
-                    if tick_incl_block_comment_begin_start_regex:
-                        tick_incl_block_comment = 1
-                        continue
-                    elif tick_incl_block_comment_begin_regex:
-                        tick_incl_block_comment = 1
+            if any(attr not in state_attrs for attr in written_attrs):
+                return
 
-                    # When block comment begin is detected, we have to strip the block comment beginning and still
-                    # parse the content
-                    if tick_incl_block_comment_begin_regex:
-                        tick_incl_block_comment = 1
+            state_attrs = written_attrs
+
+        g_package_store.store(
+            key,
+            read_files + filelist,
+            filelist,
+            load_trace,
+            state_attrs,
+            [getattr(self, attr) for attr in state_attrs],
+            functions,
+            output.getvalue(),
+            [state_before[attr] for attr in state_attrs],
+        )
 
-                        # Removing single line block comment
-                        tick_incl_line = re.sub(r"\s*\/\*.*", "", tick_incl_line)
+        return
 
-                    if tick_incl_line == "":
-                        continue
+    def resolve_import_or_include_file(self, inc_file):
+        """
+        Function to return the file path a package or 'include file resolves to
+        """
+        tick_inc_file, is_list_file, actual_pkg_file = self.find_import_or_include_file(
+            inc_file
+        )
 
-                    ################################################################################
-                    # `ifdef/ifndef/elif/else/endif processing
-                    ################################################################################
-                    incl_tick_ifdef_regex = RE_TICK_IFDEF.search(tick_incl_line)
-                    incl_tick_ifndef_regex = RE_TICK_IFNDEF.search(tick_incl_line)
-                    incl_tick_elif_regex = RE_TICK_ELSIF.search(tick_incl_line)
-                    incl_tick_else_regex = RE_TICK_ELSE.search(tick_incl_line)
-                    incl_tick_endif_regex = RE_TICK_ENDIF.search(tick_incl_line)
+        return tick_inc_file
 
-                    if incl_tick_ifdef_regex:
-                        if module_type == "TOP":
-                            incl_tick_ifdef_en = self.tick_ifdef_proc(
-                                "ifdef", incl_tick_ifdef_regex.group(1)
-                            )
-                        else:
-                            incl_tick_ifdef_en = self.sub_tick_ifdef_proc(
-                                "ifdef", incl_tick_ifdef_regex.group(1)
-                            )
+    def parse_import_or_include_file(
+        self, module_type, inc_type, tick_inc_file, is_list_file, actual_pkg_file
+    ):
+        """
+        Function to parse 'define, parameter, typedef and function declarations
+        of a package or 'include file
+        """
+        self.dbg(
+            "\n################################################################################"
+        )
 
-                        continue
-                    elif incl_tick_ifndef_regex:
-                        if module_type == "TOP":
-                            incl_tick_ifdef_en = self.tick_ifdef_proc(
-                                "ifndef", incl_tick_ifndef_regex.group(1)
-                            )
-                        else:
-                            incl_tick_ifdef_en = self.sub_tick_ifdef_proc(
-                                "ifndef", incl_tick_ifndef_regex.group(1)
-                            )
+        if inc_type == "IMPORT_COMMANDLINE" or inc_type == "IMPORT_EMBEDDED":
+            self.dbg(
+                "###load_import_or_include_file Loading Package file"
+                + tick_inc_file
+                + " ###"
+            )
+            if module_type == "TOP":
+                print("    - Importing package " + tick_inc_file)
+            else:
+                print("      + Importing package " + tick_inc_file)
+        else:
+            self.dbg(
+                "###load_import_or_include_file Loading `include file "
+                + tick_inc_file
+                + " ###"
+            )
+            if module_type == "TOP":
+                print("    - Loading `include file " + tick_inc_file)
+            else:
+                print("      + Loading `include file " + tick_inc_file)
 
-                        continue
-                    elif incl_tick_elif_regex:
-                        if module_type == "TOP":
-                            incl_tick_ifdef_en = self.tick_ifdef_proc(
-                                "elif", incl_tick_elif_regex.group(1)
-                            )
-                        else:
-                            incl_tick_ifdef_en = self.sub_tick_ifdef_proc(
-                                "elif", incl_tick_elif_regex.group(1)
-                            )
+        self.dbg(
+            "################################################################################"
+        )
 
-                        continue
-                    elif incl_tick_else_regex:
-                        if module_type == "TOP":
-                            incl_tick_ifdef_en = self.tick_ifdef_proc("else", "")
-                        else:
-                            incl_tick_ifdef_en = self.sub_tick_ifdef_proc("else", "")
+        if is_list_file:
+            file_to_parse = actual_pkg_file
+        else:
+            file_to_parse = tick_inc_file
 
-                        continue
-                    elif incl_tick_endif_regex:
-                        if module_type == "TOP":
-                            incl_tick_ifdef_en = self.tick_ifdef_proc("endif", "")
-                        else:
-                            incl_tick_ifdef_en = self.sub_tick_ifdef_proc("endif", "")
+        package_function_skip = -1
+        package_name = "default"
+        class_name = "default"
+        incl_tick_ifdef_en = 1
 
-                        continue
+        with open(file_to_parse, "r") as tick_incl_data:
+            tick_incl_block_comment = 0
 
-                    if not incl_tick_ifdef_en:  # If tick disables the code
-                        continue
-                    else:  # if incl_tick_ifdef_en:
-                        # Gather multiple lines until ;
-                        if tick_incl_gather_till_semicolon:
-                            tick_incl_line = prev_tick_incl_line + " " + tick_incl_line
+            self.filelist.append(file_to_parse)
 
-                            tick_incl_semicolon_regex = RE_SEMICOLON.search(tick_incl_line)
+            incl_line_no = 0
+            prev_tick_incl_line = ""
+            tick_incl_gather_till_semicolon = 0
 
-                            if tick_incl_semicolon_regex:
-                                tick_incl_gather_till_semicolon = 0
+            for tick_incl_line in tick_incl_data:
+                incl_line_no = incl_line_no + 1
 
-                        ################################################################################
-                        # Function Skip
-                        ################################################################################
-                        function_regex = RE_FUNCTION.search(tick_incl_line)
-                        endfunction_regex = RE_ENDFUNCTION.search(tick_incl_line)
+                # Remove space in the end
+                tick_incl_line = tick_incl_line.rstrip()
 
-                        if function_regex:
-                            function_name1_regex = RE_FUNCTION_NAME1.search(
-                                tick_incl_line
-                            )
-                            function_name2_regex = RE_FUNCTION_NAME2.search(
-                                tick_incl_line
-                            )
-                            if package_function_skip >= 0:
-                                self.dbg(
-                                    f"\nError: Missing paired endfunction for function (line {package_function_skip}) detected."
-                                )
-                                print(
-                                    f"\nError: Missing paired endfunction for function (line {package_function_skip}) detected."
-                                )
-                                self.found_error += 1
-                            package_function_skip = incl_line_no
-                            if function_name1_regex:
-                                # TODO: Calculate the function return width
-                                if package_name == "" or package_name == "default":
-                                    if class_name == "" or class_name == "default":
-                                        function_name = function_name1_regex.group(1)
-                                    else:
-                                        function_name = (
-                                            class_name
-                                            + "::"
-                                            + function_name1_regex.group(1)
-                                        )
-                                else:
-                                    if class_name == "" or class_name == "default":
-                                        function_name = (
-                                            package_name
-                                            + "::"
-                                            + function_name1_regex.group(1)
-                                        )
-                                    else:
-                                        function_name = (
-                                            package_name
-                                            + "::"
-                                            + class_name
-                                            + "::"
-                                            + function_name1_regex.group(1)
-                                        )
+                # Removing newline and spaces at the end
+                tick_incl_line = tick_incl_line.rstrip()
 
-                                self.dbg(
-                                    "\n### Skipping function "
-                                    + function_name
-                                    + " at "
-                                    + str(incl_line_no)
-                                    + " in "
-                                    + inc_file_path
-                                )
-                                self.functions_list[function_name] = {}
-                                self.functions_list[function_name][
-                                    "name"
-                                ] = function_name
+                # Removing single line comment
+                tick_incl_line = re.sub(r"\s*\/\/.*", "", tick_incl_line)
 
-                                continue
-                            elif function_name2_regex:
-                                # TODO: Calculate the function return width
-                                if package_name == "" or package_name == "default":
-                                    if class_name == "" or class_name == "default":
-                                        function_name = function_name2_regex.group(1)
-                                    else:
-                                        function_name = (
-                                            class_name
-                                            + "::"
-                                            + function_name2_regex.group(1)
-                                        )
-                                else:
-                                    if class_name == "" or class_name == "default":
-                                        function_name = (
-                                            package_name
-                                            + "::"
-                                            + function_name2_regex.group(1)
-                                        )
-                                    else:
-                                        function_name = (
-                                            package_name
-                                            + "::"
-                                            + class_name
-                                            + "::"
-                                            + function_name2_regex.group(1)
-                                        )
+                # Removing block comment in a single line
+                tick_incl_line = remove_single_line_comment(tick_incl_line)
 
-                                self.dbg(
-                                    "\n### Skipping function "
-                                    + function_name
-                                    + " at "
-                                    + str(incl_line_no)
-                                    + " in "
-                                    + inc_file_path
-                                )
-                                self.functions_list[function_name] = {}
-                                self.functions_list[function_name][
-                                    "name"
-                                ] = function_name
+                # Removing multiple space to single and no space at the end
+                tick_incl_line = re.sub(r"\s+", " ", tick_incl_line)
+                tick_incl_line = re.sub(r"\s*$", "", tick_incl_line)
 
-                                continue
-                            else:
-                                self.dbg(
-                                    "\nError: Unable to find function name. Might me due to missing ;"
-                                )
-                                self.dbg(tick_incl_line + "\n")
-                                print(
-                                    "\nError: Unable to find function name. Might me due to missing ;"
-                                )
-                                print(tick_incl_line + "\n")
-                                self.found_error += 1
-                        elif endfunction_regex:
-                            package_function_skip = -1
-                            continue
+                # if the whole line is commented from the beginning
+                tick_incl_single_comment_begin_start_regex = (
+                    RE_SINGLE_COMMENT_BEGIN_START.search(tick_incl_line)
+                )
+                if tick_incl_single_comment_begin_start_regex:
+                    continue
 
-                        if package_function_skip >= 0:
-                            continue
+                tick_incl_block_comment_begin_start_regex = (
+                    RE_BLOCK_COMMENT_BEGIN_START.search(tick_incl_line)
+                )
+                tick_incl_block_comment_begin_regex = RE_BLOCK_COMMENT_BEGIN.search(
+                    tick_incl_line
+                )
+                tick_incl_block_comment_end_regex = RE_BLOCK_COMMENT_END.search(
+                    tick_incl_line
+                )
 
-                        ################################################################################
-                        # `include processing
-                        ################################################################################
-                        tick_include_regex = RE_TICK_INCLUDE.search(tick_incl_line)
-                        if tick_include_regex:
-                            self.load_import_or_include_file(
-                                module_type, "INCLUDE", tick_include_regex.group(1)
-                            )
-                            continue
+                if tick_incl_block_comment_end_regex:
+                    tick_incl_block_comment = 0
+                    # If something after the */, we need to parse
+                    if tick_incl_block_comment_end_regex.group(1) == "":
+                        continue
+                    else:
+                        tick_incl_line = tick_incl_block_comment_end_regex.group(1)
 
-                        ################################################################################
-                        # imported package processing
-                        ################################################################################
-                        import_regex = RE_IMPORT.search(tick_incl_line)
-                        import_with_colons_regex = RE_IMPORT_COLONS.search(
-                            tick_incl_line
+                if tick_incl_block_comment:
+                    continue
+
+                if tick_incl_block_comment_begin_start_regex:
+                    tick_incl_block_comment = 1
+                    continue
+                elif tick_incl_block_comment_begin_regex:
+                    tick_incl_block_comment = 1
+
+                # When block comment begin is detected, we have to strip the block comment beginning and still
+                # parse the content
+                if tick_incl_block_comment_begin_regex:
+                    tick_incl_block_comment = 1
+
+                    # Removing single line block comment
+                    tick_incl_line = re.sub(r"\s*\/\*.*", "", tick_incl_line)
+
+                if tick_incl_line == "":
+                    continue
+
+                ################################################################################
+                # `ifdef/ifndef/elif/else/endif processing
+                ################################################################################
+                incl_tick_ifdef_regex = RE_TICK_IFDEF.search(tick_incl_line)
+                incl_tick_ifndef_regex = RE_TICK_IFNDEF.search(tick_incl_line)
+                incl_tick_elif_regex = RE_TICK_ELSIF.search(tick_incl_line)
+                incl_tick_else_regex = RE_TICK_ELSE.search(tick_incl_line)
+                incl_tick_endif_regex = RE_TICK_ENDIF.search(tick_incl_line)
+
+                if incl_tick_ifdef_regex:
+                    if module_type == "TOP":
+                        incl_tick_ifdef_en = self.tick_ifdef_proc(
+                            "ifdef", incl_tick_ifdef_regex.group(1)
+                        )
+                    else:
+                        incl_tick_ifdef_en = self.sub_tick_ifdef_proc(
+                            "ifdef", incl_tick_ifdef_regex.group(1)
                         )
 
-                        if import_regex:
-                            import_package = import_regex.group(1)
-                            import_file_name = import_regex.group(1) + ".sv"
-                        elif import_with_colons_regex:
-                            import_file_name = import_with_colons_regex.group(1) + ".sv"
-                            import_package = import_with_colons_regex.group(1)
+                    continue
+                elif incl_tick_ifndef_regex:
+                    if module_type == "TOP":
+                        incl_tick_ifdef_en = self.tick_ifdef_proc(
+                            "ifndef", incl_tick_ifndef_regex.group(1)
+                        )
+                    else:
+                        incl_tick_ifdef_en = self.sub_tick_ifdef_proc(
+                            "ifndef", incl_tick_ifndef_regex.group(1)
+                        )
 
-                        if import_regex or import_with_colons_regex:
-                            if module_type == "TOP":
-                                if import_package not in self.packages:
-                                    self.load_import_or_include_file(
-                                        module_type, "IMPORT_EMBEDDED", import_file_name
+                    continue
+                elif incl_tick_elif_regex:
+                    if module_type == "TOP":
+                        incl_tick_ifdef_en = self.tick_ifdef_proc(
+                            "elif", incl_tick_elif_regex.group(1)
+                        )
+                    else:
+                        incl_tick_ifdef_en = self.sub_tick_ifdef_proc(
+                            "elif", incl_tick_elif_regex.group(1)
+                        )
+
+                    continue
+                elif incl_tick_else_regex:
+                    if module_type == "TOP":
+                        incl_tick_ifdef_en = self.tick_ifdef_proc("else", "")
+                    else:
+                        incl_tick_ifdef_en = self.sub_tick_ifdef_proc("else", "")
+
+                    continue
+                elif incl_tick_endif_regex:
+                    if module_type == "TOP":
+                        incl_tick_ifdef_en = self.tick_ifdef_proc("endif", "")
+                    else:
+                        incl_tick_ifdef_en = self.sub_tick_ifdef_proc("endif", "")
+
+                    continue
+
+                if not incl_tick_ifdef_en:  # If tick disables the code
+                    continue
+                else:  # if incl_tick_ifdef_en:
+                    # Gather multiple lines until ;
+                    if tick_incl_gather_till_semicolon:
+                        tick_incl_line = prev_tick_incl_line + " " + tick_incl_line
+
+                        tick_incl_semicolon_regex = RE_SEMICOLON.search(tick_incl_line)
+
+                        if tick_incl_semicolon_regex:
+                            tick_incl_gather_till_semicolon = 0
+
+                    ################################################################################
+                    # Function Skip
+                    ################################################################################
+                    function_regex = RE_FUNCTION.search(tick_incl_line)
+                    endfunction_regex = RE_ENDFUNCTION.search(tick_incl_line)
+
+                    if function_regex:
+                        function_name1_regex = RE_FUNCTION_NAME1.search(
+                            tick_incl_line
+                        )
+                        function_name2_regex = RE_FUNCTION_NAME2.search(
+                            tick_incl_line
+                        )
+                        if package_function_skip >= 0:
+                            self.dbg(
+                                f"\nError: Missing paired endfunction for function (line {package_function_skip}) detected."
+                            )
+                            print(
+                                f"\nError: Missing paired endfunction for function (line {package_function_skip}) detected."
+                            )
+                            self.found_error += 1
+                        package_function_skip = incl_line_no
+                        if function_name1_regex:
+                            # TODO: Calculate the function return width
+                            if package_name == "" or package_name == "default":
+                                if class_name == "" or class_name == "default":
+                                    function_name = function_name1_regex.group(1)
+                                else:
+                                    function_name = (
+                                        class_name
+                                        + "::"
+                                        + function_name1_regex.group(1)
+                                    )
+                            else:
+                                if class_name == "" or class_name == "default":
+                                    function_name = (
+                                        package_name
+                                        + "::"
+                                        + function_name1_regex.group(1)
                                     )
-                                    continue
                                 else:
-                                    self.dbg(
-                                        "### Skip importing previously imported package "
-                                        + import_package
+                                    function_name = (
+                                        package_name
+                                        + "::"
+                                        + class_name
+                                        + "::"
+                                        + function_name1_regex.group(1)
                                     )
 
-                                continue
+                            self.dbg(
+                                "\n### Skipping function "
+                                + function_name
+                                + " at "
+                                + str(incl_line_no)
+                                + " in "
+                                + tick_inc_file
+                            )
+                            self.functions_list[function_name] = {}
+                            self.functions_list[function_name][
+                                "name"
+                            ] = function_name
+
+                            continue
+                        elif function_name2_regex:
+                            # TODO: Calculate the function return width
+                            if package_name == "" or package_name == "default":
+                                if class_name == "" or class_name == "default":
+                                    function_name = function_name2_regex.group(1)
+                                else:
+                                    function_name = (
+                                        class_name
+                                        + "::"
+                                        + function_name2_regex.group(1)
+                                    )
                             else:
-                                if import_package not in self.sub_packages:
-                                    self.load_import_or_include_file(
-                                        module_type, "IMPORT_EMBEDDED", import_file_name
+                                if class_name == "" or class_name == "default":
+                                    function_name = (
+                                        package_name
+                                        + "::"
+                                        + function_name2_regex.group(1)
                                     )
                                 else:
-                                    self.dbg(
-                                        "### Skip importing previously imported package "
-                                        + import_package
+                                    function_name = (
+                                        package_name
+                                        + "::"
+                                        + class_name
+                                        + "::"
+                                        + function_name2_regex.group(1)
                                     )
 
-                                continue
+                            self.dbg(
+                                "\n### Skipping function "
+                                + function_name
+                                + " at "
+                                + str(incl_line_no)
+                                + " in "
+                                + tick_inc_file
+                            )
+                            self.functions_list[function_name] = {}
+                            self.functions_list[function_name][
+                                "name"
+                            ] = function_name
+
+                            continue
+                        else:
+                            self.dbg(
+                                "\nError: Unable to find function name. Might me due to missing ;"
+                            )
+                            self.dbg(tick_incl_line + "\n")
+                            print(
+                                "\nError: Unable to find function name. Might me due to missing ;"
+                            )
+                            print(tick_incl_line + "\n")
+                            self.found_error += 1
+                    elif endfunction_regex:
+                        package_function_skip = -1
+                        continue
+
+                    if package_function_skip >= 0:
+                        continue
+
+                    ################################################################################
+                    # `include processing
+                    ################################################################################
+                    tick_include_regex = RE_TICK_INCLUDE.search(tick_incl_line)
+                    if tick_include_regex:
+                        self.load_import_or_include_file(
+                            module_type, "INCLUDE", tick_include_regex.group(1)
+                        )
+                        continue
+
+                    ################################################################################
+                    # imported package processing
+                    ################################################################################
+                    import_regex = RE_IMPORT.search(tick_incl_line)
+                    import_with_colons_regex = RE_IMPORT_COLONS.search(
+                        tick_incl_line
+                    )
+
+                    if import_regex:
+                        import_package = import_regex.group(1)
+                        import_file_name = import_regex.group(1) + ".sv"
+                    elif import_with_colons_regex:
+                        import_file_name = import_with_colons_regex.group(1) + ".sv"
+                        import_package = import_with_colons_regex.group(1)
 
-                        ################################################################################
-                        # class and endclass
-                        ################################################################################
-                        virtual_class_regex = RE_VIRTUAL_CLASS.search(tick_incl_line)
-                        class_regex = RE_CLASS.search(tick_incl_line)
-                        endclass_regex = RE_ENDCLASS.search(tick_incl_line)
-
-                        if virtual_class_regex:
-                            class_name = virtual_class_regex.group(1)
-                            if module_type == "TOP":
-                                self.classes.append(class_name)
+                    if import_regex or import_with_colons_regex:
+                        if module_type == "TOP":
+                            if import_package not in self.packages:
+                                self.load_import_or_include_file(
+                                    module_type, "IMPORT_EMBEDDED", import_file_name
+                                )
+                                continue
                             else:
-                                self.sub_classes.append(class_name)
-                        elif class_regex:
-                            class_name = class_regex.group(1)
-                            if module_type == "TOP":
-                                self.classes.append(class_name)
+                                self.dbg(
+                                    "### Skip importing previously imported package "
+                                    + import_package
+                                )
+
+                            continue
+                        else:
+                            if import_package not in self.sub_packages:
+                                self.load_import_or_include_file(
+                                    module_type, "IMPORT_EMBEDDED", import_file_name
+                                )
                             else:
-                                self.sub_classes.append(class_name)
-                        elif endclass_regex:
-                            class_name = ""
+                                self.dbg(
+                                    "### Skip importing previously imported package "
+                                    + import_package
+                                )
+
+                            continue
+
+                    ################################################################################
+                    # class and endclass
+                    ################################################################################
+                    virtual_class_regex = RE_VIRTUAL_CLASS.search(tick_incl_line)
+                    class_regex = RE_CLASS.search(tick_incl_line)
+                    endclass_regex = RE_ENDCLASS.search(tick_incl_line)
+
+                    if virtual_class_regex:
+                        class_name = virtual_class_regex.group(1)
+                        if module_type == "TOP":
+                            self.classes.append(class_name)
+                        else:
+                            self.sub_classes.append(class_name)
+                    elif class_regex:
+                        class_name = class_regex.group(1)
+                        if module_type == "TOP":
+                            self.classes.append(class_name)
+                        else:
+                            self.sub_classes.append(class_name)
+                    elif endclass_regex:
+                        class_name = ""
 
-                        if virtual_class_regex or class_regex:
-                            if module_type == "TOP":
-                                if class_name not in self.typedef_enums[package_name]:
-                                    self.typedef_enums[package_name][class_name] = {}
+                    if virtual_class_regex or class_regex:
+                        if module_type == "TOP":
+                            if class_name not in self.typedef_enums[package_name]:
+                                self.typedef_enums[package_name][class_name] = {}
 
-                                if class_name not in self.typedef_logics[package_name]:
-                                    self.typedef_logics[package_name][class_name] = {}
+                            if class_name not in self.typedef_logics[package_name]:
+                                self.typedef_logics[package_name][class_name] = {}
 
-                                if class_name not in self.typedef_structs[package_name]:
-                                    self.typedef_structs[package_name][class_name] = {}
+                            if class_name not in self.typedef_structs[package_name]:
+                                self.typedef_structs[package_name][class_name] = {}
 
-                                if class_name not in self.typedef_unions[package_name]:
-                                    self.typedef_unions[package_name][class_name] = {}
-                            else:
-                                if (
+                            if class_name not in self.typedef_unions[package_name]:
+                                self.typedef_unions[package_name][class_name] = {}
+                        else:
+                            if (
+                                class_name
+                                not in self.sub_typedef_enums[package_name]
+                            ):
+                                self.sub_typedef_enums[package_name][
                                     class_name
-                                    not in self.sub_typedef_enums[package_name]
-                                ):
-                                    self.sub_typedef_enums[package_name][
-                                        class_name
-                                    ] = {}
+                                ] = {}
 
-                                if (
+                            if (
+                                class_name
+                                not in self.sub_typedef_logics[package_name]
+                            ):
+                                self.sub_typedef_logics[package_name][
                                     class_name
-                                    not in self.sub_typedef_logics[package_name]
-                                ):
-                                    self.sub_typedef_logics[package_name][
-                                        class_name
-                                    ] = {}
+                                ] = {}
 
-                                if (
+                            if (
+                                class_name
+                                not in self.sub_typedef_structs[package_name]
+                            ):
+                                self.sub_typedef_structs[package_name][
                                     class_name
-                                    not in self.sub_typedef_structs[package_name]
-                                ):
-                                    self.sub_typedef_structs[package_name][
-                                        class_name
-                                    ] = {}
+                                ] = {}
 
-                                if (
+                            if (
+                                class_name
+                                not in self.sub_typedef_unions[package_name]
+                            ):
+                                self.sub_typedef_unions[package_name][
                                     class_name
-                                    not in self.sub_typedef_unions[package_name]
-                                ):
-                                    self.sub_typedef_unions[package_name][
-                                        class_name
-                                    ] = {}
+                                ] = {}
 
-                        ################################################################################
-                        # `define parsing
-                        ################################################################################
-                        tick_define_regex = RE_TICK_DEFINE.search(tick_incl_line)
+                    ################################################################################
+                    # `define parsing
+                    ################################################################################
+                    tick_define_regex = RE_TICK_DEFINE.search(tick_incl_line)
+
+                    if tick_define_regex:
+                        self.dbg("\n::: " + tick_incl_line + " :::")
+                        tick_define_info = tick_define_regex.group(1)
+                        tick_define_info = re.sub(r"\s+", " ", tick_define_info)
+                        tick_define_info = re.sub(
+                            r"\s*\(", " (", tick_define_info, 1
+                        )
+                        tick_incl_line = re.sub(r"\s*\(", " (", tick_incl_line, 1)
 
-                        if tick_define_regex:
-                            self.dbg("\n::: " + tick_incl_line + " :::")
-                            tick_define_info = tick_define_regex.group(1)
-                            tick_define_info = re.sub(r"\s+", " ", tick_define_info)
-                            tick_define_info = re.sub(
-                                r"\s*\(", " (", tick_define_info, 1
-                            )
-                            tick_incl_line = re.sub(r"\s*\(", " (", tick_incl_line, 1)
+                        self.tick_def_proc(module_type, tick_define_info)
 
-                            self.tick_def_proc(module_type, tick_define_info)
+                    ################################################################################
+                    # Parameter parsing
+                    ################################################################################
+                    tick_incl_param_regex = RE_PARAM.search(tick_incl_line)
+                    tick_incl_localparam_regex = RE_LOCALPARAM.search(
+                        tick_incl_line
+                    )
+                    tick_incl_semicolon_regex = RE_SEMICOLON.search(tick_incl_line)
 
-                        ################################################################################
-                        # Parameter parsing
-                        ################################################################################
-                        tick_incl_param_regex = RE_PARAM.search(tick_incl_line)
-                        tick_incl_localparam_regex = RE_LOCALPARAM.search(
-                            tick_incl_line
-                        )
-                        tick_incl_semicolon_regex = RE_SEMICOLON.search(tick_incl_line)
+                    if tick_incl_param_regex or tick_incl_localparam_regex:
+                        if tick_incl_semicolon_regex:  # Complete param ended with ;
+                            self.dbg("\n::: " + tick_incl_line + " :::")
+                            self.param_proc(
+                                module_type,
+                                tick_incl_line,
+                                package_name,
+                                class_name,
+                                "package",
+                            )
+                            tick_incl_gather_till_semicolon = 0
+                        else:  # Multi line param
+                            tick_incl_gather_till_semicolon = 1
 
-                        if tick_incl_param_regex or tick_incl_localparam_regex:
-                            if tick_incl_semicolon_regex:  # Complete param ended with ;
-                                self.dbg("\n::: " + tick_incl_line + " :::")
-                                self.param_proc(
-                                    module_type,
-                                    tick_incl_line,
-                                    package_name,
-                                    class_name,
-                                    "package",
-                                )
-                                tick_incl_gather_till_semicolon = 0
-                            else:  # Multi line param
-                                tick_incl_gather_till_semicolon = 1
+                    ################################################################################
+                    # package parsing
+                    ################################################################################
+                    package_regex = RE_PACKAGE.search(tick_incl_line)
 
-                        ################################################################################
-                        # package parsing
-                        ################################################################################
-                        package_regex = RE_PACKAGE.search(tick_incl_line)
+                    if package_regex:
+                        package_name = package_regex.group(1)
+                        self.dbg("### Parsing Package: " + package_name)
+                        if module_type == "TOP":
+                            self.packages.append(package_name)
+                        else:
+                            self.sub_packages.append(package_name)
 
-                        if package_regex:
+                        if (
+                            inc_type == "IMPORT_COMMANDLINE"
+                            or inc_type == "IMPORT_EMBEDDED"
+                        ):
                             package_name = package_regex.group(1)
-                            self.dbg("### Parsing Package: " + package_name)
-                            if module_type == "TOP":
-                                self.packages.append(package_name)
-                            else:
-                                self.sub_packages.append(package_name)
+                        else:
+                            package_name = "default"
 
-                            if (
-                                inc_type == "IMPORT_COMMANDLINE"
-                                or inc_type == "IMPORT_EMBEDDED"
-                            ):
-                                package_name = package_regex.group(1)
-                            else:
-                                package_name = "default"
+                        if module_type == "TOP":
+                            if package_name not in self.typedef_enums:
+                                self.typedef_enums[package_name] = {}
+                                self.typedef_enums[package_name]["default"] = {}
 
-                            if module_type == "TOP":
-                                if package_name not in self.typedef_enums:
-                                    self.typedef_enums[package_name] = {}
-                                    self.typedef_enums[package_name]["default"] = {}
+                            if package_name not in self.typedef_logics:
+                                self.typedef_logics[package_name] = {}
+                                self.typedef_logics[package_name]["default"] = {}
 
-                                if package_name not in self.typedef_logics:
-                                    self.typedef_logics[package_name] = {}
-                                    self.typedef_logics[package_name]["default"] = {}
+                            if package_name not in self.typedef_structs:
+                                self.typedef_structs[package_name] = {}
+                                self.typedef_structs[package_name]["default"] = {}
 
-                                if package_name not in self.typedef_structs:
-                                    self.typedef_structs[package_name] = {}
-                                    self.typedef_structs[package_name]["default"] = {}
+                            if package_name not in self.typedef_unions:
+                                self.typedef_unions[package_name] = {}
+                                self.typedef_unions[package_name]["default"] = {}
+                        else:
+                            if package_name not in self.sub_typedef_enums:
+                                self.sub_typedef_enums[package_name] = {}
+                                self.sub_typedef_enums[package_name]["default"] = {}
+
+                            if package_name not in self.sub_typedef_logics:
+                                self.sub_typedef_logics[package_name] = {}
+                                self.sub_typedef_logics[package_name][
+                                    "default"
+                                ] = {}
+
+                            if package_name not in self.sub_typedef_structs:
+                                self.sub_typedef_structs[package_name] = {}
+                                self.sub_typedef_structs[package_name][
+                                    "default"
+                                ] = {}
+
+                            if package_name not in self.sub_typedef_unions:
+                                self.sub_typedef_unions[package_name] = {}
+                                self.sub_typedef_unions[package_name][
+                                    "default"
+                                ] = {}
 
-                                if package_name not in self.typedef_unions:
-                                    self.typedef_unions[package_name] = {}
-                                    self.typedef_unions[package_name]["default"] = {}
-                            else:
-                                if package_name not in self.sub_typedef_enums:
-                                    self.sub_typedef_enums[package_name] = {}
-                                    self.sub_typedef_enums[package_name]["default"] = {}
-
-                                if package_name not in self.sub_typedef_logics:
-                                    self.sub_typedef_logics[package_name] = {}
-                                    self.sub_typedef_logics[package_name][
-                                        "default"
-                                    ] = {}
-
-                                if package_name not in self.sub_typedef_structs:
-                                    self.sub_typedef_structs[package_name] = {}
-                                    self.sub_typedef_structs[package_name][
-                                        "default"
-                                    ] = {}
-
-                                if package_name not in self.sub_typedef_unions:
-                                    self.sub_typedef_unions[package_name] = {}
-                                    self.sub_typedef_unions[package_name][
-                                        "default"
-                                    ] = {}
-
-                        ################################################################################
-                        # typedef enum logic extraction
-                        ################################################################################
-                        enum_regex = RE_TYPEDEF_ENUM.search(tick_incl_line)
-
-                        if enum_regex:
-                            if tick_incl_semicolon_regex:  # Complete param ended with ;
-                                tick_incl_line = re.sub(r"\s+", " ", tick_incl_line)
-                                self.dbg("\n### ::: " + tick_incl_line + " :::")
-                                enum_more_regex = RE_TYPEDEF_ENUM_EXTRACT.search(
-                                    tick_incl_line
-                                )
-
-                                if enum_more_regex:
-                                    tick_incl_gather_till_semicolon = 0
-                                    self.enums_proc(
-                                        module_type,
-                                        enum_more_regex.group(2) + ";",
-                                        package_name,
-                                        class_name,
-                                    )
+                    ################################################################################
+                    # typedef enum logic extraction
+                    ################################################################################
+                    enum_regex = RE_TYPEDEF_ENUM.search(tick_incl_line)
 
-                                    tick_incl_line = (
-                                        enum_more_regex.group(1)
-                                        + " "
-                                        + enum_more_regex.group(3)
-                                    )
+                    if enum_regex:
+                        if tick_incl_semicolon_regex:  # Complete param ended with ;
+                            tick_incl_line = re.sub(r"\s+", " ", tick_incl_line)
+                            self.dbg("\n### ::: " + tick_incl_line + " :::")
+                            enum_more_regex = RE_TYPEDEF_ENUM_EXTRACT.search(
+                                tick_incl_line
+                            )
 
-                                    tick_incl_line = re.sub(
-                                        r"\s*logic\s+", "", tick_incl_line
-                                    )
-                                    self.parse_reg_wire_logic(
-                                        module_type,
-                                        "TYPEDEF",
-                                        "logic",
-                                        tick_incl_line,
-                                        package_name,
-                                        class_name,
-                                    )
-                                else:
-                                    self.dbg(
-                                        "\nError: Unable to extract enums from the following"
-                                    )
-                                    self.dbg(tick_incl_line)
-                                    print(
-                                        "\nError: Unable to extract enums from the following"
-                                    )
-                                    print(tick_incl_line)
-                                    self.found_error += 1
-                            else:  # Multi line param
-                                tick_incl_gather_till_semicolon = 1
-
-                        ################################################################################
-                        # typedef logic extraction
-                        ################################################################################
-                        typedef_logic_regex = RE_TYPEDEF_LOGIC.search(tick_incl_line)
-
-                        if typedef_logic_regex:
-                            if tick_incl_semicolon_regex:  # Complete param ended with ;
+                            if enum_more_regex:
                                 tick_incl_gather_till_semicolon = 0
-                                tick_incl_line = re.sub(r"\s+", " ", tick_incl_line)
-                                self.dbg("\n::: " + tick_incl_line + " :::")
-                                tick_incl_line = typedef_logic_regex.group(1)
-
-                                self.parse_reg_wire_logic(
+                                self.enums_proc(
                                     module_type,
-                                    "TYPEDEF",
-                                    "logic",
-                                    tick_incl_line,
+                                    enum_more_regex.group(2) + ";",
                                     package_name,
                                     class_name,
                                 )
-                            else:  # Multi line param
-                                tick_incl_gather_till_semicolon = 1
 
-                        ################################################################################
-                        # typedef struct extraction
-                        ################################################################################
-                        typedef_struct_check_regex = RE_TYPEDEF_STRUCT_CHECK.search(
-                            tick_incl_line
-                        )
-                        typedef_struct_nospace_regex = RE_TYPEDEF_STRUCT_NOSPACE.search(
-                            tick_incl_line
-                        )
-                        typedef_closing_brace_regex = RE_CLOSING_BRACE.search(
-                            tick_incl_line
-                        )
-
-                        if typedef_struct_check_regex or typedef_struct_nospace_regex:
-                            if (
-                                typedef_closing_brace_regex
-                            ):  # Complete param ended with ;
-                                tick_incl_gather_till_semicolon = 0
-                                tick_incl_line = re.sub(r"\s+", " ", tick_incl_line)
-                                self.parse_struct_union(
-                                    "STRUCT",
-                                    module_type,
-                                    tick_incl_line,
-                                    package_name,
-                                    class_name,
+                                tick_incl_line = (
+                                    enum_more_regex.group(1)
+                                    + " "
+                                    + enum_more_regex.group(3)
                                 )
-                                continue
-                            else:  # Multi line param
-                                tick_incl_gather_till_semicolon = 1
-
-                        ################################################################################
-                        # typedef union extraction
-                        ################################################################################
-                        typedef_union_check_regex = RE_TYPEDEF_UNION_CHECK.search(
-                            tick_incl_line
-                        )
-                        typedef_union_nospace_regex = RE_TYPEDEF_UNION_NOSPACE.search(
-                            tick_incl_line
-                        )
-                        typedef_closing_brace_regex = RE_CLOSING_BRACE.search(
-                            tick_incl_line
-                        )
 
-                        if typedef_union_check_regex or typedef_union_nospace_regex:
-                            if (
-                                typedef_closing_brace_regex
-                            ):  # Complete param ended with ;
-                                tick_incl_gather_till_semicolon = 0
-                                tick_incl_line = re.sub(r"\s+", " ", tick_incl_line)
-                                self.parse_struct_union(
-                                    "UNION",
+                                tick_incl_line = re.sub(
+                                    r"\s*logic\s+", "", tick_incl_line
+                                )
+                                self.parse_reg_wire_logic(
                                     module_type,
+                                    "TYPEDEF",
+                                    "logic",
                                     tick_incl_line,
                                     package_name,
                                     class_name,
                                 )
-                                continue
-                            else:  # Multi line param
-                                tick_incl_gather_till_semicolon = 1
+                            else:
+                                self.dbg(
+                                    "\nError: Unable to extract enums from the following"
+                                )
+                                self.dbg(tick_incl_line)
+                                print(
+                                    "\nError: Unable to extract enums from the following"
+                                )
+                                print(tick_incl_line)
+                                self.found_error += 1
+                        else:  # Multi line param
+                            tick_incl_gather_till_semicolon = 1
+
+                    ################################################################################
+                    # typedef logic extraction
+                    ################################################################################
+                    typedef_logic_regex = RE_TYPEDEF_LOGIC.search(tick_incl_line)
 
-                        prev_tick_incl_line = tick_incl_line
+                    if typedef_logic_regex:
+                        if tick_incl_semicolon_regex:  # Complete param ended with ;
+                            tick_incl_gather_till_semicolon = 0
+                            tick_incl_line = re.sub(r"\s+", " ", tick_incl_line)
+                            self.dbg("\n::: " + tick_incl_line + " :::")
+                            tick_incl_line = typedef_logic_regex.group(1)
 
-                if package_function_skip >= 0:
-                    self.dbg(
-                        f"\nError: Missing paired endfunction for function (line {package_function_skip}) detected."
+                            self.parse_reg_wire_logic(
+                                module_type,
+                                "TYPEDEF",
+                                "logic",
+                                tick_incl_line,
+                                package_name,
+                                class_name,
+                            )
+                        else:  # Multi line param
+                            tick_incl_gather_till_semicolon = 1
+
+                    ################################################################################
+                    # typedef struct extraction
+                    ################################################################################
+                    typedef_struct_check_regex = RE_TYPEDEF_STRUCT_CHECK.search(
+                        tick_incl_line
                     )
-                    print(
-                        f"\nError: Missing paired endfunction for function (line {package_function_skip}) detected."
+                    typedef_struct_nospace_regex = RE_TYPEDEF_STRUCT_NOSPACE.search(
+                        tick_incl_line
+                    )
+                    typedef_closing_brace_regex = RE_CLOSING_BRACE.search(
+                        tick_incl_line
                     )
-                    self.found_error += 1
 
-            root, ext = os.path.splitext(tick_inc_file)
-            if self.gen_dependencies:
-                psvfile = re.sub(r"\brtl_[A-Za-z0-9]+\b", "src", root) + ".psv"
-                if os.path.isfile(psvfile):
-                    if os.path.dirname(psvfile) == os.getcwd():
-                        psvfile = os.path.basename(psvfile)
-
-                    if psvfile not in self.dependencies["veripy_subs"]:
-                        self.dependencies["veripy_subs"][psvfile] = {}
-                        self.dependencies["veripy_subs"][psvfile][
-                            "mtime"
-                        ] = getmtime(psvfile)
-                        self.dependencies["veripy_subs"][psvfile]["flags"] = []
-                else:
-                    self.dependencies["include_files"].append(
-                        {tick_inc_file: {"mtime": getmtime(tick_inc_file)}}
+                    if typedef_struct_check_regex or typedef_struct_nospace_regex:
+                        if (
+                            typedef_closing_brace_regex
+                        ):  # Complete param ended with ;
+                            tick_incl_gather_till_semicolon = 0
+                            tick_incl_line = re.sub(r"\s+", " ", tick_incl_line)
+                            self.parse_struct_union(
+                                "STRUCT",
+                                module_type,
+                                tick_incl_line,
+                                package_name,
+                                class_name,
+                            )
+                            continue
+                        else:  # Multi line param
+                            tick_incl_gather_till_semicolon = 1
+
+                    ################################################################################
+                    # typedef union extraction
+                    ################################################################################
+                    typedef_union_check_regex = RE_TYPEDEF_UNION_CHECK.search(
+                        tick_incl_line
+                    )
+                    typedef_union_nospace_regex = RE_TYPEDEF_UNION_NOSPACE.search(
+                        tick_incl_line
+                    )
+                    typedef_closing_brace_regex = RE_CLOSING_BRACE.search(
+                        tick_incl_line
                     )
-        else:
-            if inc_type == "IMPORT_COMMANDLINE" or inc_type == "IMPORT_EMBEDDED":
-                self.dbg("\nError: Unable to find the package file " + inc_file)
-                self.dbg("  List of search directories")
-                print("\nError: Unable to find the package file " + inc_file)
-                print("  List of search directories")
-            else:
-                self.dbg("\nError: Unable to find the `include file " + inc_file)
-                self.dbg("  List of search directories")
-                print("\nError: Unable to find the `include file " + inc_file)
-                print("  List of search directories")
 
-            for dir in self.incl_dirs:
-                self.dbg("    " + str(dir))
-                print("    " + str(dir))
-            sys.exit(1)
+                    if typedef_union_check_regex or typedef_union_nospace_regex:
+                        if (
+                            typedef_closing_brace_regex
+                        ):  # Complete param ended with ;
+                            tick_incl_gather_till_semicolon = 0
+                            tick_incl_line = re.sub(r"\s+", " ", tick_incl_line)
+                            self.parse_struct_union(
+                                "UNION",
+                                module_type,
+                                tick_incl_line,
+                                package_name,
+                                class_name,
+                            )
+                            continue
+                        else:  # Multi line param
+                            tick_incl_gather_till_semicolon = 1
+
+                    prev_tick_incl_line = tick_incl_line
+
+            if package_function_skip >= 0:
+                self.dbg(
+                    f"\nError: Missing paired endfunction for function (line {package_function_skip}) detected."
+                )
+                print(
+                    f"\nError: Missing paired endfunction for function (line {package_function_skip}) detected."
+                )
+                self.found_error += 1
+
+        return
+
+    def record_import_or_include_dependency(self, tick_inc_file):
+        """
+        Function to record a loaded package or 'include file as a dependency
+        """
+        root, ext = os.path.splitext(tick_inc_file)
+        if self.gen_dependencies:
+            psvfile = re.sub(r"\brtl_[A-Za-z0-9]+\b", "src", root) + ".psv"
+            if os.path.isfile(psvfile):
+                if os.path.dirname(psvfile) == os.getcwd():
+                    psvfile = os.path.basename(psvfile)
+
+                if psvfile not in self.dependencies["veripy_subs"]:
+                    self.dependencies["veripy_subs"][psvfile] = {}
+                    self.dependencies["veripy_subs"][psvfile][
+                        "mtime"
+                    ] = getmtime(psvfile)
+                    self.dependencies["veripy_subs"][psvfile]["flags"] = []
+            else:
+                self.dependencies["include_files"].append(
+                    {tick_inc_file: {"mtime": getmtime(tick_inc_file)}}
+                )
 
         return
 
@@ -8277,7 +8497,9 @@ class psv_parser:
 
             # Upper bit def eval
             try:
-                curr_bit_def_val = int(eval(tick_def_is_bitdef.group(1)))
+                curr_bit_def_val = int(
+                    g_const_expr.evaluate(tick_def_is_bitdef.group(1))
+                )
             except (SyntaxError, NameError, TypeError, ZeroDivisionError):
                 curr_bit_def_val = tick_def_is_bitdef.group(1)
 
@@ -8291,7 +8513,9 @@ class psv_parser:
             # Lower bit def eval
             curr_bit_def_val = ""
             try:
-                curr_bit_def_val = int(eval(tick_def_is_bitdef.group(2)))
+                curr_bit_def_val = int(
+                    g_const_expr.evaluate(tick_def_is_bitdef.group(2))
+                )
             except (SyntaxError, NameError, TypeError, ZeroDivisionError):
                 curr_bit_def_val = tick_def_is_bitdef.group(2)
 
@@ -8310,7 +8534,7 @@ class psv_parser:
                 tick_def_info.append(bit_def_val)
         else:
             try:
-                tick_eval_string_val = eval(tick_eval_string)
+                tick_eval_string_val = g_const_expr.evaluate(tick_eval_string)
             except (SyntaxError, NameError, TypeError, ZeroDivisionError):
                 tick_eval_string_val = ""
 
@@ -8343,74 +8567,74 @@ class psv_parser:
         return split_on_word_boundary
 
     def find_module_in_file(self, module_name, file_name):
-        if not os.path.exists(file_name):
-            return False
+        return g_file_index_store.find_module_in_file(module_name, file_name)
 
-        try:
-            with open(file_name) as fp:
-                for line in fp:
-                    if re.match(f"^\s*module\s+{module_name}\\b.*$", line):
-                        return True
-                return False
-        except UnicodeDecodeError:
-            return False
+    def get_file_indexes(self):
+        """
+        Function to return the indexes of the third party filelists and of the
+        files, built on the first lookup
+        """
+        if self.file_indexes is None:
+            self.file_indexes = (
+                g_file_index_store.get_index(
+                    [
+                        (flist, c_file)
+                        for flist in self.flist_lib
+                        for c_file in self.flist_lib[flist]
+                    ]
+                ),
+                g_file_index_store.get_index([(None, c_file) for c_file in self.files]),
+            )
+
+        return self.file_indexes
 
     def find_in_files(self, filename, is_flist=False):
         """
-        Function to print a debug string in a debug dump file
+        Function to find a file in the filelists. Returns the file if found in
+        the files, else the third party filelist it is in, or the file itself
+        with is_flist.
         """
 
         module_name, module_ext = os.path.splitext(filename)
-        for flist in self.flist_lib:
-            for c_file in self.flist_lib[flist]:
-                file_search_regex = "\\b" + filename + "$"
-                RE_SEARCH_FILE_REGEX = re.compile(file_search_regex)
-                search_file_regex = RE_SEARCH_FILE_REGEX.search(c_file)
-
-                if search_file_regex and os.path.isfile(c_file):
-                    if is_flist:
-                        return c_file
-                    else:
-                        return flist
-        for flist in self.flist_lib:
-            for c_file in self.flist_lib[flist]:
-                c_file_root, c_file_ext = os.path.splitext(c_file)
-                if (
-                    (RE_IP_FILE_REGEX.search(c_file) or
-                    (re.match(f"^{module_name}", os.path.basename(c_file_root))
-                    and module_ext == c_file_ext)
-                    ) and
-                    self.find_module_in_file(module_name, c_file)
-                ):
-                    if is_flist:
-                        return c_file
-                    else:
-                        return flist
+        flist_index, files_index = self.get_file_indexes()
 
-        for c_file in self.files:
-            file_search_regex = "\\b" + filename + "$"
-            RE_SEARCH_FILE_REGEX = re.compile(file_search_regex)
-            search_file_regex = RE_SEARCH_FILE_REGEX.search(c_file)
+        for flist, c_file in flist_index.find_file(filename):
+            if os.path.isfile(c_file):
+                if is_flist:
+                    return c_file
+                else:
+                    return flist
 
-            if search_file_regex and  os.path.isfile(c_file):
+        for flist, c_file in flist_index.find_module(module_name, module_ext):
+            if is_flist:
                 return c_file
+            else:
+                return flist
 
-        for c_file in self.files:
-            c_file_root, c_file_ext = os.path.splitext(c_file)
-            if (
-                (RE_IP_FILE_REGEX.search(c_file) or
-                 (re.match(f"^{module_name}", os.path.basename(c_file_root))
-                 and module_ext == c_file_ext)
-                ) and
-                self.find_module_in_file(module_name, c_file)
-            ):
+        for flist, c_file in files_index.find_file(filename):
+            if os.path.isfile(c_file):
                 return c_file
 
+        for flist, c_file in files_index.find_module(module_name, module_ext):
+            return c_file
+
         return
 
     def parse_param_cmds(self, instantiation, sub_param_cmds):
+        """
+        Function to override the sub-instance params with the &Param commands.
+        The last command overriding a param wins, the earlier ones are ignored.
+        """
         (submod_name, inst_name, inst_index) = instantiation
         overriden_sub_params = set()
+
+        # Only the module header params are matched by the regular expressions
+        header_sub_params = [
+            sub_param
+            for sub_param in self.sub_params
+            if self.sub_params[sub_param]["scope"] == "module_header"
+        ]
+
         for param_cmd in reversed(sub_param_cmds):
             param_cmd = re.sub(r"\s+", "#", param_cmd, 1)
 
@@ -8441,14 +8665,7 @@ class psv_parser:
                 if search_slash_regex:
                     search_expr_str = search_slash_regex.group(1)
                     RE_SEARCH_EXPR_REGEX = re.compile(search_expr_str)
-                    sub_params = {
-                        sub_param: self.sub_params[sub_param]
-                        for sub_param in self.sub_params if self.sub_params[sub_param]["scope"] == "module_header"
-                    }
-                    for sub_param in sub_params:
-                        if sub_params[sub_param]["scope"] != "module_header":
-                            continue
-
+                    for sub_param in header_sub_params:
                         sub_param_match = RE_SEARCH_EXPR_REGEX.search(sub_param)
                         if sub_param_match:
                             self.dbg(f"    # Matched sub inst param: {sub_param}")
@@ -8458,14 +8675,14 @@ class psv_parser:
                             else:
                                 overriden_sub_params.add(sub_param)
                             if replace_slash_str:
-                                top_name = re.sub(search_expr_str, replace_expr_str, sub_param)
+                                top_name = RE_SEARCH_EXPR_REGEX.sub(replace_expr_str, sub_param)
                             else:
                                 top_name = replace_direct_str
 
                             if not top_name or top_name == '""':
                                 continue
 
-                            if  re.match(r"^[A-Za-z]\w+$", top_name) and top_name not in self.params:
+                            if RE_PARAM_NAME.match(top_name) and top_name not in self.params:
                                 self.params[top_name] = {}
                                 self.params[top_name]["type"] = self.sub_params[sub_param]["type"]
                                 self.params[top_name]["val"] = self.sub_params[sub_param]["val"]
@@ -8641,7 +8858,7 @@ class psv_parser:
                 if mat:
                     c_topbit1 = mat[1]
                     c_topbit2 = mat[2]
-                    c_topbit1_val = int(eval(c_topbit1))
+                    c_topbit1_val = int(g_const_expr.evaluate(c_topbit1))
                     c_topbitdef = f"{str(c_topbit1_val)}:{c_topbit2}"
             except Exception:
                 pass
@@ -9093,8 +9310,18 @@ class psv_parser:
                             ] = sub_io_bitdef_val[1]
 
     def parse_connect_cmds(self, instantiation, sub_connect_cmds):
+        """
+        Function to bind the sub-instance ports with the &Connect commands. Each
+        command is parsed once into a rule, then the rules are applied to every
+        port in command order, so a later command overrides an earlier one.
+        """
         (submod_name, inst_name, inst_index) = instantiation
-        for connect_cmd in sub_connect_cmds:
+        sub_inst_ports = self.sub_inst_ports[instantiation]
+
+        regex_rules = []
+        direct_rules = {}
+
+        for order, connect_cmd in enumerate(sub_connect_cmds):
             connect_cmd = re.sub(r"##", "//", connect_cmd)
             single_line_comment_regex = re.search(
                 RE_SINGLE_LINE_COMMENT, connect_cmd
@@ -9158,9 +9385,39 @@ class psv_parser:
             replace_direct_str = re.sub(r"\"", "", replace_direct_str)
             search_slash_regex = RE_REGEX_SLASH.search(connect_cmd_array[0])
 
+            # Filtered out port direction
+            if connect_filter == "INPUTS":
+                skip_dir = "output"
+            elif connect_filter == "OUTPUTS":
+                skip_dir = "input"
+            else:
+                skip_dir = None
+
+            rule = {
+                "order": order,
+                "skip_dir": skip_dir,
+                "comment": connect_comment,
+                "replace": None,
+                "origconnect": replace_direct_str,
+                "topname": replace_direct_str,
+                "topbitdef": None,
+            }
+
+            # None keeps the port bit definition
+
+            if replace_direct_str != "":
+                # If this is a constant or param or define or concat of signals, then topbitdef should be empty
+                if (
+                    RE_OPEN_CURLY.search(replace_direct_str)
+                    or RE_NUM_TICK.search(replace_direct_str)
+                    or RE_CONSTANT.search(replace_direct_str)
+                    or RE_DEFINE_TICK_BEGIN.search(replace_direct_str)
+                    or RE_DOT.search(replace_direct_str)
+                ):
+                    rule["topbitdef"] = ""
+
             if search_slash_regex:  # Regular expression on the connect syntax
                 search_expr_str = search_slash_regex.group(1)
-                # search_expr_str = 'r\"' + search_slash_regex.group(1) +'\"'
 
                 self.dbg(
                     "  # SEARCH_EXPR: "
@@ -9173,215 +9430,19 @@ class psv_parser:
                     + connect_filter
                     + ";"
                 )
-                RE_SEARCH_EXPR_REGEX = re.compile(search_expr_str)
-                for c_port in self.sub_inst_ports[instantiation].keys():
-                    # Skipping ports that are not matching the port direction filter
-                    if (
-                            connect_filter == "INPUTS"
-                            and self.sub_inst_ports[instantiation][c_port]["dir"]
-                            == "output"
-                    ):
-                        continue
-                    elif (
-                            connect_filter == "OUTPUTS"
-                            and self.sub_inst_ports[instantiation][c_port]["dir"]
-                            == "input"
-                    ):
-                        continue
-
-                    c_port_regex = RE_SEARCH_EXPR_REGEX.search(c_port)
-
-                    if c_port_regex:  # if matching the regular expression
-                        self.dbg("    # Matched Port: " + c_port)
-
-                        if slash_replace_str:
-                            self.sub_inst_ports[instantiation][c_port][
-                                "topname"
-                            ] = re.sub(
-                                search_expr_str,
-                                replace_expr_str,
-                                self.sub_inst_ports[instantiation][c_port]["name"],
-                            )
-                            self.sub_inst_ports[instantiation][c_port][
-                                "origconnect"
-                            ] = ""
-                            self.dbg(
-                                "      # UPDATED TOP NAME: "
-                                + self.sub_inst_ports[instantiation][c_port][
-                                    "topname"
-                                ]
-                            )
-                            self.sub_inst_ports[instantiation][c_port][
-                                "comment"
-                            ] = connect_comment
 
-                        else:
-                            if replace_direct_str != "":
-                                self.sub_inst_ports[instantiation][c_port][
-                                    "origconnect"
-                                ] = replace_direct_str
-                                topname_is_concat_regex = RE_OPEN_CURLY.search(
-                                    replace_direct_str
-                                )
-                                topname_has_tick_regex = RE_NUM_TICK.search(
-                                    replace_direct_str
-                                )
-                                topname_is_constant_regex = RE_CONSTANT.search(
-                                    replace_direct_str
-                                )
-                                topname_is_define_regex = (
-                                    RE_DEFINE_TICK_BEGIN.search(
-                                        replace_direct_str
-                                    )
-                                )
-                                topname_has_dot_regex = RE_DOT.search(
-                                    replace_direct_str
-                                )
+                rule["search"] = re.compile(search_expr_str)
 
-                                # If this is a constant or param or define or concat of signals, then topbitdef should be empty
-                                if (
-                                        topname_is_concat_regex
-                                        or topname_has_tick_regex
-                                        or topname_is_constant_regex
-                                        or topname_is_define_regex
-                                        or topname_has_dot_regex
-                                ):
-                                    self.sub_inst_ports[instantiation][c_port][
-                                        "topbitdef"
-                                    ] = ""
+                if slash_replace_str:
+                    rule["replace"] = functools.partial(
+                        rule["search"].sub, replace_expr_str
+                    )
 
-                                self.sub_inst_ports[instantiation][c_port][
-                                    "topname"
-                                ] = replace_direct_str
-                                self.dbg(
-                                    "      # UPDATED TOP NAME: "
-                                    + self.sub_inst_ports[instantiation][c_port][
-                                        "topname"
-                                    ]
-                                )
-                                self.sub_inst_ports[instantiation][c_port][
-                                    "comment"
-                                ] = connect_comment
-                            else:  # Unconnected port
-                                self.sub_inst_ports[instantiation][c_port][
-                                    "topname"
-                                ] = ""
-                                self.sub_inst_ports[instantiation][c_port][
-                                    "topbitdef"
-                                ] = ""
-                                self.dbg("      # UNCONNECTED PORT AT TOP")
-                                self.sub_inst_ports[instantiation][c_port][
-                                    "comment"
-                                ] = connect_comment
+                regex_rules.append(rule)
             else:  # Direct mapping of port
                 search_direct_str = connect_cmd_array[0]
 
-                if search_direct_str in self.sub_inst_ports[instantiation]:
-                    # Skipping port that is not matching the port direction filter
-                    if (
-                            connect_filter == "INPUTS"
-                            and self.sub_inst_ports[instantiation][search_direct_str][
-                        "dir"
-                    ]
-                            == "output"
-                    ):
-                        pass
-                    elif (
-                            connect_filter == "OUTPUTS"
-                            and self.sub_inst_ports[instantiation][search_direct_str][
-                                "dir"
-                            ]
-                            == "input"
-                    ):
-                        pass
-                    else:
-                        if replace_direct_str != "":
-                            # TODO: Need to update topbitdef from connect
-                            topname_is_concat_regex = RE_OPEN_CURLY.search(
-                                replace_direct_str
-                            )
-                            topname_has_tick_regex = RE_NUM_TICK.search(
-                                replace_direct_str
-                            )
-                            topname_is_constant_regex = RE_CONSTANT.search(
-                                replace_direct_str
-                            )
-                            topname_is_define_regex = (
-                                RE_DEFINE_TICK_BEGIN.search(replace_direct_str)
-                            )
-                            topname_has_dot_regex = RE_DOT.search(
-                                replace_direct_str
-                            )
-                            self.sub_inst_ports[instantiation][search_direct_str][
-                                "origconnect"
-                            ] = replace_direct_str
-
-                            # If this is a constant or param or define or concat of signals, then topbitdef should be empty
-                            if (
-                                    topname_is_concat_regex
-                                    or topname_has_tick_regex
-                                    or topname_is_constant_regex
-                                    or topname_is_define_regex
-                                    or topname_has_dot_regex
-                            ):
-                                self.sub_inst_ports[instantiation][
-                                    search_direct_str
-                                ]["topbitdef"] = ""
-                                self.sub_inst_ports[instantiation][
-                                    search_direct_str
-                                ]["topname"] = replace_direct_str
-                                self.sub_inst_ports[instantiation][
-                                    search_direct_str
-                                ]["comment"] = connect_comment
-                            else:
-                                topname_bitdef_regex = (
-                                    RE_OPEN_SQBRCT_BITDEF.search(
-                                        replace_direct_str
-                                    )
-                                )
-
-                                if topname_bitdef_regex:
-                                    self.sub_inst_ports[instantiation][
-                                        search_direct_str
-                                    ]["topname"] = topname_bitdef_regex.group(1)
-                                    topbitdef_tmp = topname_bitdef_regex.group(
-                                        2
-                                    )
-                                    topbitdef_tmp = re.sub(
-                                        r"]$", "", topbitdef_tmp
-                                    )
-                                    self.sub_inst_ports[instantiation][
-                                        search_direct_str
-                                    ]["topbitdef"] = topbitdef_tmp
-                                    self.sub_inst_ports[instantiation][
-                                        search_direct_str
-                                    ]["comment"] = connect_comment
-                                else:
-                                    self.sub_inst_ports[instantiation][
-                                        search_direct_str
-                                    ]["topname"] = replace_direct_str
-                                    self.sub_inst_ports[instantiation][
-                                        search_direct_str
-                                    ]["comment"] = connect_comment
-
-                            self.dbg(
-                                "      # UPDATED TOP NAME: "
-                                + self.sub_inst_ports[instantiation][
-                                    search_direct_str
-                                ]["topname"]
-                            )
-                        else:  # Unconnected port
-                            self.sub_inst_ports[instantiation][search_direct_str][
-                                "topname"
-                            ] = ""
-                            self.sub_inst_ports[instantiation][search_direct_str][
-                                "topbitdef"
-                            ] = ""
-                            self.dbg("      # UNCONNECTED PORT AT TOP")
-                            self.sub_inst_ports[instantiation][search_direct_str][
-                                "comment"
-                            ] = connect_comment
-                else:
+                if search_direct_str not in sub_inst_ports:
                     self.dbg(
                         "\nError: Unable to find submodule port "
                         + search_direct_str
@@ -9397,27 +9458,97 @@ class psv_parser:
                     self.found_error += 1
                     sys.exit(1)
 
-    def match(self, pattern, name):
-        slash_regex = RE_REGEX_SLASH.search(pattern)
-        if slash_regex:
-            RE_SLASH_REGEX = re.compile(slash_regex.group(1))
-            if RE_SLASH_REGEX.search(name):
-                return True
-            else:
-                return False
-        else:
-            if pattern == name:
-                return True
-            else:
-                return False
+                rule["search"] = None
+
+                if replace_direct_str != "" and rule["topbitdef"] is None:
+                    # TODO: Need to update topbitdef from connect
+                    topname_bitdef_regex = RE_OPEN_SQBRCT_BITDEF.search(
+                        replace_direct_str
+                    )
+
+                    if topname_bitdef_regex:
+                        rule["topname"] = topname_bitdef_regex.group(1)
+                        rule["topbitdef"] = re.sub(
+                            r"]$", "", topname_bitdef_regex.group(2)
+                        )
+
+                direct_rules.setdefault(search_direct_str, []).append(rule)
+
+        if not regex_rules and not direct_rules:
+            return
+
+        ################################################################################
+        # Applying the rules in command order to every port in one pass
+        ################################################################################
+        dir_rules = {}
+
+        for c_port, c_port_info in sub_inst_ports.items():
+            c_port_dir = c_port_info["dir"]
+
+            # Skipping rules that are not matching the port direction filter
+            if c_port_dir not in dir_rules:
+                dir_rules[c_port_dir] = [
+                    rule for rule in regex_rules if rule["skip_dir"] != c_port_dir
+                ]
+
+            port_rules = [
+                rule
+                for rule in dir_rules[c_port_dir]
+                if rule["search"].search(c_port)
+            ]
+
+            if c_port in direct_rules:
+                port_rules = sorted(
+                    port_rules
+                    + [
+                        rule
+                        for rule in direct_rules[c_port]
+                        if rule["skip_dir"] != c_port_dir
+                    ],
+                    key=lambda rule: rule["order"],
+                )
+
+            for rule in port_rules:
+                if rule["search"] is not None:
+                    if self.debug:
+                        self.dbg("    # Matched Port: " + c_port)
+
+                    if rule["replace"] is not None:
+                        c_port_info["topname"] = rule["replace"](c_port_info["name"])
+                        c_port_info["origconnect"] = ""
+                        c_port_info["comment"] = rule["comment"]
+
+                        if self.debug:
+                            self.dbg(
+                                "      # UPDATED TOP NAME: " + c_port_info["topname"]
+                            )
+
+                        continue
+
+                if rule["origconnect"] != "":
+                    c_port_info["origconnect"] = rule["origconnect"]
+
+                    if rule["topbitdef"] is not None:
+                        c_port_info["topbitdef"] = rule["topbitdef"]
+
+                    c_port_info["topname"] = rule["topname"]
+                    c_port_info["comment"] = rule["comment"]
+
+                    if self.debug:
+                        self.dbg("      # UPDATED TOP NAME: " + c_port_info["topname"])
+                else:  # Unconnected port
+                    c_port_info["topname"] = ""
+                    c_port_info["topbitdef"] = ""
+                    c_port_info["comment"] = rule["comment"]
+
+                    if self.debug:
+                        self.dbg("      # UNCONNECTED PORT AT TOP")
 
     def sub_prep_cmd_filter(self, port, filter):
-        matched = self.match(filter["match"], port)
-        if not matched:
+        if not filter["match_matcher"].match(port):
             return False
-        to_exclude = any([self.match(exclude, port) for exclude in filter["excludes"].split()])
-        return not to_exclude
 
+        return not filter["excludes_matcher"].match(port)
 
     def parse_prep_cmds(self, instantiation):
         (submod_name, inst_name, inst_index) = instantiation
@@ -9447,29 +9578,21 @@ class psv_parser:
                 self.sub_preps[instantiation][-1]["ports"].append(c_port)
 
 
-    def is_forced_internal(self, inst_port):
-        for c_internal in self.force_internals:
-            c_internal = re.sub(r"[;,]", r"", c_internal)
-            c_internal = re.sub(r"\s+", r" ", c_internal)
-            c_internal = re.sub(r"\s*$", r"", c_internal)
-            c_internal = re.sub(r"^\s*", r"", c_internal)
-            force_internal_slash_regex = re.search(RE_REGEX_SLASH, c_internal)
-
-            if force_internal_slash_regex:
-                regex_width = force_internal_slash_regex.group(1)
-            else:
-                regex_width = ""
+    def add_force_internal(self, c_internal):
+        """
+        Function to record a &Force internal command, compiled once here
+        """
+        self.force_internals.append(c_internal)
 
-            RE_FORCE_REGEX = re.compile(regex_width)
-            if regex_width != "":
-                force_internal_slash_regex = re.search(RE_FORCE_REGEX, inst_port)
+        c_internal = re.sub(r"[;,]", r"", c_internal)
+        c_internal = re.sub(r"\s+", r" ", c_internal)
+        c_internal = re.sub(r"\s*$", r"", c_internal)
+        c_internal = re.sub(r"^\s*", r"", c_internal)
 
-                if force_internal_slash_regex:
-                    return True
-            else:
-                if c_internal == inst_port:
-                    return True
-        return False
+        self.force_internal_matcher.add(c_internal)
+
+    def is_forced_internal(self, inst_port):
+        return self.force_internal_matcher.match(inst_port)
 
     def parse_sub_inst_ports(self, instantiation):
         (submod_name, inst_name, inst_index) = instantiation
@@ -10587,7 +10710,8 @@ class psv_parser:
                 if self.gen_dependencies:
                     continue
 
-                self.get_ports(submod_name, submod_file_with_path)
+                with g_profiler.phase("port_resolution"):
+                    self.get_ports(submod_name, submod_file_with_path)
 
                 self.dbg(
                     "\n\n################################################################################"
@@ -10655,7 +10779,8 @@ class psv_parser:
                 self.dbg(json.dumps(self.sub_inst_params[instantiation], indent=2))
                 self.dbg("\n")
 
-                self.parse_sub_inst_ports(instantiation)
+                with g_profiler.phase("port_resolution"):
+                    self.parse_sub_inst_ports(instantiation)
 
                 self.filelist.append(submod_file_with_path)
 
@@ -10751,6 +10876,8 @@ class psv_parser:
                         {
                             "match": match,
                             "excludes": excludes,
+                            "match_matcher": name_matcher([match]),
+                            "excludes_matcher": name_matcher(excludes.split()),
                         }
                     )
 
@@ -11168,7 +11295,9 @@ class psv_parser:
         sub_param_cmds = []
 
         submod_file_with_path = re.sub(r"//", "/", submod_file_with_path)
-        self.get_ports(submod_name, submod_file_with_path)
+
+        with g_profiler.phase("port_resolution"):
+            self.get_ports(submod_name, submod_file_with_path)
 
         self.dbg(
             "\n\n################################################################################"
@@ -11374,7 +11503,7 @@ class psv_parser:
                 if mat:
                     c_topbit1 = mat[1]
                     c_topbit2 = mat[2]
-                    c_topbit1_val = int(eval(c_topbit1))
+                    c_topbit1_val = int(g_const_expr.evaluate(c_topbit1))
                     c_topbitdef = f"{str(c_topbit1_val)}:{c_topbit2}"
             except Exception:
                 pass
@@ -12049,7 +12178,9 @@ class psv_parser:
 
     def prepare_psv(self):
         psv_preper = psv_prep(self)
-        self.constructs = psv_preper.prepare_psv(self.parse_lines)
+
+        with g_profiler.phase("prep"):
+            self.constructs = psv_preper.prepare_psv(self.parse_lines)
 
     def parse_psv_constructs(self):
         """
@@ -12060,6 +12191,8 @@ class psv_parser:
         # sv_parser = verilog_parser(self)
         # vp_parser = veripy_parser(self)
 
+        self.sv_parser.parse_constructs(self.constructs)
+
         for index, construct in enumerate(self.constructs):
             if construct["context"] == "sv":
                 error_count += self.sv_parser.parse_and_process(index, construct)
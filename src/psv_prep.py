@@ -15,14 +15,16 @@ from .regex import (
 )
 
 # For preparing PSV
-RE_VLP_BLOCK_COMMENT_BEGIN_BEGIN = re.compile(r"^\/\*")
-RE_VLP_BLOCK_COMMENT_END_END = re.compile(r"\*\/$")
-RE_VLP_BLOCK_COMMENT_BEGIN_END = re.compile(r"^(.*)\/\*(.*)\*\/(.*)")
-RE_VLP_BLOCK_COMMENT_BEGIN = re.compile(r"^(.+)\/\*")
-RE_VLP_BLOCK_COMMENT_END = re.compile(r"\*\/(.+)$")
+RE_VLP_TASK = re.compile(r"^\s*task\s+.*;")
+RE_VLP_ENDTASK = re.compile(r"^\s*endtask\s+.*")
+RE_VLP_KEYWORD = re.compile(r"^\s*(&\w+)")
+RE_VLP_SEMICOLON_END = re.compile(r";\s*$")
 
-RE_DBL_SLASH_COMMENT_BEGIN = re.compile(r"^\s*\/{2,}")
-RE_DBL_SLASH_COMMENT = re.compile(r"^(.+)\/{2,}")
+# vp constructs followed by a // comment, with the comment rewrite
+RE_VLP_CONNECT_COMMENT = re.compile(r"(&connect[^;]*;)(\s*(\/{2,}.*)*;?)", re.I)
+RE_VLP_PARAM_COMMENT = re.compile(r"(&param[^;]*;)(\s*(\/{2,}.*)*;?)", re.I)
+RE_VLP_DEPEND_COMMENT = re.compile(r"(&depend[^;]*;)(\s*(\/{2,}.*)*;?)", re.I)
+RE_VLP_FORCE_COMMENT = re.compile(r"(&force[^;]*;)(\s*(\/{2,}.*)*;?)", re.I)
 
 sv_construct_stack = []
 vp_construct_stack = []
@@ -45,6 +47,13 @@ VP_CONSTRUCT_END_BEGIN = {
 
 VP_CONSTRUCT_BEGIN_END = {v: k for k, v in VP_CONSTRUCT_END_BEGIN.items()}
 
+SV_CONSTRUCT_BEGIN_REGEXES = {
+    k: re.compile(f"\\b{k}\\b") for k in SV_CONSTRUCT_BEGIN_END.keys()
+}
+SV_CONSTRUCT_END_REGEXES = {
+    k: re.compile(f"\\b{v}\\b") for k, v in SV_CONSTRUCT_BEGIN_END.items()
+}
+
 VP_KEYWORDS = [
     "&Module",
     "&ModuleDef",
@@ -113,6 +122,74 @@ VP_KEYWORDS = [
     "&FB_EnFlop_RST",
 ]
 
+# vp keywords as matched at the beginning of a line. Multi-word keywords are
+# matched by their first word.
+VP_BEGIN_KEYWORDS = {k.lower() for k in VP_CONSTRUCT_BEGIN_END.keys()}
+VP_END_KEYWORDS = {k.lower() for k in VP_CONSTRUCT_END_BEGIN.keys()}
+VP_OTHER_KEYWORDS = {
+    k.strip(";").lower().split()[0] for k in VP_KEYWORDS
+}.difference(VP_BEGIN_KEYWORDS.union(VP_END_KEYWORDS))
+
+
+def normalize_line(line):
+    """
+    Function to collapse the whitespaces of a line into single spaces, without
+    trailing space
+    """
+    words = line.split()
+
+    if len(words) == 0:
+        return ""
+
+    if line[0].isspace():
+        return " " + " ".join(words)
+
+    return " ".join(words)
+
+
+def scan_comments(line):
+    """
+    Function to scan the // and /* */ comment forms of a normalized line in a
+    single pass. Returns a tuple of:
+      - // at the beginning of the line
+      - // after some text
+      - /* at the beginning of the line
+      - */ at the end of the line
+      - (text before, text after) of a /* ... */ comment, or None
+      - text before a /*, or None
+      - text after a */, or None
+    """
+    if "/" not in line:
+        return False, False, False, False, None, None, None
+
+    block_begin = line.rfind("/*")
+    block_end = line.rfind("*/")
+
+    block_comment_begin_end = None
+    if block_end > 0:
+        block_begin_before_end = line.rfind("/*", 0, block_end)
+
+        if block_begin_before_end >= 0:
+            block_comment_begin_end = (
+                line[:block_begin_before_end],
+                line[block_end + 2 :],
+            )
+
+    block_comment_end = None
+    first_block_end = line.find("*/")
+    if 0 <= first_block_end < len(line) - 2:
+        block_comment_end = line[first_block_end + 2 :]
+
+    return (
+        line.lstrip().startswith("//"),
+        line.find("//", 1) > 0,
+        line.startswith("/*"),
+        line.endswith("*/"),
+        block_comment_begin_end,
+        line[:block_begin] if block_begin > 0 else None,
+        block_comment_end,
+    )
+
 
 class psv_prep:
     def __init__(self, psv_parser):
@@ -120,10 +197,13 @@ class psv_prep:
         self.task_context = False
 
     def parse_compiler_directives(self, line, line_no, construct):
+        # All the directives start with a `
+        tick_directive = line.lstrip().startswith("`")
+
         ################################################################################
         # `include processing
         ################################################################################
-        tick_include_regex = RE_TICK_INCLUDE.search(line)
+        tick_include_regex = tick_directive and RE_TICK_INCLUDE.search(line)
 
         if tick_include_regex:
             if self.psv_parser.tick_ifdef_en:
@@ -132,7 +212,7 @@ class psv_prep:
                 )
             return True
 
-        tick_define_regex = RE_TICK_DEFINE.search(line)
+        tick_define_regex = tick_directive and RE_TICK_DEFINE.search(line)
 
         if tick_define_regex:
             if self.psv_parser.tick_ifdef_en:
@@ -141,7 +221,7 @@ class psv_prep:
                 self.psv_parser.tick_def_proc("TOP", tick_def_exp)
             return True
 
-        tick_undef_regex = RE_TICK_UNDEF.search(line)
+        tick_undef_regex = tick_directive and RE_TICK_UNDEF.search(line)
 
         if tick_undef_regex:
             if tick_undef_regex.group(1) not in self.psv_parser.tick_defines:
@@ -161,8 +241,8 @@ class psv_prep:
         ################################################################################
         # `ifdef/endif ENABLE_CUSTOM_STUB processing
         ################################################################################
-        tick_ifdef_enable_custom_stub_regex = RE_TICK_IFDEF_ENABLE_CUSTOM_STUB.search(
-            line
+        tick_ifdef_enable_custom_stub_regex = (
+            tick_directive and RE_TICK_IFDEF_ENABLE_CUSTOM_STUB.search(line)
         )
 
         if tick_ifdef_enable_custom_stub_regex:
@@ -187,6 +267,9 @@ class psv_prep:
                     # construct["lines"].append(line)
             return True
 
+        if not tick_directive:
+            return False
+
         tick_ifdef_regex = RE_TICK_IFDEF.search(line)
         tick_ifndef_regex = RE_TICK_IFNDEF.search(line)
         tick_elif_regex = RE_TICK_ELSIF.search(line)
@@ -238,25 +321,24 @@ class psv_prep:
         return False
 
     def is_orphaned_vp(self, line):
-        end_begin_keys = {k.lower() for k in VP_CONSTRUCT_END_BEGIN.keys()}
-        for vp_keyword in end_begin_keys:
-            if re.match(f"^\s*{vp_keyword}\\b", line.lower()):
-                return True
-        return False
+        vp_keyword_regex = RE_VLP_KEYWORD.match(line.lower())
+
+        return vp_keyword_regex is not None and (
+            vp_keyword_regex.group(1) in VP_END_KEYWORDS
+        )
 
     def is_vp_context_begin(self, line):
-        begin_and_keys = {k.lower() for k in VP_CONSTRUCT_BEGIN_END.keys()}
-        end_begin_keys = {k.lower() for k in VP_CONSTRUCT_END_BEGIN.keys()}
-        all_keys = {k.strip(";").lower() for k in VP_KEYWORDS}
-        for vp_keyword in begin_and_keys:
-            if re.match(f"^\s*{vp_keyword}\\b", line.lower()):
-                vp_construct_stack.append(vp_keyword)
-                return True
+        vp_keyword_regex = RE_VLP_KEYWORD.match(line.lower())
+
+        if vp_keyword_regex is None:
+            return False
+
+        vp_keyword = vp_keyword_regex.group(1)
+
+        if vp_keyword in VP_BEGIN_KEYWORDS or vp_keyword in VP_OTHER_KEYWORDS:
+            vp_construct_stack.append(vp_keyword)
+            return True
 
-        for vp_keyword in all_keys.difference(begin_and_keys.union(end_begin_keys)):
-            if re.match(f"^\s*{vp_keyword}\\b", line.lower()):
-                vp_construct_stack.append(vp_keyword)
-                return True
         return False
 
     def is_vp_context_end(self, line):
@@ -284,19 +366,24 @@ class psv_prep:
             return True
 
     def is_sv_construct_begin(self, line):
-        line = re.sub(r"\/\/.*", "", line)
-        begin_and_keys = {k.lower() for k in SV_CONSTRUCT_BEGIN_END.keys()}
-        for vp_keyword in begin_and_keys:
-            if re.search(f"\\b{vp_keyword}\\b", line):
-                sv_construct_stack.append(vp_keyword)
+        comment = line.find("//")
+        if comment >= 0:
+            line = line[:comment]
+
+        for sv_keyword, sv_keyword_regex in SV_CONSTRUCT_BEGIN_REGEXES.items():
+            if sv_keyword_regex.search(line):
+                sv_construct_stack.append(sv_keyword)
                 return True
 
         return False
 
     def is_sv_construct_end(self, line):
-        line = re.sub(r"\/\/.*", "", line)
+        comment = line.find("//")
+        if comment >= 0:
+            line = line[:comment]
+
         if len(sv_construct_stack) == 0:
-            if re.search(r";\s*$", line):
+            if RE_VLP_SEMICOLON_END.search(line):
                 return True
             else:
                 if line in SV_CONSTRUCT_BEGIN_END.values():
@@ -306,7 +393,7 @@ class psv_prep:
         else:
             sv_construct_begin = sv_construct_stack[-1]
 
-            if re.search(f"\\b{SV_CONSTRUCT_BEGIN_END[sv_construct_begin]}\\b", line):
+            if SV_CONSTRUCT_END_REGEXES[sv_construct_begin].search(line):
                 sv_construct_stack.pop()
                 return True
             else:
@@ -318,6 +405,8 @@ class psv_prep:
         """
         # mixed veripy sv/vp constructs
         constructs = []
+        # ids of the constructs already in the list, for constant time lookups
+        construct_ids = set()
         # default to sv construct
         construct = {
             "context": "sv",
@@ -339,12 +428,12 @@ class psv_prep:
         block_comment_line = -1
 
         for line_no, line in enumerate(lines):
-            line = re.sub(r"\s+", " ", line)
-            line = re.sub(r"\s*$", "", line)
-            if re.match(r"^\s*task\s+.*;", line):
-                self.task_context = True
-            elif re.match(r"^\s*endtask\s+.*", line):
-                self.task_context = False
+            line = normalize_line(line)
+            if "task" in line:
+                if RE_VLP_TASK.match(line):
+                    self.task_context = True
+                elif RE_VLP_ENDTASK.match(line):
+                    self.task_context = False
 
             if (
                 not is_vp_context
@@ -366,22 +455,22 @@ class psv_prep:
                 # construct["end_line"] = line_no
                 continue
 
-            # dbl_slash_comment starting at beginning of line
-            dbl_slash_comment_begin = re.match(RE_DBL_SLASH_COMMENT_BEGIN, line)
-            # dbl_slash_comment not starting at beginning of line
-            dbl_slash_comment = re.match(RE_DBL_SLASH_COMMENT, line)
-
-            # block comment starting at beginning of line
-            block_comment_begin_begin = re.match(RE_VLP_BLOCK_COMMENT_BEGIN_BEGIN, line)
-            # block comment ending to end of line
-            block_comment_end_end = re.search(RE_VLP_BLOCK_COMMENT_END_END, line)
-
-            # block comment begin and end at the same line with extra text at both ends
-            block_comment_begin_end = re.match(RE_VLP_BLOCK_COMMENT_BEGIN_END, line)
-            # block comment not starting at beginning of line
-            block_comment_begin = re.match(RE_VLP_BLOCK_COMMENT_BEGIN, line)
-            # block comment not ending to end of line
-            block_comment_end = re.search(RE_VLP_BLOCK_COMMENT_END, line)
+            (
+                # dbl_slash_comment starting at beginning of line
+                dbl_slash_comment_begin,
+                # dbl_slash_comment not starting at beginning of line
+                dbl_slash_comment,
+                # block comment starting at beginning of line
+                block_comment_begin_begin,
+                # block comment ending to end of line
+                block_comment_end_end,
+                # block comment begin and end at the same line, text at both ends
+                block_comment_begin_end,
+                # block comment not starting at beginning of line
+                block_comment_begin,
+                # block comment not ending to end of line
+                block_comment_end,
+            ) = scan_comments(line)
 
             if dbl_slash_comment_begin:  # // lines
                 construct["lines"].append(line)
@@ -399,6 +488,7 @@ class psv_prep:
                             continued_sv_construct = construct
                         elif len(construct["lines"]) > 0:
                             constructs.append(construct)
+                            construct_ids.add(id(construct))
 
                     is_vp_context = True
                     construct = {
@@ -408,7 +498,7 @@ class psv_prep:
                         "lines": [],
                     }
                 else:
-                    if construct["context"] == "vp" and construct in constructs:
+                    if construct["context"] == "vp" and id(construct) in construct_ids:
                         if sv_not_end and continued_sv_construct:
                             construct = continued_sv_construct
                             sv_not_end = False
@@ -422,53 +512,42 @@ class psv_prep:
                             }
 
                 if dbl_slash_comment:  # ^(.*)// lines
-                    connect_regex = re.search(
-                        r"(&connect[^;]*;)(\s*(\/{2,}.*)*;?)", line, re.I
-                    )
-                    if connect_regex:
-                        line = (
-                            re.sub(r"\/\/", "##", connect_regex.group(1))
-                            + " "
-                            + connect_regex.group(2)
-                        )
-                    param_regex = re.search(
-                        r"(&param[^;]*;)(\s*(\/{2,}.*)*;?)", line, re.I
-                    )
-                    if param_regex:
-                        line = (
-                            re.sub(r"\/\/", '""', param_regex.group(1))
-                            + " "
-                            + param_regex.group(2)
-                        )
-                    depend_regex = re.search(
-                        r"(&depend[^;]*;)(\s*(\/{2,}.*)*;?)", line, re.I
-                    )
-                    if depend_regex:
-                        line = (
-                            re.sub(r"\/\/", "##", depend_regex.group(1))
-                            + " "
-                            + depend_regex.group(2)
-                        )
-                    force_regex = re.search(
-                        r"(&force[^;]*;)(\s*(\/{2,}.*)*;?)", line, re.I
-                    )
-                    if force_regex:
-                        line = force_regex.group(1)
-                        self.psv_parser.ports_w_comment[line] = force_regex.group(2)
+                    # vp constructs followed by a // comment
+                    if "&" in line:
+                        connect_regex = RE_VLP_CONNECT_COMMENT.search(line)
+                        if connect_regex:
+                            line = (
+                                re.sub(r"\/\/", "##", connect_regex.group(1))
+                                + " "
+                                + connect_regex.group(2)
+                            )
+                        param_regex = RE_VLP_PARAM_COMMENT.search(line)
+                        if param_regex:
+                            line = (
+                                re.sub(r"\/\/", '""', param_regex.group(1))
+                                + " "
+                                + param_regex.group(2)
+                            )
+                        depend_regex = RE_VLP_DEPEND_COMMENT.search(line)
+                        if depend_regex:
+                            line = (
+                                re.sub(r"\/\/", "##", depend_regex.group(1))
+                                + " "
+                                + depend_regex.group(2)
+                            )
+                        force_regex = RE_VLP_FORCE_COMMENT.search(line)
+                        if force_regex:
+                            line = force_regex.group(1)
+                            self.psv_parser.ports_w_comment[line] = force_regex.group(2)
 
                 elif block_comment_begin_end:  # ^(.+)/* ... */(.+)$ lines
-                    line = " ".join(
-                        [
-                            block_comment_begin_end.group(1),
-                            block_comment_begin_end.group(3),
-                        ]
-                    )
+                    line = " ".join(block_comment_begin_end)
                     if len(line.strip()) == 0:
                         continue
                 elif block_comment_begin:  # ^(.+)/* lines
                     if not block_comment_end_end:
                         block_comment_line = line_no
-                    line = block_comment_begin.group(1)
+                    line = block_comment_begin
                     if len(line.strip()) == 0:
                         continue
                 if is_vp_context:
@@ -478,8 +557,9 @@ class psv_prep:
                     if self.is_vp_context_end(line):
                         is_vp_context = False
                         constructs.append(construct)
+                        construct_ids.add(id(construct))
                 else:
-                    if re.match(r"^\s*&", line) and self.is_orphaned_vp(line):
+                    if "&" in line and self.is_orphaned_vp(line):
                         continue
 
                     construct["lines"].append(line)
@@ -491,14 +571,14 @@ class psv_prep:
 
                     sv_construct_end = self.is_sv_construct_end(line)
                     sv_not_end = len(sv_construct_stack) != 0 or (
-                        not sv_construct_end and not re.search(r";\s*$", line)
+                        not sv_construct_end and not RE_VLP_SEMICOLON_END.search(line)
                     )
             # block_comment_line >= 0
             else:
                 if block_comment_end or block_comment_end_end:  # */ lines
                     block_comment_line = -1
                     if block_comment_end:
-                        construct["lines"].append(block_comment_end.group(1))
+                        construct["lines"].append(block_comment_end)
                     else:
                         continue
 
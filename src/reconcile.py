@@ -0,0 +1,223 @@
+####################################################################################
+#   Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved.
+#   The following information is considered proprietary and confidential to Facebook,
+#   and may not be disclosed to any third party nor be used for any purpose other
+#   than to full fill service obligations to Facebook
+####################################################################################
+
+import re
+
+from .const_expr import g_const_expr
+from .regex import RE_COLON
+from .utils import dbg
+
+# Scopes of the parameters substituted in the bitdef of the inferred ports
+LOCAL_PARAM_SCOPES = ["module_body", "module_body_local"]
+
+RE_BITDEF_MSB_LSB = re.compile(r"^([^:]+):([^:]+)$")
+RE_PLAIN_PARAM_NAME = re.compile(r"^\w+$")
+
+
+def merge_signal_bitdef(c_signal, signal, decl, decl_type, debug):
+    """
+    Function to widen the bitdef of a reg/wire to the bitdef of the signal of
+    the same name, keeping the highest uwidth and the lowest lwidth
+    """
+    if decl["mode"] == "FORCE":
+        return
+
+    # Keep the highest
+    if int(signal["uwidth"]) > int(decl["uwidth"]):
+        decl["uwidth"] = signal["uwidth"]
+        decl_bitdef_colon_regex = RE_COLON.search(decl["bitdef"])
+        signal_bitdef_colon_regex = RE_COLON.search(signal["bitdef"])
+
+        # Update bitdef with bitdef only if its broken with :
+        if decl_bitdef_colon_regex and signal_bitdef_colon_regex:
+            decl["bitdef"] = (
+                signal_bitdef_colon_regex.group(1)
+                + ":"
+                + decl_bitdef_colon_regex.group(2)
+            )
+            dbg(
+                debug,
+                "  # Updated U_BITDEF "
+                + decl_type
+                + ": "
+                + c_signal
+                + " :: "
+                + decl["bitdef"],
+            )
+        else:  # Otherwise use the uwdith and lwidth for bitdef
+            decl["bitdef"] = str(signal["uwidth"]) + ":" + str(decl["lwidth"])
+            dbg(
+                debug,
+                "  # Updated U_BITDEF (NUM) "
+                + decl_type
+                + ": "
+                + c_signal
+                + " :: "
+                + decl["bitdef"],
+            )
+
+    # Keep the lowest
+    if int(signal["lwidth"]) < int(decl["lwidth"]):
+        decl["lwidth"] = signal["lwidth"]
+        decl_bitdef_colon_regex = RE_COLON.search(decl["bitdef"])
+        signal_bitdef_colon_regex = RE_COLON.search(signal["bitdef"])
+
+        if decl_bitdef_colon_regex and signal_bitdef_colon_regex:
+            decl["bitdef"] = (
+                decl_bitdef_colon_regex.group(1)
+                + ":"
+                + signal_bitdef_colon_regex.group(2)
+            )
+            dbg(
+                debug,
+                "  # Updated L_BITDEF "
+                + decl_type
+                + ": "
+                + c_signal
+                + " :: "
+                + decl["bitdef"],
+            )
+        else:
+            decl["bitdef"] = str(decl["uwidth"]) + ":" + str(signal["lwidth"])
+            dbg(
+                debug,
+                "  # Updated L_BITDEF (NUM) "
+                + decl_type
+                + ": "
+                + c_signal
+                + " :: "
+                + decl["bitdef"],
+            )
+
+
+################################################################################
+# Substitution of the module body parameters in the bitdef of inferred ports
+#
+# The parameters are substituted one by one in declaration order, and the msb
+# of the bitdef is evaluated after each of them, like the original per port
+# loop did. The parameters found in a bitdef are looked up with a single
+# combined regex, so only those are substituted and the others are skipped,
+# and the results are memoized per bitdef.
+################################################################################
+class local_param_subst:
+    def __init__(self, params):
+        self.params = []
+        self.param_indexes = {}
+        self.irregular_indexes = []
+        self.bitdefs = {}
+
+        for param in params:
+            if params[param]["scope"] not in LOCAL_PARAM_SCOPES:
+                continue
+
+            # A separator before the parameter is replaced along with it
+            self.params.append(
+                (
+                    str(params[param]["val"]),
+                    re.compile("(?P<sep>\\W*)" + "\\b" + param + "\\b"),
+                )
+            )
+
+            if RE_PLAIN_PARAM_NAME.match(param):
+                self.param_indexes[param] = len(self.params) - 1
+            else:
+                self.irregular_indexes.append(len(self.params) - 1)
+
+        if self.param_indexes:
+            self.param_names_regex = re.compile(
+                "\\b(?:" + "|".join(self.param_indexes) + ")\\b"
+            )
+        else:
+            self.param_names_regex = None
+
+    def find_param(self, bitdef, start):
+        """
+        Function to return the index of the first parameter from start found in
+        the bitdef, or None
+        """
+        indexes = [index for index in self.irregular_indexes if index >= start]
+
+        if self.param_names_regex is not None:
+            for param in self.param_names_regex.findall(bitdef):
+                if self.param_indexes[param] >= start:
+                    indexes.append(self.param_indexes[param])
+
+        if indexes:
+            return min(indexes)
+
+        return None
+
+    def eval_msb(self, bitdef):
+        """
+        Function to replace the msb of a msb:lsb bitdef by its value, when it
+        evaluates to a number
+        """
+        bitdef_regex = RE_BITDEF_MSB_LSB.match(bitdef)
+
+        if not bitdef_regex:
+            return bitdef
+
+        try:
+            bit1_val = int(g_const_expr.evaluate(bitdef_regex.group(1)))
+        except Exception:
+            return bitdef
+
+        return f"{str(bit1_val)}:{bitdef_regex.group(2)}"
+
+    def get_bitdef(self, bitdef, keep_sep=False):
+        """
+        Function to return the bitdef with the parameters substituted. With
+        keep_sep, the separator found before the first occurrence of each
+        parameter is kept in front of every replaced occurrence.
+        """
+        key = (bitdef, keep_sep)
+
+        if key in self.bitdefs:
+            return self.bitdefs[key]
+
+        result = bitdef
+        evaluated = False
+        index = 0
+
+        while index < len(self.params):
+            param_index = self.find_param(result, index)
+
+            if param_index is None:
+                break
+
+            # The parameters in between are not found, only the msb is evaluated
+            if param_index > index and not evaluated:
+                result = self.eval_msb(result)
+                evaluated = True
+                index += 1
+                continue
+
+            param_val, param_regex = self.params[param_index]
+            param_sep_regex = param_regex.search(result)
+
+            if param_sep_regex and param_sep_regex.group(1) != "::":
+                if keep_sep:
+                    param_val = param_sep_regex.group(1) + param_val
+
+                param_result = param_regex.sub(param_val, result)
+
+                if param_result != result:
+                    result = param_result
+                    evaluated = False
+
+            if not evaluated:
+                result = self.eval_msb(result)
+                evaluated = True
+
+            index = param_index + 1
+
+        if not evaluated and index < len(self.params):
+            result = self.eval_msb(result)
+
+        self.bitdefs[key] = result
+
+        return result
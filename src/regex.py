@@ -33,6 +33,8 @@ RE_HASH_ENDIF = re.compile(r"^\s*#endif.*$")
 RE_HASH_IFDEF_STR = re.compile(r"^\w*$")
 RE_HASH_DEF = re.compile(r"^\s*(\w+)\s+(.+)$")
 RE_HASH_DEF_WO_VAL = re.compile(r"^\s*(\w+)$")
+RE_WORD_END = re.compile(r"\w$")
+RE_WORD_START = re.compile(r"^\w")
 
 RE_IMPORT_COLONS = re.compile(r"^\s*import\s+([A-Za-z0-9_\.]+)\s*::(.*)$")
 RE_IMPORT_INMOD_SEMICOLON = re.compile(
@@ -172,6 +174,7 @@ RE_FORCE_BIND = re.compile(r"^\s*[Bb][Ii][Nn][Dd]\s+(.*)\s*")
 RE_FORCE_WIDTH = re.compile(r"^\s*[Ww][Ii][Dd][Tt][Hh]\s+(.*)\s*")
 RE_WIDTH_SLASH = re.compile(r"\/(.*)\/\s+(.*)\s*")
 RE_REGEX_SLASH = re.compile(r"^\/(.*)\/$")
+RE_PARAM_NAME = re.compile(r"^[A-Za-z]\w+$")
 RE_CONNECT_SLASH = re.compile(r"\/(.*)\/\s+\/(.*)\/")
 RE_FORCE_INTERNAL = re.compile(r"^\s*[Ii][Nn][Tt][Ee][Rr][Nn][Aa][Ll]\s+(.*)\s*")
 RE_FORCE_OTHERS = re.compile(r"^\s*(\w+)\s+(.*)")
@@ -395,6 +398,7 @@ RE_TRANSLATE_OFF = re.compile(r"^\s*//\s*pragma\s+translate_off")
 RE_TRANSLATE_ON = re.compile(r"^\s*//\s*pragma\s+translate_on")
 
 RE_DEPEND = re.compile(r"^\s*&[Dd][Ee][Pp][Ee][Nn][Dd]\s+(.*)\s*;")
+RE_VP_KEYWORD = re.compile(r"&[A-Za-z0-9_$]+")
 
 MONSTER_REGEX_LIST = [
     RE_GENDRIVEZ_VERILOG,
@@ -26,6 +26,8 @@ from typing import Dict, Set
 
 import oyaml as yaml
 
+from .file_index import g_file_index_store
+from .package_store import g_package_store
 from .regex import (
     RE_EQUAL_EXTRACT,
     RE_IF_PREFIX_ITER_CHECK,
@@ -61,6 +63,7 @@ class spec_flow:
         self.module_name = mod_name
         self.incl_dirs = incl_dirs
         self.files = files
+        self.files_index = None
         self.debug = debug_en
         self.parser = parser
         self.if_specs = {}
@@ -92,16 +95,16 @@ class spec_flow:
             self.debug_info.append("\n")
 
     ################################################################################
-    # Function to print a debug string in a debug dump file
+    # Function to find a file in the files list
     ################################################################################
     def find_in_files(self, filename):
-        for c_file in self.files:
-            file_search_regex = "\\b" + filename + "$"
-            RE_SEARCH_FILE_REGEX = re.compile(file_search_regex)
-            search_file_regex = re.search(RE_SEARCH_FILE_REGEX, c_file)
+        if self.files_index is None:
+            self.files_index = g_file_index_store.get_index(
+                [(None, c_file) for c_file in self.files]
+            )
 
-            if search_file_regex:
-                return c_file
+        for tag, c_file in self.files_index.find_file(filename):
+            return c_file
         return
 
     def parse_compiler_directives(self, line):
@@ -268,10 +271,7 @@ class spec_flow:
                     sys.exit(1)
 
                 print("    - Loading Interface Spec " + c_file)
-                fileh = open(c_file, "r")
-                fdata = fileh.read()
-                c_file_if_specs = yaml.load(fdata, Loader=yaml.FullLoader)
-                fileh.close()
+                c_file_if_specs = g_package_store.load_yaml(c_file)
 
                 if c_file_if_specs is None:
                     print(
@@ -317,10 +317,7 @@ class spec_flow:
                     sys.exit(1)
 
                 print("    - Loading Interface Def " + c_file)
-                fileh = open(c_file, "r")
-                fdata = fileh.read()
-                c_file_if_defs = yaml.load(fdata, Loader=yaml.FullLoader)
-                fileh.close()
+                c_file_if_defs = g_package_store.load_yaml(c_file)
 
                 if c_file_if_defs is None:
                     print("\nError: Unable to load the Interface Def  " + c_file + "\n")
@@ -0,0 +1,346 @@
+####################################################################################
+#   Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved.
+#   The following information is considered proprietary and confidential to Facebook,
+#   and may not be disclosed to any third party nor be used for any purpose other
+#   than to full fill service obligations to Facebook
+####################################################################################
+
+import atexit
+import json
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from .package_store import g_package_store
+from .profiler import g_profiler
+
+# Number of modules listed in the printed summary
+TELEMETRY_TOP_N = 10
+
+
+def peak_rss_kb(who="self"):
+    """
+    Function to return the peak resident set size of the process, or of its
+    waited for children, in KB
+    """
+    if resource is None:
+        return 0
+
+    if who == "children":
+        max_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    else:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss is in bytes on macOS
+    if sys.platform == "darwin":
+        max_rss //= 1024
+
+    return max_rss
+
+
+def write_record(telemetry_file, record):
+    """
+    Function to append a record to a JSON lines telemetry file. A record is a
+    single append write, so parallel runs can share the file.
+    """
+    line = json.dumps(record, sort_keys=True) + "\n"
+
+    try:
+        fd = os.open(telemetry_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+    except OSError:
+        print("  # Warning: Unable to write the telemetry file " + telemetry_file)
+
+
+def read_records(telemetry_file):
+    """
+    Function to read the records of a JSON lines telemetry file. Truncated
+    lines of an interrupted run are skipped.
+    """
+    records = []
+
+    with open(telemetry_file, "r") as telemetry_data:
+        for line in telemetry_data:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+
+            if isinstance(record, dict):
+                records.append(record)
+
+    return records
+
+
+def get_rate(hits, misses):
+    if hits + misses == 0:
+        return 0.0
+
+    return 100.0 * hits / (hits + misses)
+
+
+def get_critical_path(module_times, parents):
+    """
+    Function to return the time and the modules of the costliest chain from a
+    top module down to a leaf module. A module is only built after its
+    sub-modules, so no schedule builds the hierarchy faster than this chain.
+    """
+    children = {}
+
+    for child, child_parents in parents.items():
+        for parent in child_parents:
+            children.setdefault(parent, set()).add(child)
+
+    paths = {}
+
+    def get_path(module, visiting):
+        if module in paths:
+            return paths[module]
+
+        best = (0.0, [])
+        visiting.add(module)
+
+        for child in sorted(children.get(module, [])):
+            # A module including itself through the hierarchy ends the chain
+            if child in visiting:
+                continue
+
+            child_path = get_path(child, visiting)
+
+            if child_path[0] > best[0]:
+                best = child_path
+
+        visiting.discard(module)
+
+        paths[module] = (module_times.get(module, 0.0) + best[0], [module] + best[1])
+
+        return paths[module]
+
+    tops = set(module_times) | set(children)
+    tops = [module for module in sorted(tops) if not parents.get(module)]
+
+    critical_path = (0.0, [])
+
+    for module in tops:
+        path = get_path(module, set())
+
+        if path[0] > critical_path[0]:
+            critical_path = path
+
+    return critical_path
+
+
+def summarize_records(records, top_n=TELEMETRY_TOP_N):
+    """
+    Function to aggregate the veripy.py and veripy_build.py records of a build
+    """
+    runs = [record for record in records if record.get("tool") == "veripy"]
+    modules = [
+        record
+        for record in records
+        if record.get("tool") == "veripy_build" and record.get("record") == "module"
+    ]
+    builds = [
+        record
+        for record in records
+        if record.get("tool") == "veripy_build" and record.get("record") == "build"
+    ]
+
+    module_times = {}
+    phases = {}
+    package_hits = 0
+    package_misses = 0
+
+    for run in runs:
+        module_times[run["input_file"]] = (
+            module_times.get(run["input_file"], 0.0) + run["wall_time"]
+        )
+        package_hits += run["package_store"]["hits"]
+        package_misses += run["package_store"]["misses"]
+
+        for phase_name, stats in run["phases"].items():
+            phases[phase_name] = phases.get(phase_name, 0.0) + stats["total_time"]
+
+    parents = {}
+
+    for module in modules:
+        child_parents = parents.setdefault(module["input_file"], set())
+
+        if module["parent"] != "":
+            child_parents.add(module["parent"])
+
+    critical_time, critical_modules = get_critical_path(module_times, parents)
+
+    dep_cache_hits = sum(build["dep_cache"]["hits"] for build in builds)
+    dep_cache_misses = sum(build["dep_cache"]["misses"] for build in builds)
+    cached_modules = sum(1 for module in modules if module["cached"])
+
+    return {
+        "runs": len(runs),
+        "failed_runs": sum(1 for run in runs if run["rc"] != 0),
+        "total_time": sum(run["wall_time"] for run in runs),
+        "max_rss_kb": max(
+            [run["max_rss_kb"] for run in runs]
+            + [build["max_rss_kb"] for build in builds]
+            + [0]
+        ),
+        "slowest": [
+            {
+                "input_file": run["input_file"],
+                "mode": run["mode"],
+                "wall_time": run["wall_time"],
+                "max_rss_kb": run["max_rss_kb"],
+            }
+            for run in sorted(runs, key=lambda run: run["wall_time"], reverse=True)[
+                :top_n
+            ]
+        ],
+        "phases": dict(sorted(phases.items(), key=lambda item: item[1], reverse=True)),
+        "critical_path": {"time": critical_time, "modules": critical_modules},
+        "modules": len(modules),
+        "cached_modules": cached_modules,
+        "dep_cache": {
+            "hits": dep_cache_hits,
+            "misses": dep_cache_misses,
+            "hit_rate": get_rate(dep_cache_hits, dep_cache_misses),
+        },
+        "package_store": {
+            "hits": package_hits,
+            "misses": package_misses,
+            "hit_rate": get_rate(package_hits, package_misses),
+        },
+    }
+
+
+def print_summary(summary, telemetry_file):
+    """
+    Function to print a build summary from summarize_records()
+    """
+    print(
+        f"### Telemetry summary of {summary['runs']} veripy run(s) in {telemetry_file}"
+    )
+    print(
+        f"  # Total run time: {summary['total_time']:.3f}s, "
+        f"failed runs: {summary['failed_runs']}, "
+        f"peak RSS: {summary['max_rss_kb'] / 1024:.1f} MB"
+    )
+
+    if summary["slowest"]:
+        print("  # Slowest modules:")
+
+        for run in summary["slowest"]:
+            print(
+                f"    - {run['input_file']} ({run['mode']}): {run['wall_time']:.3f}s, "
+                f"{run['max_rss_kb'] / 1024:.1f} MB"
+            )
+
+    if summary["phases"]:
+        print("  # Time per phase:")
+
+        for phase_name, total_time in summary["phases"].items():
+            print(f"    - {phase_name}: {total_time:.3f}s")
+
+    if summary["critical_path"]["modules"]:
+        print(f"  # Critical path: {summary['critical_path']['time']:.3f}s")
+
+        for module in summary["critical_path"]["modules"]:
+            print(f"    - {module}")
+
+    if summary["modules"]:
+        print(
+            f"  # Modules: {summary['modules']}, "
+            f"dependencies reused from a cache: {summary['cached_modules']}"
+        )
+
+    for cache_name, cache_title in [
+        ("dep_cache", "Dependency cache"),
+        ("package_store", "Package store"),
+    ]:
+        cache = summary[cache_name]
+
+        if cache["hits"] + cache["misses"] > 0:
+            print(
+                f"  # {cache_title}: {cache['hits']} hit(s), {cache['misses']} "
+                f"miss(es), {cache['hit_rate']:.1f}% hit rate"
+            )
+
+
+################################################################################
+# Telemetry record of a veripy.py run
+#
+# A run appends one JSON line to the telemetry file when it ends, with its wall
+# and CPU time, the time of its phases, its peak RSS and its package store hits
+# and misses. Runs left open by an error are recorded as failed, when the next
+# run starts or when the process exits. In a process running several builds
+# (compile server, in-process veripy_build), the peak RSS is the process one.
+################################################################################
+class telemetry:
+    def __init__(self):
+        self.telemetry_file = ""
+        self.record = None
+        self.start_time = 0
+        self.start_cpu_time = 0
+        self.package_hits = 0
+        self.package_misses = 0
+        self.exit_registered = False
+
+    def start(self, telemetry_file, record):
+        """
+        Function to start the record of a run
+        """
+        if self.record is not None:
+            self.stop(1)
+
+        self.telemetry_file = telemetry_file
+        self.record = dict(record)
+        self.record["pid"] = os.getpid()
+        self.record["start"] = time.time()
+
+        self.package_hits = g_package_store.hits
+        self.package_misses = g_package_store.misses
+
+        g_profiler.start_phases(record["input_file"])
+
+        if not self.exit_registered:
+            atexit.register(self.stop)
+            self.exit_registered = True
+
+        self.start_time = time.perf_counter()
+        self.start_cpu_time = time.process_time()
+
+    def stop(self, rc=1):
+        """
+        Function to end the record of a run and write it
+        """
+        if self.record is None:
+            return
+
+        record = self.record
+        self.record = None
+
+        record["rc"] = rc
+        record["wall_time"] = time.perf_counter() - self.start_time
+        record["cpu_time"] = time.process_time() - self.start_cpu_time
+        record["max_rss_kb"] = peak_rss_kb()
+        record["package_store"] = {
+            "hits": g_package_store.hits - self.package_hits,
+            "misses": g_package_store.misses - self.package_misses,
+        }
+
+        g_profiler.stop()
+        record["phases"] = g_profiler.phase_stats
+
+        write_record(self.telemetry_file, record)
+
+
+# The telemetry record is shared by all the modules of the process
+g_telemetry = telemetry()
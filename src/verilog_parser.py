@@ -1,16 +1,21 @@
+import os
 import re
 import sys
+import tempfile
 import time
 
 import anytree
 from verilog_syntax_check import BranchNode, Node, TokenNode, VeribleVerilogSyntax
 
+from .profiler import g_profiler
 from .verilog_parser_utils import indent, unindent, vp_map
 
 
 class verilog_parser:
     def __init__(self, psv_parser):
         self.psv_parser = psv_parser
+        self.syntax_data = {}
+        self.compact_cst = psv_parser.cmdline.compact_cst
 
     def add_parser_mode_directive(self, lines):
         """
@@ -71,11 +76,13 @@ class verilog_parser:
         """
         options = {}
         options["gen_tree_json"] = True
+        options["compact_tree"] = self.compact_cst
 
         verible_verilog_syntax = VeribleVerilogSyntax("verible-verilog-syntax")
 
         time1 = time.perf_counter()
-        sd = verible_verilog_syntax.parse_string(string, options)
+        with g_profiler.phase("sv_parse"):
+            sd = verible_verilog_syntax.parse_string(string, options)
         time2 = time.perf_counter()
 
         if self.psv_parser.debug:
@@ -83,6 +90,57 @@ class verilog_parser:
 
         return sd
 
+    def parse_constructs(self, constructs):
+        """
+        Function to parse all the systemverilog construct sections of a module in a
+        single verible run. Each section is written to its own file, so the syntax
+        error line numbers stay relative to the section.
+        """
+        options = {}
+        options["gen_tree_json"] = True
+        options["compact_tree"] = self.compact_cst
+
+        self.syntax_data = {}
+
+        sv_indexes = [
+            index
+            for index, construct in enumerate(constructs)
+            if construct["context"] == "sv"
+        ]
+
+        if not sv_indexes:
+            return
+
+        verible_verilog_syntax = VeribleVerilogSyntax("verible-verilog-syntax")
+
+        time1 = time.perf_counter()
+        g_profiler.begin_phase("sv_parse")
+
+        with tempfile.TemporaryDirectory(prefix="veripy_sv_") as tmp_dir:
+            construct_files = {}
+
+            for index in sv_indexes:
+                construct = constructs[index]
+                self.add_parser_mode_directive(construct["lines"])
+                string = "\n".join([l.strip() for l in construct["lines"]])
+
+                construct_file = os.path.join(tmp_dir, f"{index}.sv")
+                with open(construct_file, "w", encoding="utf-8") as cf:
+                    cf.write(string)
+
+                construct_files[construct_file] = index
+
+            sd = verible_verilog_syntax.parse_files(list(construct_files), options)
+
+        for construct_file, index in construct_files.items():
+            self.syntax_data[index] = sd.get(construct_file, None)
+
+        g_profiler.end_phase("sv_parse")
+        time2 = time.perf_counter()
+
+        if self.psv_parser.debug:
+            print(f"\nparse_sv() - Total run time: {time2 - time1}")
+
     def get_map(self, node, map, recursive=False):
         if not isinstance(node, BranchNode):
             return None
@@ -92,9 +150,9 @@ class verilog_parser:
                 print(f"Node: {node}, map: {map}")
                 return None
 
-            for map_key in map:
-                if node.tag == map_key:
-                    return map[map_key]
+            # The maps are the tag -> handler tables
+            if node.tag in map:
+                return map[node.tag]
 
             if recursive:
                 for map_key in map:
@@ -111,9 +169,8 @@ class verilog_parser:
 
         # print(f"{indent_spaces()}[")
         indent()
-        for child_node in node.iter_find_all(
-            lambda n: isinstance(n, Node) and n.parent == node
-        ):
+        # Direct children only, a search of the subtree at every level is quadratic
+        for child_node in node.children:
             child_node_map = self.get_map(child_node, node_map, False)
             if child_node_map:
                 # print(f"{indent_spaces()}Node: {child_node}, veripy parser map: {child_node_map.keys()}\n")
@@ -150,7 +207,8 @@ class verilog_parser:
             print(f"Error - No veripy parser map found for node: {root}")
             sys.exit(1)
 
-        self.traverse_veripy_nodes(root, root_map, self.psv_parser)
+        with g_profiler.phase("cst_process"):
+            self.traverse_veripy_nodes(root, root_map, self.psv_parser)
         time2 = time.perf_counter()
 
         if self.psv_parser.debug:
@@ -163,9 +221,13 @@ class verilog_parser:
         """
         error_count = 0
 
-        self.add_parser_mode_directive(construct["lines"])
-        string = "\n".join([l.strip() for l in construct["lines"]])
-        syntax_data = self.parse(string)
+        # Parsed with the other sections of the module by parse_constructs()
+        if index in self.syntax_data:
+            syntax_data = self.syntax_data.pop(index)
+        else:
+            self.add_parser_mode_directive(construct["lines"])
+            string = "\n".join([l.strip() for l in construct["lines"]])
+            syntax_data = self.parse(string)
 
         if syntax_data is None or syntax_data.errors is None:
             if self.psv_parser.debug and syntax_data is not None and syntax_data.tree:
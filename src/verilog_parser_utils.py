@@ -39,14 +39,28 @@ def indent_spaces():
 
 # Verible CST navigation & processing
 def get_source_text(node):
-    token_nodes = list(node.iter_find_all(lambda n: isinstance(n, TokenNode)))
-    # print(f"{indent_spaces()}token nodse: {token_nodes}")
-    sorted_token_nodes = sorted(token_nodes, key=lambda n: n.start)
-    # print(f"{indent_spaces()}sortedtoken nods: {sorted_token_nodes}")
-    source_text = " ".join([n.text for n in sorted_token_nodes])
+    # Handlers ask for the text of the same nodes again and again
+    source_text = getattr(node, "_source_text", None)
+    if source_text is not None:
+        return source_text
+
+    sd = node.syntax_data
+    token_range = getattr(node, "token_range", None)
+
+    if token_range is not None and sd.tree_tokens_sorted:
+        # The tokens of the node are a slice of the source ordered tree tokens
+        source_text = " ".join(sd.token_texts(token_range[0], token_range[1]))
+    else:
+        token_nodes = list(node.iter_find_all(lambda n: isinstance(n, TokenNode)))
+        # print(f"{indent_spaces()}token nodse: {token_nodes}")
+        sorted_token_nodes = sorted(token_nodes, key=lambda n: n.start)
+        # print(f"{indent_spaces()}sortedtoken nods: {sorted_token_nodes}")
+        source_text = " ".join([n.text for n in sorted_token_nodes])
     source_text = re.sub(r"\s+::\s+", "::", source_text)
     # print(f"{indent_spaces()}Source text: '''{source_text}]'''\n")
 
+    node._source_text = source_text
+
     return source_text
 
 
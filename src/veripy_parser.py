@@ -7,6 +7,7 @@ import time
 import anytree
 from pyparsing import (
     alphanums,
+    And,
     alphas,
     CaselessKeyword,
     CaselessLiteral,
@@ -27,10 +28,12 @@ from pyparsing import (
     lineEnd,
     lineno,
     Literal,
+    MatchFirst,
     nums,
     oneOf,
     OneOrMore,
     Optional,
+    Or,
     ParseException,
     ParserElement,
     ParseResults,
@@ -44,11 +47,21 @@ from pyparsing import (
     ZeroOrMore,
 )
 
-from .regex import RE_ASSIGN2PKG, RE_COMMA, RE_PKG2ASSIGN, RE_RESET_VAL
+from .profiler import g_profiler
+from .regex import (
+    RE_ASSIGN2PKG,
+    RE_COMMA,
+    RE_PKG2ASSIGN,
+    RE_RESET_VAL,
+    RE_VP_KEYWORD,
+)
 from .spec_flow import spec_flow
 
 g_psv_parser = None
 
+# Bound of the packrat cache, the cache is reset for every construct section
+VP_PACKRAT_CACHE_SIZE = 128
+
 
 def get_result_text(tokens):
     result_text = []
@@ -991,7 +1004,7 @@ vp_begin_end_skip = Group(
 def vp_force_internal_callback(s, loc, toks):
     global g_psv_parser
 
-    g_psv_parser.force_internals.append(toks[-2])
+    g_psv_parser.add_force_internal(toks[-2])
 
 
 vp_force_internal = (vp_force_kw + CaselessLiteral("internal") + SkipTo(SEMI) + SEMI)(
@@ -1273,52 +1286,148 @@ vp_to_skip = Group(
 
 to_eol = Suppress(SkipTo(lineEnd(), include=True))
 
-vp_bnf = (
-    # AtLineStart("//&")
-    # + (
-    vp_module
-    | vp_moduledef
-    | vp_ports
-    | vp_logics
-    | vp_regs
-    | vp_wires
-    | vp_gendrive0
-    | vp_gendrivez
-    | vp_gendrive0andz
-    | vp_gendrive0_parameter
-    | vp_genparam
-    | vp_genparam_no_gen_rtl
-    | vp_gennoifdefdrive0
-    | vp_begin_skip_ifdef("vp_begin_skip_ifdef*")
-    | vp_end_skip_ifdef("vp_end_skip_ifdef*")
-    | vp_async_reset
-    | vp_sync_reset
-    | vp_clock
-    | vp_posedge_endposedge("vp_posedge_endposedge*")
-    | vp_negedge_endnegedge("vp_posedge_endposedge*")
-    | vp_python_begin_end("vp_python_begin_end*")
-    | vp_python_post_begin_end("vp_python_post_begin_end*")
-    | vp_auto_instance("vp_auto_instance*")
-    | vp_parser_off_on("vp_parser_off_on*")
-    | vp_begin_end_skip("vp_begin_end_skip*")
-    | vp_force_port("vp_force_port*")
-    | vp_force_internal("vp_force_internal*")
-    | vp_force_width("vp_force_width*")
-    | vp_force_depth("vp_force_depth*")
-    | vp_force_others("vp_force_others*")
-    | vp_force_bind("vp_force_bind*")
-    | vp_pkg2assign("vp_pkg2assign*")
-    | vp_assign2pkg("vp_assign2pkg*")
-    | vp_python_single_line("vp_python_single_line*")
-    | vp_include("vp_include*")
-    | vp_depend("vp_depend*")
-    | vp_to_skip("vp_to_skip*")
-)[1, ...] + StringEnd()
+# A tuple, as module level lists are reset between runs of a compile server
+vp_statements = (
+    vp_module,
+    vp_moduledef,
+    vp_ports,
+    vp_logics,
+    vp_regs,
+    vp_wires,
+    vp_gendrive0,
+    vp_gendrivez,
+    vp_gendrive0andz,
+    vp_gendrive0_parameter,
+    vp_genparam,
+    vp_genparam_no_gen_rtl,
+    vp_gennoifdefdrive0,
+    vp_begin_skip_ifdef("vp_begin_skip_ifdef*"),
+    vp_end_skip_ifdef("vp_end_skip_ifdef*"),
+    vp_async_reset,
+    vp_sync_reset,
+    vp_clock,
+    vp_posedge_endposedge("vp_posedge_endposedge*"),
+    vp_negedge_endnegedge("vp_posedge_endposedge*"),
+    vp_python_begin_end("vp_python_begin_end*"),
+    vp_python_post_begin_end("vp_python_post_begin_end*"),
+    vp_auto_instance("vp_auto_instance*"),
+    vp_parser_off_on("vp_parser_off_on*"),
+    vp_begin_end_skip("vp_begin_end_skip*"),
+    vp_force_port("vp_force_port*"),
+    vp_force_internal("vp_force_internal*"),
+    vp_force_width("vp_force_width*"),
+    vp_force_depth("vp_force_depth*"),
+    vp_force_others("vp_force_others*"),
+    vp_force_bind("vp_force_bind*"),
+    vp_pkg2assign("vp_pkg2assign*"),
+    vp_assign2pkg("vp_assign2pkg*"),
+    vp_python_single_line("vp_python_single_line*"),
+    vp_include("vp_include*"),
+    vp_depend("vp_depend*"),
+    vp_to_skip("vp_to_skip*"),
+)
+
+
+class vp_statement(MatchFirst):
+    """
+    Veripy statement. Statements start with their &Keyword, so a statement is
+    only tried against the alternatives of its keyword, in the order of the
+    full alternation.
+    """
+
+    def __init__(self, exprs):
+        super().__init__(exprs)
+        self.dispatch = None
+
+    def get_keywords(self, expr):
+        """
+        Function to return the keywords an alternative can start with, None if
+        it can start without a keyword
+        """
+        if isinstance(expr, Keyword):
+            return {expr.match.lower()}
+
+        if isinstance(expr, (MatchFirst, Or)):
+            keywords = set()
+
+            for alternative in expr.exprs:
+                alternative_keywords = self.get_keywords(alternative)
+
+                if alternative_keywords is None:
+                    return None
+
+                keywords |= alternative_keywords
+
+            return keywords
+
+        if isinstance(expr, And) and expr.exprs:
+            return self.get_keywords(expr.exprs[0])
+
+        if isinstance(expr, (Group, Combine, Suppress, Forward)):
+            if expr.expr is not None:
+                return self.get_keywords(expr.expr)
+
+        return None
+
+    def build_dispatch(self):
+        """
+        Function to group the alternatives by keyword
+        """
+        keywords = [self.get_keywords(expr) for expr in self.exprs]
+        self.dispatch = {}
+
+        for keyword in set().union(*[k for k in keywords if k is not None]):
+            self.dispatch[keyword] = MatchFirst(
+                [
+                    expr
+                    for expr, expr_keywords in zip(self.exprs, keywords)
+                    if expr_keywords is None or keyword in expr_keywords
+                ]
+            )
+
+        # Alternatives without a keyword are tried for any other statement
+        self.dispatch[None] = MatchFirst(
+            [
+                expr
+                for expr, expr_keywords in zip(self.exprs, keywords)
+                if expr_keywords is None
+            ]
+        )
+
+    def parseImpl(self, instring, loc, doActions=True):
+        if self.dispatch is None:
+            self.build_dispatch()
+
+        keyword_regex = RE_VP_KEYWORD.match(instring, loc)
+        alternatives = None
+
+        if keyword_regex:
+            alternatives = self.dispatch.get(keyword_regex.group(0).lower())
+
+        if alternatives is None:
+            alternatives = self.dispatch[None]
+
+        # Whitespace and comments are already skipped
+        return alternatives._parse(instring, loc, doActions, False)
+
+
+vp_bnf = None
+
+
+def get_vp_bnf():
+    """
+    Function to return the veripy construct grammar, built on first use
+    """
+    global vp_bnf
+
+    if vp_bnf is None:
+        vp_bnf = vp_statement(vp_statements)[1, ...] + StringEnd()
 
+        # Ignoring comments seems to slow down the run time significantly
+        vp_bnf.ignore(dblSlashComment)
+        vp_bnf.ignore(cppStyleComment)
 
-# Ignoring comments seems to slow down the run time significantly
-vp_bnf.ignore(dblSlashComment)
-vp_bnf.ignore(cppStyleComment)
+    return vp_bnf
 
 
 class veripy_parser:
@@ -1328,7 +1437,7 @@ class veripy_parser:
         self.psv_parser = psv_parser
 
         try:
-            ParserElement.enable_packrat()
+            ParserElement.enable_packrat(VP_PACKRAT_CACHE_SIZE)
         except Exception:
             pass
 
@@ -1341,7 +1450,8 @@ class veripy_parser:
         try:
             time1 = time.perf_counter()
 
-            tokens = vp_bnf.parseString(string)
+            with g_profiler.phase("vp_parse"):
+                tokens = get_vp_bnf().parseString(string)
             # tokens = self.vp_bnf.parse_file(self.input_file)
             time2 = time.perf_counter()
             if self.psv_parser.debug:
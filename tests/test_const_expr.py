@@ -0,0 +1,112 @@
+import types
+
+import pytest
+
+from src.codegen import codegen
+from src.const_expr import const_expr_evaluator
+
+
+def get_result(evaluate, expr):
+    try:
+        value = evaluate(expr)
+    except Exception as error:
+        return type(error)
+
+    return (type(value), value)
+
+
+# The value eval returned for each expression, and the value of the evaluator
+@pytest.mark.parametrize(
+    "expr,eval_result,evaluator_result",
+    [
+        ("(4+4)*2", (int, 16), (int, 16)),
+        ("7/2", (float, 3.5), (float, 3.5)),
+        ("10 % 3", (int, 1), (int, 1)),
+        ("1 << 3", (int, 8), (int, 8)),
+        ("0x10 | 1", (int, 17), (int, 17)),
+        ("True", (bool, True), (bool, True)),
+        # Comparisons return 1/0
+        ("3 > 2", (bool, True), (int, 1)),
+        ("2 == 3", (bool, False), (int, 0)),
+        ("1 && 0", SyntaxError, (int, 0)),
+        ("!0", SyntaxError, (int, 1)),
+        # Unary minus binds tighter than **
+        ("-2**2", (int, -4), (int, 4)),
+        # ** is left associative
+        ("2**3**2", (int, 512), (int, 64)),
+        # == binds tighter than &
+        ("1 & 2 == 2", (bool, False), (int, 1)),
+        # Sized and based literals
+        ("8'hFF + 1", SyntaxError, (int, 256)),
+        ("4'hFF", SyntaxError, (int, 15)),
+        ("'d10", SyntaxError, (int, 10)),
+        ("'0", SyntaxError, (int, 0)),
+        ("8'hxx", SyntaxError, SyntaxError),
+        # Conditional operator
+        ("1 ? 2 : 3", SyntaxError, (int, 2)),
+        ("0 ? 1 : 1 ? 2 : 3", SyntaxError, (int, 2)),
+        ("$clog2(16)", SyntaxError, (int, 4)),
+        # Python keyword operators, floor division and builtins
+        ("not 0", (bool, True), (bool, True)),
+        ("not 1 == 2", (bool, True), (bool, True)),
+        ("1 and 2", (int, 2), (int, 2)),
+        ("0 or 3", (int, 3), (int, 3)),
+        ("2 and 0 or 4", (int, 4), (int, 4)),
+        ("0 and W", (int, 0), (int, 0)),
+        ("1 and W", NameError, NameError),
+        ("7//2", (int, 3), (int, 3)),
+        ("max(3, 4) - min(1, 2)", (int, 3), (int, 3)),
+        ("int(7/2) + abs(-1)", (int, 4), (int, 4)),
+        # Errors keep the types eval raised
+        ("W + 1", NameError, NameError),
+        ("1/0", ZeroDivisionError, ZeroDivisionError),
+        ("1 +", SyntaxError, SyntaxError),
+        ("1 not 2", SyntaxError, SyntaxError),
+        ("len('ab')", (int, 2), NameError),
+        ("'a' + 1", TypeError, TypeError),
+    ],
+)
+def test_evaluate_vs_eval(expr, eval_result, evaluator_result):
+    evaluator = const_expr_evaluator()
+
+    assert get_result(lambda expr: eval(expr, {}), expr) == eval_result
+    assert get_result(evaluator.evaluate, expr) == evaluator_result
+    # Memoized values and errors
+    assert get_result(evaluator.evaluate, expr) == evaluator_result
+
+
+@pytest.fixture
+def hash_codegen():
+    cmdline = types.SimpleNamespace(
+        format="sv", enable_dv_api=False, no_ampersand_lines=False
+    )
+    hash_codegen = codegen("test.psv", 0, [], [], 0, "test", 0, cmdline)
+    hash_codegen.hash_def_proc("A 1")
+    hash_codegen.hash_def_proc("B 0")
+    hash_codegen.hash_def_proc("W A*8")
+
+    return hash_codegen
+
+
+@pytest.mark.parametrize(
+    "hash_if_str,decision",
+    [
+        ("A", True),
+        ("C", False),
+        ("(A==1)", True),
+        ("A and not B", True),
+        ("A and B", False),
+        ("not A or B", False),
+        ("W//3 == 2", True),
+        ("max(W, 4) == 8", True),
+    ],
+)
+def test_hash_if_decision(hash_codegen, hash_if_str, decision, capsys):
+    assert bool(hash_codegen.eval_decision(hash_if_str)) == decision
+    assert "Warning" not in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("hash_if_str", ["len(W) == 1", "A ==", "C == 1"])
+def test_hash_if_unsupported_is_reported(hash_codegen, hash_if_str, capsys):
+    assert not hash_codegen.eval_decision(hash_if_str)
+    assert "Unable to evaluate" in capsys.readouterr().out
@@ -0,0 +1,83 @@
+import os
+import shutil
+
+import veripy_build
+
+
+def write_checkout(root):
+    os.makedirs(os.path.join(root, "design"))
+    os.makedirs(os.path.join(root, "incl"))
+
+    with open(os.path.join(root, "design", "top.psv"), "w") as fileh:
+        fileh.write("&Module;\nendmodule\n")
+
+    with open(os.path.join(root, "incl", "defs.vh"), "w") as fileh:
+        fileh.write("`define WIDTH 8\n")
+
+
+def get_dependencies(root):
+    return {
+        "include_files": [{os.path.join(root, "incl", "defs.vh"): {"mtime": 0}}],
+        "header_files": [],
+        "verilog_subs": [],
+        "spec_files": [],
+        "interface_files": [],
+        "module_files": [],
+        "depends": [{"//infra/foo:bar": {}}],
+        "veripy_subs": {},
+        "build_cmd": [],
+    }
+
+
+def store_and_load(tmp_path, store_root, load_root, monkeypatch):
+    dep_cache_dir = str(tmp_path / "cache")
+    args = ["top.psv", "--include", os.path.join(store_root, "incl")]
+
+    monkeypatch.chdir(os.path.join(store_root, "design"))
+    key = veripy_build.dep_cache_key(args, "tool", {}, store_root)
+    veripy_build.dep_cache_store(
+        dep_cache_dir, key, get_dependencies(store_root), {}, store_root
+    )
+
+    monkeypatch.chdir(os.path.join(load_root, "design"))
+    args = ["top.psv", "--include", os.path.join(load_root, "incl")]
+    key = veripy_build.dep_cache_key(args, "tool", {}, load_root)
+
+    return veripy_build.dep_cache_load(dep_cache_dir, key, {}, load_root)
+
+
+def test_depends_targets_are_not_files(tmp_path, monkeypatch):
+    root = str(tmp_path / "checkout")
+    write_checkout(root)
+
+    dependencies = store_and_load(tmp_path, root, root, monkeypatch)
+
+    assert dependencies["depends"] == [{"//infra/foo:bar": {}}]
+    defs = os.path.join(root, "incl", "defs.vh")
+    assert dependencies["include_files"] == [{defs: {"mtime": os.path.getmtime(defs)}}]
+
+
+def test_shared_between_checkouts(tmp_path, monkeypatch):
+    root = str(tmp_path / "checkout")
+    write_checkout(root)
+    other_root = str(tmp_path / "other_checkout")
+    shutil.copytree(root, other_root)
+
+    dependencies = store_and_load(tmp_path, root, other_root, monkeypatch)
+
+    assert dependencies is not None
+    assert next(iter(dependencies["include_files"][0])) == os.path.join(
+        other_root, "incl", "defs.vh"
+    )
+
+
+def test_changed_dependency_misses(tmp_path, monkeypatch):
+    root = str(tmp_path / "checkout")
+    write_checkout(root)
+    other_root = str(tmp_path / "other_checkout")
+    shutil.copytree(root, other_root)
+
+    with open(os.path.join(other_root, "incl", "defs.vh"), "w") as fileh:
+        fileh.write("`define WIDTH 16\n")
+
+    assert store_and_load(tmp_path, root, other_root, monkeypatch) is None
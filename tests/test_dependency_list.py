@@ -0,0 +1,48 @@
+import shutil
+
+import pytest
+
+import veripy
+from src import memgen_util
+
+
+@pytest.mark.skipif(
+    shutil.which("verible-verilog-syntax") is None,
+    reason="verible-verilog-syntax is not in the PATH",
+)
+def test_python_files_and_module_tables(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("FB_CHIP", "zeus")
+    monkeypatch.setenv("ASIC_VENDOR", "brcm_apd_n3")
+
+    with open("leaf.psv", "w") as fileh:
+        fileh.write(
+            "module leaf (\n"
+            "  input  wire clk,\n"
+            "  input  wire [7:0] d,\n"
+            "  output reg  [7:0] q\n"
+            ");\n"
+            "  always @(posedge clk) q <= d;\n"
+            "endmodule\n"
+        )
+
+    # A module level table of the veripy modules, reset before every run
+    with open("load.py", "w") as fileh:
+        fileh.write(
+            "from src import memgen_util\n"
+            "memgen_util.depth_partition_input_ports.append('load.py')\n"
+        )
+
+    ports = list(memgen_util.depth_partition_input_ports)
+    tables = veripy.snapshot_module_tables()
+
+    args = ["leaf.psv", "-py", "load.py"]
+
+    for _ in range(2):
+        dependencies = veripy.get_dependency_list(args, tables)
+
+        assert "Loading Python file load.py" in capsys.readouterr().out
+        assert memgen_util.depth_partition_input_ports == ports + ["load.py"]
+        assert dependencies["veripy_subs"] == {}
+
+    veripy.reset_module_tables(tables)
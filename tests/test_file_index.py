@@ -0,0 +1,36 @@
+import os
+
+from src.file_index import file_index, file_index_store
+from src.package_store import g_package_store
+
+
+def write_files(tmp_path):
+    entries = []
+
+    for name in ["fifo.sv", "fifo_ctrl.sv", "async_fifo.sv", "fifo_pkg.sv"]:
+        c_file = str(tmp_path / "rtl" / name)
+        os.makedirs(os.path.dirname(c_file), exist_ok=True)
+
+        with open(c_file, "w") as fileh:
+            fileh.write("module " + os.path.splitext(name)[0] + ";\nendmodule\n")
+
+        entries.append((None, c_file))
+
+    return entries
+
+
+def test_disk_index_matches_built_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(g_package_store, "cache_dir", str(tmp_path / "cache"))
+    entries = write_files(tmp_path)
+
+    file_index_store().get_index(entries)
+    cache_files = os.listdir(str(tmp_path / "cache" / "files"))
+    assert len(cache_files) == 1 and cache_files[0].endswith(".json")
+
+    index = file_index_store().get_index(entries)
+    built_index = file_index(list(entries))
+
+    assert index.get_tables() == built_index.get_tables()
+    assert index.find_file("fifo.sv") == built_index.find_file("fifo.sv")
+    assert index.find_module("fifo_ctrl", ".sv") == [entries[1]]
+    assert index.find_module("fifo", ".sv") == [entries[0]]
@@ -0,0 +1,68 @@
+import inspect
+import threading
+import time
+
+import pytest
+
+import veripy_build
+
+SUB_FILES = ["sub" + str(index) + ".psv" for index in range(8)]
+
+
+def gen_dependencies(in_file, jobs):
+    params = inspect.signature(veripy_build.gen_dependencies).parameters
+    args = {
+        name: "" for name, param in params.items() if param.default is param.empty
+    }
+    args.update(
+        IN_FILE_OPTION=in_file,
+        VERIPY_SCRIPT="veripy.py",
+        build_subdirs_dict={},
+        use_dict=False,
+        use_prev_dict=False,
+    )
+
+    return veripy_build.gen_dependencies(jobs=jobs, **args)
+
+
+@pytest.fixture
+def dependency_runs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runs = []
+    lock = threading.Lock()
+
+    def run_dependency_cmd(RUN_CMD, OUTPUT_FILE, keep_output=False):
+        in_file = RUN_CMD.split()[1]
+
+        with lock:
+            runs.append(in_file)
+
+        if in_file == "sub0.psv":
+            raise RuntimeError("worker died")
+
+        time.sleep(0.2)
+        veripy_subs = {}
+
+        if in_file == "top.psv":
+            veripy_subs = {sub_file: {"flags": ""} for sub_file in SUB_FILES}
+
+        return 0, b"", {"veripy_subs": veripy_subs, "depends": []}
+
+    monkeypatch.setattr(veripy_build, "run_dependency_cmd", run_dependency_cmd)
+
+    return runs
+
+
+def test_raised_run_is_a_build_error(dependency_runs, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        gen_dependencies("top.psv", 2)
+
+    out = capsys.readouterr().out
+
+    assert exit_info.value.code == 1
+    assert "RuntimeError: worker died" in out
+    assert "Error: Please fix the build error for sub0.psv" in out
+
+    # The runs still queued are cancelled
+    assert dependency_runs[0] == "top.psv"
+    assert len(dependency_runs) < 1 + len(SUB_FILES)
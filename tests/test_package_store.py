@@ -0,0 +1,192 @@
+import os
+import types
+from collections import OrderedDict, defaultdict
+
+from src.package_store import package_store
+
+
+def store_entry(cache_dir, src_file):
+    store = package_store()
+    store.set_cache_dir(cache_dir)
+    store.store(
+        ("TOP", "IMPORT_COMMANDLINE", src_file),
+        [src_file],
+        [],
+        [("my_pkg.sv", src_file)],
+        ["params", "packages"],
+        [{"WIDTH": {"val": 8, "scope": ("my_pkg", "default")}}, ["my_pkg"]],
+        {},
+        "    - Importing package " + src_file + "\n",
+    )
+
+    return store
+
+
+def lookup_entry(cache_dir, src_file):
+    store = package_store()
+    store.set_cache_dir(cache_dir)
+
+    return store, store.lookup(
+        ("TOP", "IMPORT_COMMANDLINE", src_file), lambda inc_file: src_file
+    )
+
+
+def write_package(tmp_path):
+    src_file = str(tmp_path / "my_pkg.sv")
+
+    with open(src_file, "w") as fileh:
+        fileh.write("package my_pkg;\n  parameter WIDTH = 8;\nendpackage\n")
+
+    return src_file
+
+
+def test_disk_entries_round_trip(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    src_file = write_package(tmp_path)
+    store_entry(cache_dir, src_file)
+
+    store, entry = lookup_entry(cache_dir, src_file)
+
+    assert store.hits == 1
+    assert entry["attrs"] == ["params", "packages"]
+    assert entry["loads"] == [("my_pkg.sv", src_file)]
+
+    parser = types.SimpleNamespace(params={}, packages=[])
+    store.restore(parser, entry["attrs"], entry["state"])
+
+    assert parser.params["WIDTH"]["scope"] == ("my_pkg", "default")
+    assert parser.packages == ["my_pkg"]
+
+
+def test_changed_file_misses(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    src_file = write_package(tmp_path)
+    store_entry(cache_dir, src_file)
+
+    with open(src_file, "a") as fileh:
+        fileh.write("// changed\n")
+
+    store, entry = lookup_entry(cache_dir, src_file)
+
+    assert entry is None
+    assert store.misses == 1
+
+
+def test_shared_writable_directory_is_refused(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    os.makedirs(cache_dir)
+    os.chmod(cache_dir, 0o777)
+
+    store = package_store()
+    store.set_cache_dir(cache_dir)
+
+    assert store.cache_dir == ""
+
+
+def test_writable_entry_is_ignored(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    src_file = write_package(tmp_path)
+    store = store_entry(cache_dir, src_file)
+
+    cache_file = store.cache_file(("TOP", "IMPORT_COMMANDLINE", src_file))
+    os.chmod(cache_file, 0o666)
+
+    store, entry = lookup_entry(cache_dir, src_file)
+
+    assert entry is None
+
+
+def test_non_core_tables_round_trip(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    src_file = write_package(tmp_path)
+    key = ("TOP", "IMPORT_COMMANDLINE", src_file)
+    enums = defaultdict(list, {"state_e": ["IDLE", "BUSY"]})
+    classes = OrderedDict([("b", {"x": ("y", 1)}), ("a", OrderedDict(z=2))])
+    tagged = (b"package_store", "tuple", [])
+
+    store = package_store()
+    store.set_cache_dir(cache_dir)
+    store.store(
+        key, [src_file], [], [], ["enums", "classes"], [enums, classes], {}, ""
+    )
+    store.store(key + ("tagged",), [src_file], [], [], ["tagged"], [tagged], {}, "")
+
+    store, entry = lookup_entry(cache_dir, src_file)
+    parser = types.SimpleNamespace(enums=None, classes=None, tagged=None)
+    store.restore(parser, entry["attrs"], entry["state"])
+
+    assert store.hits == 1
+    assert type(parser.enums) is defaultdict and parser.enums == enums
+    assert parser.enums.default_factory is list
+    assert type(parser.classes) is OrderedDict and parser.classes == classes
+    assert list(parser.classes) == ["b", "a"]
+    assert type(parser.classes["a"]) is OrderedDict
+
+    entry = store.lookup(key + ("tagged",), lambda inc_file: src_file)
+    store.restore(parser, entry["attrs"], entry["state"])
+
+    assert parser.tagged == tagged
+
+
+def test_only_changed_entries_are_recorded(tmp_path):
+    src_file = write_package(tmp_path)
+    key = ("TOP", "IMPORT_COMMANDLINE", src_file)
+    params = {"A": {"val": 1}, "B": {"val": 2}, "C": {"val": 3}}
+
+    store = package_store()
+    before = store.snapshot([params])
+    del params["B"]
+    params["C"]["val"] = 4
+    params["D"] = {"val": 5}
+    store.store(key, [src_file], [], [], ["params"], [params], {}, "", before)
+
+    entry = store.lookup(key, lambda inc_file: src_file)
+
+    assert store.thaw(entry["state"][0]) == {
+        "update": {"C": {"val": 4}, "D": {"val": 5}},
+        "remove": ["B"],
+    }
+
+    run_params = {"A": {"val": 1}, "B": {"val": 2}, "C": {"val": 3}}
+    parser = types.SimpleNamespace(params=run_params)
+    store.restore(parser, entry["attrs"], entry["state"])
+
+    assert parser.params is run_params
+    assert list(run_params.items()) == list(params.items())
+
+    # The recorded entries are not shared with the run
+    run_params["D"]["val"] = 6
+    params["D"]["val"] = 7
+    assert store.thaw(entry["state"][0])["update"]["D"] == {"val": 5}
+
+    # A changed order of the entries records the whole table
+    params = {"A": 1, "B": 2}
+    before = store.snapshot([params])
+    del params["A"]
+    params["A"] = 1
+    store.store(key, [src_file], [], [], ["params"], [params], {}, "", before)
+
+    changes = store.thaw(store.entries[key]["state"][0])
+
+    assert changes == {"value": {"B": 2, "A": 1}}
+    assert list(changes["value"]) == ["B", "A"]
+
+
+def test_unmarshallable_table_stays_in_memory(tmp_path, capsys):
+    cache_dir = str(tmp_path / "cache")
+    src_file = write_package(tmp_path)
+    key = ("TOP", "IMPORT_COMMANDLINE", src_file)
+    functions = {"f": types.SimpleNamespace(ret="logic")}
+
+    store = package_store()
+    store.set_cache_dir(cache_dir)
+    store.store(key, [src_file], [], [], ["functions"], [functions], {}, "")
+
+    assert "Unable to write the package store file" in capsys.readouterr().out
+
+    entry = store.lookup(key, lambda inc_file: src_file)
+    parser = types.SimpleNamespace(functions={})
+    store.restore(parser, entry["attrs"], entry["state"])
+
+    assert parser.functions == functions
+    assert parser.functions["f"] is not functions["f"]
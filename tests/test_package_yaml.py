@@ -0,0 +1,202 @@
+import json
+import os
+import random
+import types
+from collections import defaultdict
+
+import pytest
+
+import veripy
+from src.regex import RE_ENUM_IMPLICIT_COUNT
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data", "package_yaml")
+
+
+def top_args(inst_ports, ports):
+    inst_files = {
+        instantiation: "/repo/infra_asic_fpga/rtl/" + instantiation[0] + ".sv"
+        for instantiation in inst_ports
+    }
+    cmdline = types.SimpleNamespace(chip="zeus")
+
+    return ("top", ports, cmdline, inst_files, list(inst_ports), inst_ports)
+
+
+def gen_top():
+    ports = {
+        "clk": {"bitdef": ""},
+        "data_in": {"bitdef": "7:0"},
+        "NC_spare": {"bitdef": "1:0"},
+        "VDD": {"bitdef": ""},
+    }
+    inst_ports = {
+        ("fifo", "u_fifo", 0): {
+            "clk": {"topname": "clk", "topbitdef": "", "bitdef": ""},
+            "din": {"topname": "data_in", "topbitdef": "7:0", "bitdef": "7:0"},
+            "dout": {"topname": "fifo_data", "topbitdef": "7:0", "bitdef": "7:0"},
+            "vdd": {"topname": "VDD", "topbitdef": "", "bitdef": ""},
+            "test": {"topname": "'0", "topbitdef": "", "bitdef": ""},
+        },
+        ("sink", "u_sink", 1): {
+            "clk": {"topname": "clk", "topbitdef": "", "bitdef": ""},
+            "din": {"topname": "fifo_data", "topbitdef": "7:0", "bitdef": "7:0"},
+            "sel": {"topname": "mode[2]", "topbitdef": "", "bitdef": ""},
+            "debug": {"topname": "", "topbitdef": None, "bitdef": "3:0"},
+        },
+        ("ctrl", "u_ctrl", 2): {
+            "mode": {"topname": "mode[2]", "topbitdef": "", "bitdef": ""},
+            "status": {"topname": None, "topbitdef": None, "bitdef": ""},
+        },
+    }
+
+    return top_args(inst_ports, ports)
+
+
+def gen_random_top(rng):
+    ports = {"p" + str(i): {"bitdef": rng.choice(["", "3:0"])} for i in range(5)}
+    ports["NC_a"] = {"bitdef": "1:0"}
+    ports["VDD_x"] = {"bitdef": ""}
+    num_insts = rng.randrange(2, 12)
+    num_nets = rng.randrange(1, 6)
+    inst_ports = {}
+
+    for inst_index in range(num_insts):
+        # Reused instance names are not connected to each other
+        inst_name = "u" + str(inst_index)
+        if num_insts > 3 and rng.random() < 0.1:
+            inst_name = "u" + str(inst_index % (num_insts - 1))
+
+        instantiation = ("m" + str(inst_index % 3), inst_name, inst_index)
+        inst_ports[instantiation] = {}
+
+        for port_index in range(rng.randrange(1, 8)):
+            topname = rng.choice(
+                [
+                    None,
+                    "",
+                    "'0",
+                    "VDD_x",
+                    "p" + str(rng.randrange(5)),
+                    "n" + str(rng.randrange(num_nets)),
+                    "e" + str(rng.randrange(3)) + "[" + str(rng.randrange(3)) + "]",
+                ]
+            )
+            inst_ports[instantiation]["q" + str(port_index)] = {
+                "topname": topname,
+                "topbitdef": rng.choice(["", "3:0", None]),
+                "bitdef": rng.choice(["", "1:0"]),
+            }
+
+    return top_args(inst_ports, ports)
+
+
+def get_reference_inst_conns(top_module_name, ports, inst_ports):
+    """
+    The connections of the instances, matching every instance port against
+    every port of the other instances like gen_package_yaml_file used to
+    """
+    inst_conns = {}
+    inst_conn_set = set()
+    top_inst_name = "u_" + top_module_name
+
+    def add_inst_conn(inst_name, signal, connection):
+        if connection in inst_conn_set:
+            return
+
+        if inst_name not in inst_conns:
+            inst_conns[inst_name] = defaultdict(list)
+        inst_conns[inst_name][signal].append(connection)
+
+        inst_conn_set.add(connection)
+
+    for port in sorted({p for p in ports if p.startswith("NC_")}):
+        bitdef = "[" + ports[port]["bitdef"] + "]" if ports[port]["bitdef"] else ""
+        add_inst_conn(top_inst_name, port, (top_inst_name, port, bitdef))
+
+    for instantiation1 in inst_ports:
+        inst_name1 = instantiation1[1]
+
+        for port1, port_info1 in inst_ports[instantiation1].items():
+            signal1 = port_info1["topname"]
+            signal_bitdef1 = port_info1["topbitdef"]
+            connection1 = (inst_name1, port1, port_info1["bitdef"])
+
+            if signal1 == "'0":
+                continue
+
+            if signal1 == "" or signal1 is None:
+                add_inst_conn(inst_name1, "", connection1)
+                continue
+
+            if signal1 in ports:
+                if any(x in signal1 for x in ["VSS", "VDD", "VPP", "VQPS", "GND"]):
+                    continue
+                connection = (top_inst_name, signal1, signal_bitdef1)
+                add_inst_conn(inst_name1, signal1, connection)
+
+            add_inst_conn(inst_name1, signal1, connection1)
+
+            for instantiation2 in inst_ports:
+                if instantiation2[1] == inst_name1:
+                    continue
+
+                for port2, port_info2 in inst_ports[instantiation2].items():
+                    signal2 = port_info2["topname"]
+                    bitdef2 = port_info2["bitdef"]
+
+                    if signal2 == "" or signal2 is None:
+                        continue
+
+                    enum_implicit_count_regex = RE_ENUM_IMPLICIT_COUNT.search(signal2)
+                    if enum_implicit_count_regex:
+                        signal2 = enum_implicit_count_regex.group(1)
+                        bitdef2 = enum_implicit_count_regex.group(2)
+
+                    if (signal1, signal_bitdef1) == (signal2, port_info2["topbitdef"]):
+                        connection = (instantiation2[1], port2, bitdef2)
+                        add_inst_conn(inst_name1, signal1, connection)
+
+    return inst_conns
+
+
+@pytest.fixture
+def run_gen_package_yaml_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output_file = str(tmp_path / "top.sv")
+    monkeypatch.setattr(veripy, "output_file", output_file, raising=False)
+
+    def run(args):
+        monkeypatch.setattr(veripy, "inst_conns", {})
+        monkeypatch.setattr(veripy, "inst_conn_set", set())
+        veripy.gen_package_yaml_file(*args)
+
+        with open(str(tmp_path / "top_inst_conns.json")) as json_file:
+            inst_conns = json_file.read()
+
+        with open(str(tmp_path / "top.yaml")) as yaml_file:
+            package_yaml = yaml_file.read()
+
+        return inst_conns, package_yaml
+
+    return run
+
+
+def test_package_yaml_matches_expected(run_gen_package_yaml_file):
+    inst_conns, package_yaml = run_gen_package_yaml_file(gen_top())
+
+    with open(os.path.join(DATA_DIR, "top_inst_conns.json")) as json_file:
+        assert inst_conns == json_file.read()
+
+    with open(os.path.join(DATA_DIR, "top.yaml")) as yaml_file:
+        assert package_yaml == yaml_file.read()
+
+
+def test_inst_conns_match_reference(run_gen_package_yaml_file):
+    rng = random.Random(5)
+
+    for _ in range(200):
+        args = gen_random_top(rng)
+        inst_conns, _ = run_gen_package_yaml_file(args)
+        reference = get_reference_inst_conns(args[0], args[1], args[5])
+
+        assert inst_conns == json.dumps(reference, indent=4)
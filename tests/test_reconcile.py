@@ -0,0 +1,120 @@
+import glob
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from src.reconcile import local_param_subst
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Inputs veripy.py does not compile here, keyed by their .sv output
+UNIT_TEST_FAILURES = {
+    "case3/test_generate.sv": "syntax errors in the expanded file",
+    "case5/test_verilog_basic4.sv": "syntax errors in the expanded file",
+    "case10/test_generate.sv": "syntax errors in the expanded file",
+    "case6/test_task1.sv": "some verible-verilog-syntax leave the root untagged",
+}
+
+
+def get_unit_test_cases():
+    cases = []
+    unit_tests_dir = os.path.join(REPO_DIR, "unit_tests")
+
+    for in_file in sorted(glob.glob(os.path.join(unit_tests_dir, "case*", "*"))):
+        if os.path.splitext(in_file)[1] not in [".psv", ".pv"]:
+            continue
+
+        out_file = os.path.splitext(in_file)[0] + ".sv"
+        case_id = os.path.relpath(out_file, unit_tests_dir)
+
+        marks = []
+        if case_id in UNIT_TEST_FAILURES:
+            marks.append(pytest.mark.xfail(reason=UNIT_TEST_FAILURES[case_id]))
+
+        cases.append(pytest.param(in_file, out_file, id=case_id, marks=marks))
+
+    return cases
+
+
+@pytest.mark.skipif(
+    shutil.which("verible-verilog-syntax") is None,
+    reason="verible-verilog-syntax is not in the PATH",
+)
+@pytest.mark.parametrize("in_file,out_file", get_unit_test_cases())
+def test_unit_test_case_output(in_file, out_file, tmp_path):
+    case_dir = str(tmp_path / "case")
+    shutil.copytree(os.path.dirname(in_file), case_dir)
+
+    new_out_file = os.path.join(case_dir, os.path.basename(out_file))
+    if os.path.isfile(new_out_file):
+        os.remove(new_out_file)
+
+    env = dict(os.environ)
+    env.setdefault("FB_CHIP", "zeus")
+    env.setdefault("ASIC_VENDOR", "brcm_apd_n3")
+
+    veripy_cmd = [
+        sys.executable,
+        os.path.join(REPO_DIR, "veripy.py"),
+        os.path.basename(in_file),
+    ]
+    veripy_run = subprocess.run(
+        veripy_cmd,
+        cwd=case_dir,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        encoding="utf-8",
+    )
+    assert veripy_run.returncode == 0, veripy_run.stdout
+
+    with open(new_out_file) as new_file:
+        with open(out_file) as ref_file:
+            assert new_file.read() == ref_file.read()
+
+
+def get_params(*params):
+    return {name: {"val": val, "scope": scope} for name, val, scope in params}
+
+
+@pytest.mark.parametrize(
+    "bitdef,params,result,result_keep_sep",
+    [
+        ("W-1:0", [("W", 8, "module_body")], "7:0", "7:0"),
+        ("W/2:0", [("W", 7, "module_body_local")], "3:0", "3:0"),
+        # Other scopes are not substituted
+        ("W-1:0", [("W", 8, "port")], "W-1:0", "W-1:0"),
+        ("WIDTH-1:0", [("W", 8, "module_body")], "WIDTH-1:0", "WIDTH-1:0"),
+        ("X-1:0", [("W", 8, "module_body")], "X-1:0", "X-1:0"),
+        ("W-1:0", [], "W-1:0", "W-1:0"),
+        # The separator before the parameter is replaced unless kept
+        ("2*W-1:0", [("W", 8, "module_body")], "27:0", "15:0"),
+        ("(W)-1:0", [("W", 8, "module_body")], "8)-1:0", "7:0"),
+        ("D-1:W", [("W", 8, "module_body"), ("D", 4, "module_body")], "4-18", "3:8"),
+        ("$clog2(D)-1:0", [("D", 16, "module_body")], "$clog216)-1:0", "3:0"),
+        # A parameter after :: is a package parameter
+        ("pkg::W-1:0", [("W", 8, "module_body")], "pkg::W-1:0", "pkg::W-1:0"),
+        # Parameters are substituted in declaration order
+        (
+            "A:0",
+            [("A", "B*2", "module_body"), ("B", 3, "module_body_local")],
+            "6:0",
+            "6:0",
+        ),
+        (
+            "A:0",
+            [("B", 3, "module_body_local"), ("A", "B*2", "module_body")],
+            "B*2:0",
+            "B*2:0",
+        ),
+    ],
+)
+def test_get_bitdef(bitdef, params, result, result_keep_sep):
+    subst = local_param_subst(get_params(*params))
+
+    assert subst.get_bitdef(bitdef) == result
+    assert subst.get_bitdef(bitdef, keep_sep=True) == result_keep_sep
+    assert subst.get_bitdef(bitdef) == result
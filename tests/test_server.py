@@ -0,0 +1,45 @@
+import os
+import socket
+
+import veripy_server
+from veripy_client import get_socket_path, is_own_socket
+
+
+def test_socket_path_in_runtime_dir(tmp_path, monkeypatch):
+    monkeypatch.delenv("VERIPY_SERVER_SOCKET", raising=False)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+
+    assert get_socket_path() == str(tmp_path / "veripy_server.sock")
+
+
+def test_own_socket(tmp_path):
+    socket_path = str(tmp_path / "veripy_server.sock")
+    regular_path = str(tmp_path / "regular")
+    open(regular_path, "w").close()
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(socket_path)
+
+        assert is_own_socket(socket_path)
+        assert not is_own_socket(regular_path)
+        assert not is_own_socket(str(tmp_path / "missing"))
+
+
+def test_private_dir(tmp_path):
+    os.chmod(str(tmp_path), 0o700)
+    assert veripy_server.is_private_dir(str(tmp_path))
+
+    os.chmod(str(tmp_path), 0o755)
+    assert not veripy_server.is_private_dir(str(tmp_path))
+
+
+def test_silent_client_times_out(monkeypatch):
+    monkeypatch.setattr(veripy_server, "REQUEST_TIMEOUT", 0.1)
+    server_conn, client_conn = socket.socketpair()
+
+    with server_conn, client_conn:
+        assert veripy_server.get_peer_uid(server_conn) == os.getuid()
+        assert veripy_server.read_request(server_conn) is None
+
+        client_conn.sendall(b'{"ping": true}\n')
+        assert veripy_server.read_request(server_conn) == {"ping": True}
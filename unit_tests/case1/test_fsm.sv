@@ -1,3 +1,4 @@
+// @generated
 
 //1. Indent problem for state <= next;
 //2. give size of state???
@@ -40,6 +41,8 @@ module test_fsm (
 
 state_e1 state, next;
 //&Logics;
+logic        state;
+logic        next;
 
 //&Clock clk;
 //&AsyncReset rst_n;
@@ -1,7 +1,8 @@
+// @generated
 //&module;
 module test_verilog_basic0 (
-  input          d,
-  input          e
+  input  logic        d,
+  input  logic        e
 ); 
 //&regs;
 //&wires;
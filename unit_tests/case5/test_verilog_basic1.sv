@@ -1,3 +1,4 @@
+// @generated
 //&module;
 module test_verilog_basic1 (
   input  logic        b,
@@ -1,8 +1,9 @@
+// @generated
 module test_verilog_basic3 (
   //&ports;
   output  logic        a,
   input wire [3:0]         d,
-  input wire [3:0]         e,
+  input wire [3:0]         e
   // output wire [3:0]        a
 );
 //&regs;
@@ -1,3 +1,4 @@
+// @generated
 module fibonacci0 ( clk, resetn, start, n, data );
 
 input           clk;
@@ -6,13 +7,18 @@ input           start;
 input  [3:0]    n;
 output [31:0]   data;
 
+//&Wires;
+//&Regs;
+logic        data_temp;
 
+/*
 wire            clk;
 wire            resetn;
 wire            start;
 wire   [3:0]    n;
 reg    [31:0]   data;
 wire    [31:0]   data_temp;
+*/
 
 always@(*)
 begin
@@ -53,54 +59,6 @@ endfunction
 endmodule
 
 /*
-
-input a,b,c;
-output d;
-
-reg stage1, stage2, p,q;
-
-always @(posedge clk)
-begin
-   add (a, b, p);
-   stage1 <= p;
-   add (stage1, c, q);
-   stage2 <= q;
-end
-
-assign d = stage2;
-
-task automatic add (input x, y, output z);
-   begin
-     z = x + y;
-   end
-endtask
-endmodulinput a,b,c;
-output d;
-
-reg stage1, stage2, p,q;
-
-always @(posedge clk)
-begin
-   add (a, b, p);
-   stage1 <= p;
-   add (stage1, c, q);
-   stage2 <= q;
-end
-
-assign d = stage2;
-
-task automatic add (input x, y, output z);
-   begin
-     z = x + y;
-   end
-endtask
-endmodulee
-
-
-endmodule: fibonacci0
-
-
-
 module gray2bin1 (bin, gray);
 parameter SIZE = 8; // this module is parameterizable output [SIZE-1:0] bin;
 input [SIZE-1:0] gray;
@@ -1,14 +1,20 @@
 #!/usr/local/bin/asicpy
 
 import argparse
+import array
 import collections
+import concurrent.futures
 import dataclasses
+import hashlib
+import heapq
 import json
 import os
 import re
+import shutil
 import subprocess
 import sys
-from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+import tempfile
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 import anytree
 
@@ -90,12 +96,17 @@ class Node(anytree.NodeMixin):
       parent (Optional[Node]): Parent node.
     """
 
+    # Set on the nodes of a parsed tree, saving the walk up to the root
+    _syntax_data = None
+
     def __init__(self, parent: Optional["Node"] = None):
         self.parent = parent
 
     @property
     def syntax_data(self) -> Optional["SyntaxData"]:
         """Parent SyntaxData"""
+        if self._syntax_data is not None:
+            return self._syntax_data
         return self.parent.syntax_data if self.parent else None
 
     @property
@@ -138,8 +149,13 @@ class BranchNode(Node):
     Attributes:
       tag (str): Node tag.
       children (Optional[Node]): Child nodes.
+      token_range (Optional[Tuple[int, int]]): Range of the node's tokens in
+        ``SyntaxData.tree_tokens``, set on the nodes of a parsed tree.
     """
 
+    token_range = None
+    _span = None
+
     def __init__(
         self,
         tag: str,
@@ -152,6 +168,8 @@ class BranchNode(Node):
 
     @property
     def start(self) -> Optional[int]:
+        if self._span is not None:
+            return self._span[0]
         first_token = self.find(
             lambda n: isinstance(n, TokenNode), iter_=PostOrderTreeIterator
         )
@@ -159,6 +177,8 @@ class BranchNode(Node):
 
     @property
     def end(self) -> Optional[int]:
+        if self._span is not None:
+            return self._span[1]
         last_token = self.find(
             lambda n: isinstance(n, TokenNode),
             iter_=PostOrderTreeIterator,
@@ -391,6 +411,338 @@ class SyntaxData:
     tokens: Optional[List[Token]] = None
     rawtokens: Optional[List[Token]] = None
     errors: Optional[List[Error]] = None
+    # Token nodes of the tree in tree order, and whether they are in source order
+    tree_tokens: Optional[List["TokenNode"]] = None
+    tree_tokens_sorted: bool = False
+    compact_tree: Optional["CompactTree"] = None
+
+    def token_texts(self, first: int, last: int) -> List[str]:
+        """Texts of a range of the tree tokens, in tree order."""
+        if self.compact_tree is not None:
+            return self.compact_tree.token_texts(first, last)
+        return [n.text for n in self.tree_tokens[first:last]]
+
+
+# Compact syntax tree
+
+
+class CompactTree:
+    """Array backed syntax tree.
+
+    Nodes are numbered in pre-order and kept in flat arrays instead of one
+    ``anytree`` object per node. Node objects are lightweight views created on
+    access, with the API of the nodes of a regular tree.
+
+    Attributes:
+      syntax_data (SyntaxData): Parent SyntaxData.
+      tags (List[Optional[str]]): Node tags, None for null nodes.
+      kinds (array): Node kinds, BRANCH, TOKEN or NULL.
+      parents (array): Parent node indexes, -1 for the root.
+      depths (array): Node depths below the root.
+      child_ranges (array): begin/end pairs of the node children in child_list.
+      child_list (array): Child node indexes.
+      subtree_ends (array): Index just past the last node of each subtree.
+      starts (array): Byte offset of each node in source text, -1 if none.
+      ends (array): Byte offset just past each node in source text, -1 if none.
+      token_ranges (array): begin/end pairs of the node tokens in tree order.
+      token_starts (array): Byte offset of each token in tree order.
+      token_ends (array): Byte offset just past each token in tree order.
+      source_texts (Dict[int, str]): Source text cache of the nodes.
+    """
+
+    BRANCH = 0
+    TOKEN = 1
+    NULL = 2
+
+    def __init__(self, tree, data: "SyntaxData", skip_null: bool):
+        self.syntax_data = data
+        self.tags = []
+        self.kinds = array.array("b")
+        self.parents = array.array("l")
+        self.depths = array.array("l")
+        self.child_ranges = array.array("l")
+        self.child_list = array.array("l")
+        self.subtree_ends = array.array("l")
+        self.starts = array.array("l")
+        self.ends = array.array("l")
+        self.token_ranges = array.array("l")
+        self.token_starts = array.array("l")
+        self.token_ends = array.array("l")
+        self.source_texts = {}
+
+        self._add(tree, -1, 0, skip_null)
+
+    def _add(self, tree, parent: int, depth: int, skip_null: bool) -> int:
+        index = len(self.tags)
+        first_token = len(self.token_starts)
+
+        self.parents.append(parent)
+        self.depths.append(depth)
+        self.child_ranges.extend((0, 0))
+        self.token_ranges.extend((0, 0))
+        self.subtree_ends.append(0)
+
+        if tree is None:
+            self.tags.append(None)
+            self.kinds.append(CompactTree.NULL)
+            self.starts.append(-1)
+            self.ends.append(-1)
+        elif "children" in tree:
+            self.tags.append(tree["tag"])
+            self.kinds.append(CompactTree.BRANCH)
+            self.starts.append(-1)
+            self.ends.append(-1)
+
+            children = [
+                self._add(child, index, depth + 1, skip_null)
+                for child in tree["children"]
+                if not (skip_null and child is None)
+            ]
+
+            self.child_ranges[2 * index] = len(self.child_list)
+            self.child_list.extend(children)
+            self.child_ranges[2 * index + 1] = len(self.child_list)
+
+            if len(self.token_starts) > first_token:
+                self.starts[index] = self.token_starts[first_token]
+                self.ends[index] = self.token_ends[-1]
+        else:
+            self.tags.append(tree["tag"])
+            self.kinds.append(CompactTree.TOKEN)
+            self.starts.append(tree["start"])
+            self.ends.append(tree["end"])
+            self.token_starts.append(tree["start"])
+            self.token_ends.append(tree["end"])
+
+        self.token_ranges[2 * index] = first_token
+        self.token_ranges[2 * index + 1] = len(self.token_starts)
+        self.subtree_ends[index] = len(self.tags)
+
+        return index
+
+    def node(self, index: int) -> "Node":
+        """View of a node."""
+        kind = self.kinds[index]
+        if kind == CompactTree.BRANCH:
+            return CompactBranchNode(self, index)
+        if kind == CompactTree.TOKEN:
+            return CompactTokenNode(self, index)
+        return CompactLeafNode(self, index)
+
+    def tokens_sorted(self) -> bool:
+        """Whether the tokens in tree order are also in source order."""
+        token_starts = self.token_starts
+        return all(
+            token_starts[i] <= token_starts[i + 1]
+            for i in range(len(token_starts) - 1)
+        )
+
+    def token_texts(self, first: int, last: int) -> List[str]:
+        """Texts of a range of the tokens, in tree order."""
+        source_code = self.syntax_data.source_code
+        texts = []
+        for start, end in zip(self.token_starts[first:last], self.token_ends[first:last]):
+            if source_code and end <= len(source_code):
+                texts.append(source_code[start:end].decode("utf-8"))
+            else:
+                texts.append("")
+        return texts
+
+
+class _CompactNodeView:
+    """Node of a CompactTree."""
+
+    def __init__(self, tree: CompactTree, index: int):
+        self._tree = tree
+        self._index = index
+
+    @property
+    def parent(self) -> Optional["Node"]:
+        parent = self._tree.parents[self._index]
+        return self._tree.node(parent) if parent >= 0 else None
+
+    @property
+    def children(self) -> Tuple["Node", ...]:
+        tree = self._tree
+        begin = tree.child_ranges[2 * self._index]
+        end = tree.child_ranges[2 * self._index + 1]
+        return tuple(tree.node(child) for child in tree.child_list[begin:end])
+
+    @property
+    def syntax_data(self) -> Optional["SyntaxData"]:
+        return self._tree.syntax_data
+
+    @property
+    def tag(self) -> Optional[str]:
+        return self._tree.tags[self._index]
+
+    @property
+    def start(self) -> Optional[int]:
+        start = self._tree.starts[self._index]
+        return start if start >= 0 else None
+
+    @property
+    def end(self) -> Optional[int]:
+        end = self._tree.ends[self._index]
+        return end if end >= 0 else None
+
+    @property
+    def token_range(self) -> Tuple[int, int]:
+        return (
+            self._tree.token_ranges[2 * self._index],
+            self._tree.token_ranges[2 * self._index + 1],
+        )
+
+    # Views are created on access, the text cache is kept in the tree
+    @property
+    def _source_text(self) -> Optional[str]:
+        return self._tree.source_texts.get(self._index)
+
+    @_source_text.setter
+    def _source_text(self, source_text: str):
+        self._tree.source_texts[self._index] = source_text
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, _CompactNodeView)
+            and other._tree is self._tree
+            and other._index == self._index
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self._tree), self._index))
+
+
+class CompactBranchNode(_CompactNodeView, BranchNode):
+    """Branch node of a CompactTree."""
+
+    def iter_find_all(
+        self,
+        filter_: Union[CallableFilter, KeyValueFilter, None],
+        max_count: int = 0,
+        iter_: TreeIterator = LevelOrderTreeIterator,
+        **kwargs,
+    ) -> Iterable[Node]:
+        tags = None
+        if isinstance(filter_, dict) and list(filter_) == ["tag"]:
+            tags = filter_["tag"] if isinstance(filter_["tag"], list) else [filter_["tag"]]
+
+        if tags is None or iter_ is not LevelOrderTreeIterator or kwargs:
+            yield from super().iter_find_all(filter_, max_count, iter_, **kwargs)
+            return
+
+        # Level order is depth order, then pre-order within a depth
+        tree = self._tree
+        first = self._index
+        matches = [
+            first + offset
+            for offset, tag in enumerate(tree.tags[first : tree.subtree_ends[first]])
+            if tag is not None and tag in tags
+        ]
+        matches.sort(key=lambda index: tree.depths[index])
+
+        for index in matches:
+            yield tree.node(index)
+            max_count -= 1
+            if max_count == 0:
+                break
+
+
+class CompactTokenNode(_CompactNodeView, TokenNode):
+    """Token node of a CompactTree."""
+
+
+class CompactLeafNode(_CompactNodeView, LeafNode):
+    """Null node of a CompactTree."""
+
+
+def _iter_json_members(stream, read_size: int = 1 << 20) -> Iterable[Tuple[str, Any]]:
+    """Decode a JSON object from a text stream member by member.
+
+    Yields each (key, value) member as soon as it is complete, without
+    holding the whole document in memory.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def read_more(size):
+        nonlocal buf, pos, eof
+        data = stream.read(size)
+        if not data:
+            eof = True
+        buf = buf[pos:] + data
+        pos = 0
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            read_more(read_size)
+
+    def read_until(end_hint):
+        nonlocal buf, pos, eof
+        if buf.find(end_hint, pos) >= 0:
+            return
+        # Collect the chunks and join them once, the member can be large
+        chunks = [buf[pos:]]
+        tail = chunks[0][-len(end_hint) :]
+        while True:
+            data = stream.read(read_size)
+            if not data:
+                eof = True
+                break
+            chunks.append(data)
+            if (tail + data).find(end_hint) >= 0:
+                break
+            tail = (tail + data[-len(end_hint) :])[-len(end_hint) :]
+        buf = "".join(chunks)
+        pos = 0
+
+    def decode(end_hint=None):
+        nonlocal pos
+        skip_whitespace()
+        if end_hint is not None and not eof and buf.startswith("{", pos):
+            # Pretty printed members end on a line of their own, decode once
+            # it is read rather than retrying on partial input
+            read_until(end_hint)
+        while True:
+            try:
+                value, pos = decoder.raw_decode(buf, pos)
+                return value
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # Read at least as much again, so retries stay linear
+                read_more(max(read_size, len(buf) - pos))
+
+    def expect(chars):
+        nonlocal pos
+        skip_whitespace()
+        if pos >= len(buf) or buf[pos] not in chars:
+            raise json.JSONDecodeError(f"Expecting one of {chars!r}", buf, pos)
+        pos += 1
+        return buf[pos - 1]
+
+    expect("{")
+    skip_whitespace()
+    if pos < len(buf) and buf[pos] == "}":
+        return
+
+    while True:
+        key = decode()
+        expect(":")
+        value = decode("\n  }")
+        # Drop the decoded text before handing out the member
+        buf = buf[pos:]
+        pos = 0
+        yield key, value
+        if expect(",}") == "}":
+            return
 
 
 class VeribleVerilogSyntax:
@@ -409,21 +761,37 @@ class VeribleVerilogSyntax:
 
     @staticmethod
     def _transform_tree(tree, data: SyntaxData, skip_null: bool) -> RootNode:
+        tree_tokens = []
+
+        def set_span(node, first_token):
+            # The tokens of a node are a contiguous range of the tree tokens
+            node.token_range = (first_token, len(tree_tokens))
+            node._syntax_data = data
+            if len(tree_tokens) > first_token:
+                node._span = (tree_tokens[first_token].start, tree_tokens[-1].end)
+            else:
+                node._span = (None, None)
+            return node
+
         def transform(tree):
             if tree is None:
                 return None
             if "children" in tree:
+                first_token = len(tree_tokens)
                 children = [
                     transform(child) or LeafNode()
                     for child in tree["children"]
                     if not (skip_null and child is None)
                 ]
                 tag = tree["tag"]
-                return BranchNode(tag, children=children)
+                return set_span(BranchNode(tag, children=children), first_token)
             tag = tree["tag"]
             start = tree["start"]
             end = tree["end"]
-            return TokenNode(tag, start, end)
+            token = TokenNode(tag, start, end)
+            token._syntax_data = data
+            tree_tokens.append(token)
+            return token
 
         if "children" not in tree:
             return None
@@ -434,7 +802,25 @@ class VeribleVerilogSyntax:
             if not (skip_null and child is None)
         ]
         tag = tree["tag"]
-        return RootNode(tag, syntax_data=data, children=children)
+        root = set_span(RootNode(tag, syntax_data=data, children=children), 0)
+
+        data.tree_tokens = tree_tokens
+        data.tree_tokens_sorted = all(
+            tree_tokens[i].start <= tree_tokens[i + 1].start
+            for i in range(len(tree_tokens) - 1)
+        )
+        return root
+
+    @staticmethod
+    def _transform_compact_tree(tree, data: SyntaxData, skip_null: bool) -> Node:
+        if "children" not in tree:
+            return None
+
+        compact_tree = CompactTree(tree, data, skip_null)
+
+        data.compact_tree = compact_tree
+        data.tree_tokens_sorted = compact_tree.tokens_sorted()
+        return compact_tree.node(0)
 
     @staticmethod
     def _transform_tokens(tokens, data: SyntaxData) -> List[Token]:
@@ -451,11 +837,23 @@ class VeribleVerilogSyntax:
         self, paths: List[str], input_: str = None, options: Dict[str, Any] = None
     ) -> Dict[str, SyntaxData]:
         """Common implementation of parse_* methods"""
+        return {
+            file_path: file_data
+            for file_path, file_data in self._iter_parse(paths, input_, options)
+            if file_data is not None
+        }
+
+    def _iter_parse(
+        self, paths: List[str], input_: str = None, options: Dict[str, Any] = None
+    ) -> Iterable[Tuple[str, SyntaxData]]:
+        """Run ``verible-verilog-syntax`` and yield the results file by file,
+        decoding its JSON output as it is read"""
         options = {
             "gen_tree": True,
             "skip_null": False,
             "gen_tokens": False,
             "gen_rawtokens": False,
+            "compact_tree": False,
             **(options or {}),
         }
 
@@ -467,51 +865,142 @@ class VeribleVerilogSyntax:
         if options["gen_rawtokens"]:
             args.append("-printrawtokens")
 
-        proc = subprocess.run(
+        proc = subprocess.Popen(
             [self.executable, *args, *paths],
+            stdin=subprocess.PIPE if input_ is not None else None,
             stdout=subprocess.PIPE,
-            input=input_,
             encoding="utf-8",
-            check=False,
         )
 
-        json_data = json.loads(proc.stdout)
-        data = {}
-        for file_path, file_json in json_data.items():
-            if file_json is None:
-                continue
+        try:
+            if input_ is not None:
+                proc.stdin.write(input_)
+                proc.stdin.close()
 
-            file_data = SyntaxData()
+            for file_path, file_json in _iter_json_members(proc.stdout):
+                # Parsed with nothing to report, e.g. no errors without a tree
+                if file_json is None:
+                    yield file_path, None
+                    continue
 
-            if file_path == "-":
-                file_data.source_code = input_.encode("utf-8")
-            else:
-                with open(file_path, "rb") as f:
-                    file_data.source_code = f.read()
-
-            if "tree" in file_json:
-                file_data.tree = VeribleVerilogSyntax._transform_tree(
-                    file_json["tree"], file_data, options["skip_null"]
-                )
-
-            if "tokens" in file_json:
-                file_data.tokens = VeribleVerilogSyntax._transform_tokens(
-                    file_json["tokens"], file_data
+                yield file_path, VeribleVerilogSyntax._transform_file(
+                    file_path, file_json, input_, options
                 )
 
-            if "rawtokens" in file_json:
-                file_data.rawtokens = VeribleVerilogSyntax._transform_tokens(
-                    file_json["rawtokens"], file_data
-                )
+            proc.wait()
+        finally:
+            # Stopped early or failed, the remaining output is not needed
+            if proc.poll() is None:
+                proc.kill()
+            proc.stdout.close()
+            proc.wait()
 
-            if "errors" in file_json:
-                file_data.errors = VeribleVerilogSyntax._transform_errors(
-                    file_json["errors"]
-                )
+    @staticmethod
+    def _transform_file(
+        file_path: str, file_json, input_: str, options: Dict[str, Any]
+    ) -> SyntaxData:
+        file_data = SyntaxData()
+
+        if file_path == "-":
+            file_data.source_code = input_.encode("utf-8")
+        else:
+            with open(file_path, "rb") as f:
+                file_data.source_code = f.read()
+
+        if "tree" in file_json and options["compact_tree"]:
+            file_data.tree = VeribleVerilogSyntax._transform_compact_tree(
+                file_json["tree"], file_data, options["skip_null"]
+            )
+        elif "tree" in file_json:
+            file_data.tree = VeribleVerilogSyntax._transform_tree(
+                file_json["tree"], file_data, options["skip_null"]
+            )
+
+        if "tokens" in file_json:
+            file_data.tokens = VeribleVerilogSyntax._transform_tokens(
+                file_json["tokens"], file_data
+            )
+
+        if "rawtokens" in file_json:
+            file_data.rawtokens = VeribleVerilogSyntax._transform_tokens(
+                file_json["rawtokens"], file_data
+            )
+
+        if "errors" in file_json:
+            file_data.errors = VeribleVerilogSyntax._transform_errors(
+                file_json["errors"]
+            )
+
+        return file_data
+
+    def iter_parse_files(
+        self,
+        paths: List[str],
+        options: Dict[str, Any] = None,
+        chunk_size: int = 0,
+        jobs: int = 1,
+    ) -> Iterable[Tuple[str, SyntaxData]]:
+        """Parse multiple SystemVerilog files, yielding the results file by file.
+
+        ``verible-verilog-syntax`` only prints its output once all of its files
+        are parsed, so the files are passed in chunks of ``chunk_size`` files
+        for the first results to come early. The output of each chunk is
+        decoded file by file, so only one file's JSON is held at a time.
 
-            data[file_path] = file_data
+        Args:
+          paths: list of paths to files to parse.
+          options: dict with parsing options, see ``parse_files``.
+          chunk_size: number of files per ``verible-verilog-syntax`` run, all
+            of them in one run if 0.
+          jobs: number of concurrent ``verible-verilog-syntax`` runs. With more
+            than one job, the files are sharded into chunks of balanced size
+            (see ``shard_files``) and the results of a chunk are yielded once
+            it completes, in completion order.
 
-        return data
+        Yields:
+          (path, SyntaxData) tuples, chunk by chunk, in the order
+          ``verible-verilog-syntax`` reports the files of a chunk. Files parsed
+          with nothing to report get an empty SyntaxData.
+        """
+        if jobs > 1:
+            yield from self._iter_parse_parallel(paths, options, chunk_size, jobs)
+            return
+
+        if chunk_size <= 0:
+            chunk_size = max(len(paths), 1)
+
+        for first in range(0, len(paths), chunk_size):
+            for file_path, file_data in self._iter_parse(
+                paths[first : first + chunk_size], options=options
+            ):
+                yield file_path, file_data if file_data is not None else SyntaxData()
+
+    def _iter_parse_parallel(
+        self, paths: List[str], options: Dict[str, Any], chunk_size: int, jobs: int
+    ) -> Iterable[Tuple[str, SyntaxData]]:
+        """Parallel implementation of iter_parse_files"""
+        shards = jobs
+        if chunk_size > 0:
+            shards = max(shards, (len(paths) + chunk_size - 1) // chunk_size)
+
+        def parse_chunk(chunk):
+            return list(self._iter_parse(chunk, options=options))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(parse_chunk, chunk)
+                for chunk in shard_files(paths, shards)
+            ]
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    for file_path, file_data in future.result():
+                        yield file_path, (
+                            file_data if file_data is not None else SyntaxData()
+                        )
+            finally:
+                # Stopped early or failed, the pending chunks are not needed
+                for future in futures:
+                    future.cancel()
 
     def parse_files(
         self, paths: List[str], options: Dict[str, Any] = None
@@ -526,6 +1015,8 @@ class VeribleVerilogSyntax:
               skip_null (boolean): null nodes won't be stored in a tree if True.
               gen_tokens (boolean): whether to generate tokens list.
               gen_rawtokens (boolean): whether to generate raw token list.
+              compact_tree (boolean): whether to keep the syntax tree in a
+                CompactTree, with node views instead of node objects.
             By default only ``gen_tree`` is True.
 
         Returns:
@@ -546,6 +1037,8 @@ class VeribleVerilogSyntax:
               skip_null (boolean): null nodes won't be stored in a tree if True.
               gen_tokens (boolean): whether to generate tokens list.
               gen_rawtokens (boolean): whether to generate raw token list.
+              compact_tree (boolean): whether to keep the syntax tree in a
+                CompactTree, with node views instead of node objects.
             By default only ``gen_tree`` is True.
 
         Returns:
@@ -566,6 +1059,8 @@ class VeribleVerilogSyntax:
               skip_null (boolean): null nodes won't be stored in a tree if True.
               gen_tokens (boolean): whether to generate tokens list.
               gen_rawtokens (boolean): whether to generate raw token list.
+              compact_tree (boolean): whether to keep the syntax tree in a
+                CompactTree, with node views instead of node objects.
             By default only ``gen_tree`` is True.
 
         Returns:
@@ -574,6 +1069,124 @@ class VeribleVerilogSyntax:
         return self._parse(["-"], input_=string, options=options).get("-", None)
 
 
+def shard_files(paths: List[str], shards: int) -> List[List[str]]:
+    """Split files into shards of balanced total size.
+
+    Files are assigned largest first to the currently smallest shard. The
+    shards are returned largest first, each with its files in path order.
+    """
+    sizes = {}
+    for path in paths:
+        try:
+            sizes[path] = os.path.getsize(path)
+        except OSError:
+            sizes[path] = 0
+
+    shards = max(1, min(shards, len(paths)))
+    heap = [(0, index, []) for index in range(shards)]
+
+    for path in sorted(paths, key=lambda path: (-sizes[path], path)):
+        size, index, shard = heapq.heappop(heap)
+        shard.append(path)
+        heapq.heappush(heap, (size + sizes[path], index, shard))
+
+    return [
+        sorted(shard)
+        for size, index, shard in sorted(heap, key=lambda entry: (-entry[0], entry[1]))
+        if shard
+    ]
+
+
+class SyntaxCheckCache:
+    """Persistent store of the syntax errors of files, keyed by file content.
+
+    Entries are keyed by the content hash of a file, the version and binary of
+    ``verible-verilog-syntax`` and the parsing options, so only new or changed
+    files are parsed again. Each entry is a JSON file with the error list of
+    the file, replaced atomically as parallel runs may share the directory.
+    """
+
+    # Bumped when the layout of the entries changes
+    VERSION = 1
+
+    def __init__(self, cache_dir: str, executable: str, options: Dict[str, Any]):
+        self.cache_dir = os.path.abspath(os.path.expandvars(cache_dir))
+        self.digests = {}
+        self.hits = 0
+        self.misses = 0
+
+        version = ""
+        executable_path = shutil.which(executable)
+        if executable_path is not None:
+            # Development builds all report the same version
+            st = os.stat(executable_path)
+            version = f"{executable_path}:{st.st_size}:{st.st_mtime_ns}:"
+            try:
+                version += subprocess.run(
+                    [executable_path, "--version"],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    encoding="utf-8",
+                ).stdout
+            except OSError:
+                pass
+
+        self.key = repr((SyntaxCheckCache.VERSION, version, sorted(options.items())))
+
+    def _entry_file(self, path: str) -> Optional[str]:
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+
+        digest = hashlib.sha1(self.key.encode() + b"\0" + content).hexdigest()
+        self.digests[path] = digest
+
+        return os.path.join(self.cache_dir, digest[:2], digest + ".json")
+
+    def lookup(self, path: str) -> Optional[List[Error]]:
+        """Cached errors of a file, None if the file is to be parsed."""
+        entry_file = self._entry_file(path)
+        if entry_file is None:
+            self.misses += 1
+            return None
+
+        try:
+            with open(entry_file) as f:
+                errors = [Error(**error) for error in json.load(f)]
+        except (OSError, TypeError, ValueError):
+            # Missing, truncated or stale entry, written after the parse
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return errors
+
+    def store(self, path: str, errors: Optional[List[Error]]):
+        """Record the errors of a file, as hashed by the last lookup."""
+        digest = self.digests.pop(path, None)
+        if digest is None:
+            return
+
+        entry_file = os.path.join(self.cache_dir, digest[:2], digest + ".json")
+        tmp_file = None
+
+        try:
+            os.makedirs(os.path.dirname(entry_file), exist_ok=True)
+            fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(entry_file))
+
+            with os.fdopen(fd, "w") as f:
+                json.dump([dataclasses.asdict(error) for error in errors or []], f)
+
+            os.replace(tmp_file, entry_file)
+        except OSError:
+            print(f"Warning: Unable to write the syntax check cache file {entry_file}")
+
+            if tmp_file is not None and os.path.isfile(tmp_file):
+                os.remove(tmp_file)
+
+
 def parse_filelist(filelist):
     files = []
 
@@ -642,22 +1255,78 @@ if __name__ == "__main__":
         help="""Output file for SystemVerilog syntax errors""",
     )
 
+    parser.add_argument(
+        "-c",
+        "--chunk_size",
+        dest="chunk_size",
+        type=int,
+        default=64,
+        help="""Number of files per verible-verilog-syntax run, results are
+        reported as each run completes (0: all the files in one run)""",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=1,
+        help="""Number of concurrent verible-verilog-syntax runs, the files are
+        sharded into chunks of balanced size""",
+    )
+
+    parser.add_argument(
+        "-cd",
+        "--cache_dir",
+        dest="cache_dir",
+        default="",
+        help="""Directory of the persistent syntax check cache, only the new or
+        changed files are parsed (default: no cache)""",
+    )
+
     args = parser.parse_known_args()
     if args[0].input is None or len(args[0].input) == 0:
         parser.print_help()
         sys.exit(1)
 
-    filelist = list(set(parse_filelist(args[0].input)))
+    # Sorted, as verible-verilog-syntax reports the files of a run
+    filelist = sorted(set(parse_filelist(args[0].input)))
 
     parser = VeribleVerilogSyntax(executable="verible-verilog-syntax")
+    # Only the errors are reported, the syntax trees are not needed
+    options = {"gen_tree": False}
+
+    cache = None
+    if args[0].cache_dir != "":
+        cache = SyntaxCheckCache(args[0].cache_dir, parser.executable, options)
+
+    def iter_syntax_data():
+        if cache is None:
+            yield from parser.iter_parse_files(
+                filelist, options, chunk_size=args[0].chunk_size, jobs=args[0].jobs
+            )
+            return
+
+        parse_list = []
+        for file in filelist:
+            errors = cache.lookup(file)
+            if errors is None:
+                parse_list.append(file)
+            else:
+                yield file, SyntaxData(errors=errors or None)
+
+        for file, syntax_data in parser.iter_parse_files(
+            parse_list, options, chunk_size=args[0].chunk_size, jobs=args[0].jobs
+        ):
+            cache.store(file, syntax_data.errors)
+            yield file, syntax_data
 
-    data = parser.parse_files(filelist)
     file_syntax_errors = {}
-    for file, syntax_data in data.items():
+    for file, syntax_data in iter_syntax_data():
         print(f"File: {file}")
-        print(f"Syntax error: {data[file].errors}\n")
+        print(f"Syntax error: {syntax_data.errors}\n")
 
-        errors = data[file].errors
+        errors = syntax_data.errors
         syntax_errors = []
         if errors is not None:
             syntax_errors = [
@@ -671,5 +1340,14 @@ if __name__ == "__main__":
             ]
         file_syntax_errors[file] = syntax_errors
 
+    if cache is not None:
+        print(
+            f"Syntax check cache: {cache.hits} hit(s), {cache.misses} miss(es) "
+            f"in '{cache.cache_dir}'\n"
+        )
+
+    # Parallel runs complete in any order
+    file_syntax_errors = dict(sorted(file_syntax_errors.items()))
+
     print(f"Generating the syntax error output to the file '{args[0].output}'. ")
     json.dump(file_syntax_errors, open(args[0].output, "w"), indent=2)
@@ -9,6 +9,7 @@
 ####################################################################################
 
 import argparse
+import copy
 import csv
 import datetime
 import io
@@ -43,10 +44,17 @@ from math import ceil, log
 from typing import Dict, Set
 
 from src.memgen import memgen
+from src.name_matcher import name_matcher
+from src.reconcile import local_param_subst, merge_signal_bitdef
+from src.profiler import g_profiler
+from src.telemetry import g_telemetry
 from verilog_generator import *
 
 sys.setrecursionlimit(3000)
 
+# Module level tables of these modules are reset for every in-process run
+RESET_MODULE_PREFIXES = ["src.", "verilog_generator", "fb_utils"]
+
 chip2asic_vendor = {
     "agni": "brcm_apd_n3p",
     "athena": "brcm_apd_n3",
@@ -151,6 +159,28 @@ def gen_package_yaml_file(
         connection = (top_inst_name, port, bitdef)
         add_inst_conn(top_inst_name, port, connection)
 
+    # Instance ports by net (topname, topbitdef), in instance and port order
+    net_ports = defaultdict(list)
+
+    for module_name2, inst_name2, inst_index2 in inst_ports:
+        instantiation2 = (module_name2, inst_name2, inst_index2)
+        for sub_inst_port2 in inst_ports[instantiation2]:
+            signal2 = inst_ports[instantiation2][sub_inst_port2]["topname"]
+            signal_bitdef2 = inst_ports[instantiation2][sub_inst_port2]["topbitdef"]
+            bitdef2 = inst_ports[instantiation2][sub_inst_port2]["bitdef"]
+
+            if signal2 == "" or signal2 is None:
+                continue
+
+            enum_implicit_count_regex = RE_ENUM_IMPLICIT_COUNT.search(signal2)
+            if enum_implicit_count_regex:
+                signal2 = enum_implicit_count_regex.group(1)
+                bitdef2 = enum_implicit_count_regex.group(2)
+
+            net_ports[(signal2, signal_bitdef2)].append(
+                (inst_name2, sub_inst_port2, bitdef2)
+            )
+
     for module_name1, inst_name1, inst_index1 in inst_ports:
         instantiation1 = (module_name1, inst_name1, inst_index1)
         print(f"  # Processing inst:{inst_name1}")
@@ -192,30 +222,10 @@ def gen_package_yaml_file(
             connection = (inst_name1, sub_inst_port1, bitdef1)
             add_inst_conn(inst_name1, signal1, connection)
 
-            for module_name2, inst_name2, inst_index2 in inst_ports:
-                if inst_name2 == inst_name1:
-                    continue
-
-                instantiation2 = (module_name2, inst_name2, inst_index2)
-                for sub_inst_port2 in inst_ports[instantiation2]:
-                    signal2 = inst_ports[instantiation2][sub_inst_port2]["topname"]
-                    signal_bitdef2 = inst_ports[instantiation2][sub_inst_port2][
-                        "topbitdef"
-                    ]
-                    bitdef2 = inst_ports[instantiation2][sub_inst_port2]["bitdef"]
-
-                    if signal2 == "" or signal2 is None or signal1 == "'0":
-                        continue
-
-                    enum_implicit_count_regex = RE_ENUM_IMPLICIT_COUNT.search(signal2)
-                    if enum_implicit_count_regex:
-                        signal2 = enum_implicit_count_regex.group(1)
-                        bitdef2 = enum_implicit_count_regex.group(2)
-
-                    if signal1 == signal2 and signal_bitdef1 == signal_bitdef2:
-                        # add other inst port connection that conneted with the same signal
-                        connection = (inst_name2, sub_inst_port2, bitdef2)
-                        add_inst_conn(inst_name1, signal1, connection)
+            # add other inst port connections on the same net
+            for connection in net_ports.get((signal1, signal_bitdef1), []):
+                if connection[0] != inst_name1:
+                    add_inst_conn(inst_name1, signal1, connection)
     json.dump(inst_conns, open(f"{top_module_name}_inst_conns.json", "w"), indent=4)
 
     float_top_lines = []
@@ -724,35 +734,10 @@ def move_ports_to_module_def_preps(
     return module_def_preps
 
 
-if __name__ == "__main__":
-    debug = 0  # To enable debug dump
-    debug_file = "veripy.debug"  # Default debug file name
-    parser_on = 1
-    parsing_format = "systemverilog"  # Default format is verilog
-    remove_code = 0
-    incl_dirs = []
-    package_files = []
-
-    group_ios_on_dir = 1
-    sort_ios = 0
-    parse_generate = 1
-    generate_stub = 0
-    generate_stub_z = 0
-    generate_stub_0 = 0
-    generate_stub_param = 0
-    no_gen_rtl_block = 0
-
-    found_error = 0
-
-    hash_define_vars = []
-    hash_define_files = []
-
-    stub_override_val = {}
-
-    clock = "clk"
-    async_reset = "arst_n"
-    sync_reset = "rst_n"
-    reset_type = "ASYNC"
+def get_cmd_line_parser():
+    """
+    Create the command line argument parser of veripy.py
+    """
 
     ############################################################################
     # Command line arguments processing
@@ -770,6 +755,8 @@ if __name__ == "__main__":
     parser.add_argument(
         "positional",
         action="store",
+        nargs="?",
+        default=None,
         help="Input filename \
             with a mix of verilog|systemverilog along with embedded python \
             code. <filename>.pv - Input file with mix of verilog and embedded \
@@ -777,6 +764,19 @@ if __name__ == "__main__":
             and embedded python.",
     )
 
+    # -batch option
+    parser.add_argument(
+        "-batch",
+        "--batch",
+        action="store",
+        default=None,
+        dest="batch_file",
+        help="Option to compile all the .psv/.pv files listed in a file, one \
+            per line, in a single run. All the other options apply to every \
+            file. Packages, include files and interface specs/defs are loaded \
+            once for the whole batch.",
+    )
+
     # -format option
     parser.add_argument(
         "-fo",
@@ -1084,12 +1084,53 @@ if __name__ == "__main__":
     parser.add_argument(
         "-prof",
         "--profiling",
+        "--profile",
         action="store",
         default="",
         dest="profiling_file",
         help="By default, no profiling file is \
-            generated. If a filename is specified, it will be written to with \
-            the profiling data.",
+            generated. If a filename is specified, the time of every run phase \
+            and regular expression is written to it in JSON and the top entries \
+            are printed. If a directory is specified, the report is written to \
+            <input file>.profile.json in it.",
+    )
+
+    # -telemetry option
+    parser.add_argument(
+        "-tel",
+        "--telemetry",
+        action="store",
+        default="",
+        dest="telemetry_file",
+        help="By default, no telemetry file is generated. If a filename is \
+            specified, a JSON line with the wall/CPU time, the time per phase, the \
+            peak RSS and the package store hits of the run is appended to it.",
+    )
+
+    # -package_cache option
+    parser.add_argument(
+        "-pkc",
+        "--package_cache",
+        action="store",
+        default=os.environ.get("VERIPY_PACKAGE_CACHE", ""),
+        dest="package_cache_dir",
+        help="Directory to keep the parsed packages, include files and \
+            sub-module ports in between runs. Entries are reused until the \
+            files they were parsed from change. A directory other users can \
+            write to is ignored. Defaults to $VERIPY_PACKAGE_CACHE; no \
+            directory keeps them for the run only.",
+    )
+
+    # -compact_cst option
+    parser.add_argument(
+        "-ccst",
+        "--compact_cst",
+        action="store_true",
+        default=False,
+        dest="compact_cst",
+        help="Option to keep the systemverilog syntax trees in flat arrays \
+            instead of one object per node. Uses less memory and builds \
+            faster on large modules.",
     )
 
     # --enable_dv_api
@@ -1120,85 +1161,690 @@ if __name__ == "__main__":
         help="vendor to use for veripy run.",
     )
 
-    # --gen_module_def
-    parser.add_argument(
-        "-gmd",
-        "--gen_module_def",
-        action="store_true",
-        default=False,
-        dest="gen_module_def",
-        help="This option generates the module definition file for the module.",
-    )
+    # --gen_module_def
+    parser.add_argument(
+        "-gmd",
+        "--gen_module_def",
+        action="store_true",
+        default=False,
+        dest="gen_module_def",
+        help="This option generates the module definition file for the module.",
+    )
+
+    # --no_ampersand_line
+    parser.add_argument(
+        "-nal",
+        "--no_ampersand_lines",
+        action="store_true",
+        default=False,
+        dest="no_ampersand_lines",
+        help="This option will generates the commented ampersand lines.",
+    )
+
+    # --gen_package_yaml
+    parser.add_argument(
+        "-gpy",
+        "--gen_package_yaml",
+        action="store_true",
+        default=False,
+        dest="gen_package_yaml",
+        help="This option generates the package yaml file for the module.",
+    )
+
+    # --no_memgen_wrapper_instantiation
+    parser.add_argument(
+        "-nmwi",
+        "--no_memgen_wrapper_instantiation",
+        action="store_true",
+        default=False,
+        dest="no_memgen_wrapper_instantiation",
+        help="This option tells memgen not to instantiate memory wrapper.",
+    )
+
+    # --beh_wrapper_only
+    parser.add_argument(
+        "-bwo",
+        "--beh_wrapper_only",
+        action="store_true",
+        default=False,
+        dest="beh_wrapper_only",
+        help="This option tells memgen to generate the mem_wrapper files with behavior module only.",
+    )
+
+    # --no_file_comment
+    parser.add_argument(
+        "-nfc",
+        "--no_file_comment",
+        action="store_true",
+        default=False,
+        dest="no_file_comment",
+        help="This option will not add '//FILE: <path-to-file>' comments in generated .sv files.",
+    )
+
+    return parser
+
+
+def resolve_chip_vendor(cmdline):
+    """
+    Fill in the chip and vendor command line options from the environment when
+    they are not passed in the command line.
+
+    @param cmdline Parsed command line arguments
+    @return 1 if the chip or the vendor could not be found, else 0
+    """
+
+    found_error = 0
+
+    if cmdline.chip is None:
+        match = re.search(RE_CWD_REGEX, os.getcwd())
+        if "FB_CHIP" in os.environ:
+            cmdline.chip = os.environ["FB_CHIP"]
+        elif match:
+            cmdline.chip = match.group("project_chip")
+        else:
+            found_error = 1
+            print("Error: FB_CHIP env variable not set.")
+
+    if cmdline.vendor is None:
+        if cmdline.chip is not None and cmdline.chip in chip2asic_vendor:
+            cmdline.vendor = chip2asic_vendor[cmdline.chip]
+        elif "ASIC_VENDOR" in os.environ:
+            cmdline.vendor = os.environ["ASIC_VENDOR"]
+        else:
+            found_error = 1
+            print("Error: ASIC_VENDOR env variable not set.")
+
+    return found_error
+
+
+def load_filelists(file_lists, file_list_deps, files, debug):
+    """
+    Gather all the files in the -list and -flist filelists. Files from the local
+    filelists are appended to files.
+
+    @param file_lists List of local filelists
+    @param file_list_deps List of third party filelists
+    @param files List of files to look for submodules / include / package / spec files
+    @param debug Debug dump enable
+    @return Dict of the files of each third party filelist
+    """
+
+    ############################################################################
+    # Gatering all the files in the files list
+    ############################################################################
+    filelist = list()
+    list_file = list()
+    flist_lib = {}
+    for ip_type, flist in [("local", file_lists), ("third_party", file_list_deps)]:
+        for c_list in flist:
+            if os.path.isfile(c_list):  # List file doesn't exist
+                with open(c_list) as filep:
+                    for c_file in nonblank_lines(filep):
+                        lline = c_file.rstrip("\n")
+                        list_file.append(lline)
+                filep.close
+                if ip_type == "third_party":
+                    filelist = list()
+                for c_file in list_file:
+                    c_file = c_file.rstrip()
+                    c_filepath = os.path.expandvars(c_file)
+                    if re.search("^-f ", c_file):
+                        data = re.sub(r"-f ", r"", c_filepath)
+                        a = recursive_filelist(data)
+                        a.append(data)
+                        filelist.extend(a)
+                    elif re.search("filelist.txt$", c_filepath):
+                        data = re.sub(r"-f ", r"", c_filepath)
+                        a = recursive_filelist(data)
+                        filelist.extend(a)
+                    else:
+                        filelist.append(c_filepath)
+                if ip_type == "third_party":
+                    flist_lib[c_list] = filelist
+            else:
+                dbg(debug, "\nError: Unable to open file " + c_list)
+                print(("\nError: Unable to open file " + c_list))
+                sys.exit(1)
+        if ip_type == "local":
+            # files.extend(list(filelist))
+            files_set = set(files)
+            for file in filelist:
+                if file not in files_set:
+                    files_set.add(file)
+                    files.append(file)
+
+    return flist_lib
+
+
+def run_psv_parser(
+    cmdline,
+    in_file,
+    module_name,
+    incl_dirs,
+    files,
+    flist_lib,
+    debug_file,
+    temporary_file,
+):
+    """
+    Run the code generation and the psv parser on the input file.
+
+    @param cmdline Parsed command line arguments
+    @param in_file Input .psv/.pv file
+    @param module_name Name of the generated module
+    @param incl_dirs List of include directories
+    @param files List of files to look for submodules / include / package / spec files
+    @param flist_lib Dict of the files of each third party filelist
+    @param debug_file Debug dump file name
+    @param temporary_file File to write the expanded code to, or None
+    @return Tuple of the codegen and psv_parser objects
+    """
+
+    remove_code = cmdline.remove_code
+    debug = cmdline.debug
+    gen_dependencies = cmdline.generate_dependancies
+    hash_define_vars = cmdline.hash_define_vars
+    hash_define_files = cmdline.hash_define_files
+    verilog_define_files = cmdline.verilog_define_files
+    package_files = cmdline.package_files
+    parsing_format = cmdline.format
+    disable_tick_ifdefs = cmdline.disable_tick_ifdefs
+    profiling = cmdline.profiling_file != ""
+    profiling_file = cmdline.profiling_file
+
+    ############################################################################
+    # Step: 1
+    # =======
+    # Parse #ifdef and work on only enabled code
+    # Expand embedded python code output
+    ############################################################################
+    i_codegen = codegen(
+        in_file,
+        remove_code,
+        incl_dirs,
+        files,
+        debug,
+        debug_file,
+        gen_dependencies,
+        cmdline,
+    )
+
+    ############################################################################
+    # Loading hash define variables
+    ############################################################################
+    if hash_define_vars is not None:
+        for c_define_var in hash_define_vars:
+            i_codegen.hash_def_proc(c_define_var)
+
+    ############################################################################
+    # Loading hash define files
+    ############################################################################
+    if hash_define_files is not None:
+        for c_define_file in hash_define_files:
+            i_codegen.load_hash_include_file(c_define_file)
+
+    ############################################################################
+    # Calling code generation function
+    ############################################################################
+    with g_profiler.phase("codegen"):
+        i_codegen.generate_code(module_name)
+
+    parse_lines = []
+    parse_lines = list(i_codegen.lines)
+
+    # Adding empty lines to flush remaining appended code to be parsed
+    parse_lines.append("\n\n\n\n\n\n\n\n\n\n")
+
+    ############################################################################
+    # Wrting out temporary_file for debug
+    # TODO: Need to enable dumping when error or debug mode enabled
+    ###########################################################################
+    if temporary_file is not None:
+        with open(temporary_file, "w") as temp_file:
+            for line in parse_lines:
+                line = line.rstrip()
+                temp_file.write(line + "\n")
+
+    ############################################################################
+    # Creating psv_parser object to parse the generated code
+    ############################################################################
+    i_psv_parser = psv_parser(
+        module_name,
+        parse_lines,
+        incl_dirs,
+        files,
+        flist_lib,
+        package_files,
+        i_codegen.hash_defines,
+        parsing_format,
+        debug,
+        debug_file,
+        disable_tick_ifdefs,
+        verilog_define_files,
+        i_codegen.functions_list,
+        profiling,
+        profiling_file,
+        cmdline,
+    )
+
+    i_psv_parser.parse_psv()
+
+    return i_codegen, i_psv_parser
+
+
+def start_profiler(profiling_file, in_file, main_globals):
+    """
+    Start profiling the run phases and the regular expressions of the veripy
+    modules. A directory profiling file gets a <input file>.profile.json report,
+    so the runs of a build do not overwrite each other.
+
+    @param profiling_file JSON report file or directory
+    @param in_file Input .psv/.pv file of the run
+    @param main_globals Globals of the veripy.py script
+    """
+
+    if os.path.isdir(profiling_file):
+        profiling_file = os.path.join(
+            profiling_file, os.path.basename(in_file) + ".profile.json"
+        )
+
+    # src.regex first, so the patterns are reported by their RE_* name
+    namespaces = [vars(sys.modules["src.regex"])]
+
+    for name, module in list(sys.modules.items()):
+        if name != "src.regex" and any(
+            name.startswith(prefix) for prefix in RESET_MODULE_PREFIXES
+        ):
+            namespaces.append(vars(module))
+
+    namespaces.append(main_globals)
+
+    g_profiler.start(profiling_file, in_file, namespaces)
+
+
+def start_telemetry(cmdline, in_file):
+    """
+    Start the telemetry record of the run, appended to the telemetry file when
+    the run ends.
+
+    @param cmdline Parsed veripy.py command line arguments
+    @param in_file Input .psv/.pv file of the run
+    """
+
+    if cmdline.generate_dependancies:
+        mode = "dependency"
+    else:
+        mode = "build"
+
+    g_telemetry.start(
+        cmdline.telemetry_file,
+        {
+            "tool": "veripy",
+            "mode": mode,
+            "input_file": os.path.abspath(in_file),
+            "module": os.path.splitext(os.path.basename(in_file))[0],
+        },
+    )
+
+
+def load_main_code():
+    """
+    Compile the veripy.py script, to run it in-process with run_main().
+    """
+
+    script = os.path.join(SCRIPT_DIR, "veripy.py")
+
+    with open(script, "r") as script_data:
+        return compile(script_data.read(), script, "exec")
+
+
+def snapshot_module_tables():
+    """
+    Take a copy of the module level lists and dicts of the veripy modules, which
+    a run appends to. Every run in the same process starts from this copy.
+    """
+
+    tables = []
+
+    for name, module in list(sys.modules.items()):
+        if not any(name.startswith(prefix) for prefix in RESET_MODULE_PREFIXES):
+            continue
+
+        for attr, value in vars(module).items():
+            if attr.startswith("__") or not isinstance(value, (list, dict)):
+                continue
+
+            tables.append((value, copy.deepcopy(value)))
+
+    return tables
+
+
+def reset_module_tables(tables):
+    """
+    Reset the module level lists and dicts to their state at snapshot. Tables
+    are reset in place as the modules import each other's tables by name.
+
+    @param tables List of tables and their copies from snapshot_module_tables()
+    """
+
+    for value, initial_value in tables:
+        if isinstance(value, dict):
+            value.clear()
+            value.update(copy.deepcopy(initial_value))
+        else:
+            value[:] = copy.deepcopy(initial_value)
+
+
+def run_main(code, args, tables):
+    """
+    Run the veripy.py main in this process with its own parser and codegen
+    state.
+
+    @param code Compiled veripy.py script from load_main_code()
+    @param args List of veripy.py command line arguments
+    @param tables List of module level tables from snapshot_module_tables()
+    @return Exit code of the run
+    """
+
+    script = os.path.join(SCRIPT_DIR, "veripy.py")
+    saved_argv = sys.argv
+    saved_path = sys.path[:]
+
+    rc = 0
+
+    try:
+        sys.argv = [script] + args
+        reset_module_tables(tables)
+        exec(code, {"__name__": "__main__", "__file__": script})
+    except SystemExit as e:
+        if e.code is None:
+            rc = 0
+        elif isinstance(e.code, int):
+            rc = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            rc = 1
+    except Exception:
+        sys.__excepthook__(*sys.exc_info())
+        rc = 1
+    finally:
+        g_telemetry.stop(rc)
+        g_profiler.stop()
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+    return rc
+
+
+def get_batch_args(args):
+    """
+    Remove the -batch option from the command line arguments.
+
+    @param args List of veripy.py command line arguments
+    """
+
+    batch_args = []
+    skip_next = False
+
+    for arg in args:
+        if skip_next:
+            skip_next = False
+        elif arg in ["-batch", "--batch"]:
+            skip_next = True
+        elif not arg.startswith("-batch=") and not arg.startswith("--batch="):
+            batch_args.append(arg)
+
+    return batch_args
+
+
+def run_batch(batch_file, args):
+    """
+    Compile all the .psv/.pv files listed in the batch file in this process.
+    Every file is built with its own parser and codegen state, and the result
+    of every file is reported at the end.
+
+    @param batch_file File with the list of input files, one per line
+    @param args List of veripy.py command line arguments, without an input file
+    @return 1 if any of the files failed, else 0
+    """
+
+    if not os.path.isfile(batch_file):
+        print("\nError: Unable to open file " + batch_file)
+        return 1
+
+    in_files = []
+
+    with open(batch_file, "r") as batch_data:
+        for line in batch_data:
+            line = re.sub(r"#.*", "", line).strip()
+
+            if line != "":
+                in_files.append(os.path.expandvars(line))
+
+    code = load_main_code()
+    tables = snapshot_module_tables()
+    batch_args = get_batch_args(args)
+
+    results = []
+
+    for in_file in in_files:
+        # Input file first, as options like -package take a list of values
+        rc = run_main(code, [in_file] + batch_args, tables)
+        results.append((in_file, rc))
+
+    passed = [in_file for in_file, rc in results if rc == 0]
+    failed = [in_file for in_file, rc in results if rc != 0]
+
+    print("\n### Batch " + batch_file + " ###")
+
+    if passed:
+        print("  + PASSED:")
+        for in_file in passed:
+            print("    - " + in_file)
+
+    if failed:
+        print("  + FAILED:")
+        for in_file in failed:
+            print("    - " + in_file)
+
+    print(
+        "  # "
+        + str(len(passed))
+        + " passed, "
+        + str(len(failed))
+        + " failed out of "
+        + str(len(results))
+    )
+
+    if failed:
+        return 1
+
+    return 0
+
+
+def get_dependency_list(args, tables):
+    """
+    Gather all the dependencies for building a .psv/.pv file. This is the
+    --dependancy_list mode of veripy.py as a function, so that the build script
+    can call it in-process without writing the dependencies to an output file.
+    As with run_main(), the module level tables are reset and the -py files are
+    loaded before the run.
+
+    @param args List of veripy.py command line arguments
+    @param tables List of module level tables from snapshot_module_tables()
+    @return Dict of the dependencies written out by --dependancy_list
+    """
+
+    saved_path = sys.path[:]
+
+    try:
+        reset_module_tables(tables)
+        return gather_dependencies(args)
+    finally:
+        sys.path[:] = saved_path
+
+
+def gather_dependencies(args):
+    """
+    Run the --dependancy_list mode of veripy.py for get_dependency_list().
+
+    @param args List of veripy.py command line arguments
+    @return Dict of the dependencies written out by --dependancy_list
+    """
+
+    cmdline = get_cmd_line_parser().parse_args(args)
+    cmdline.generate_dependancies = True
+
+    found_error = resolve_chip_vendor(cmdline)
+
+    in_file = cmdline.positional
+
+    if in_file is None:
+        print("\nError: Missing input file option\n")
+        sys.exit(1)
+
+    if cmdline.telemetry_file != "":
+        start_telemetry(cmdline, in_file)
+
+    if cmdline.include_dir is not None:
+        incl_dirs = [os.getcwd()] + [
+            os.path.abspath(idir) for idir in cmdline.include_dir
+        ]
+    else:
+        incl_dirs = [os.getcwd()]
+
+    if cmdline.destination_dir is not None and cmdline.destination_dir != "":
+        cmdline.destination_dir = os.path.abspath(cmdline.destination_dir)
+        incl_dirs.append(cmdline.destination_dir)
+
+    if cmdline.files is None:
+        files = []
+    else:
+        files = cmdline.files
+
+    if cmdline.lists is None:
+        file_lists = []
+    else:
+        file_lists = cmdline.lists
+
+    if cmdline.flists is None:
+        file_list_deps = []
+    else:
+        file_list_deps = cmdline.flists
+
+    if cmdline.python_files is None:
+        python_files = []
+    else:
+        python_files = cmdline.python_files
+
+    flist_lib = load_filelists(file_lists, file_list_deps, files, cmdline.debug)
+
+    output_file = cmdline.output_file
+    if output_file == "":
+        output_file = in_file.split(".")[0] + ".sv"
+
+    module_name = os.path.basename(output_file).split(".")[0]
+
+    if not os.path.isfile(in_file):  # In file doesn't exist
+        print(("\nError: Unable to open file " + in_file))
+        sys.exit(1)
+
+    # The expanded input file is only needed for debug
+    if cmdline.debug:
+        dirname, basename = os.path.split(in_file)
+        temporary_file = tempfile.mkstemp(
+            suffix=os.path.splitext(basename)[1] + ".expanded",
+            prefix=os.path.splitext(basename)[0],
+            dir=dirname,
+            text=True,
+        )[1]
+        print(f"temporary_file is set to {temporary_file}")
+    else:
+        temporary_file = None
+
+    print(("### IN: " + in_file + " MODULE: " + module_name + " ###"))
+    print(("  # Loading input file " + in_file))
+
+    # Loaded in the globals of a veripy.py run, which start afresh every run
+    for c_py_file in python_files:
+        print("  # Loading Python file", c_py_file)
+
+        with open(c_py_file, "r") as py_data:
+            exec(py_data.read(), dict(globals()))
+
+    i_codegen, i_psv_parser = run_psv_parser(
+        cmdline,
+        in_file,
+        module_name,
+        incl_dirs,
+        files,
+        flist_lib,
+        in_file + ".debug",
+        temporary_file,
+    )
+
+    dependencies = i_psv_parser.dependencies
+
+    for header_file in i_codegen.header_files:
+        dependencies["header_files"].append(
+            {header_file: {"mtime": getmtime(header_file)}}
+        )
+
+    if i_psv_parser.found_error:
+        print("Error: Found errors during verilog/system verilog parsing.")
+        sys.exit(1)
+
+    if found_error:
+        print("\nError: Please review the run log for errors\n")
+        sys.exit(1)
+
+    g_telemetry.stop(0)
+
+    return dependencies
+
+
+if __name__ == "__main__":
+    debug = 0  # To enable debug dump
+    debug_file = "veripy.debug"  # Default debug file name
+    parser_on = 1
+    parsing_format = "systemverilog"  # Default format is verilog
+    remove_code = 0
+    incl_dirs = []
+    package_files = []
+
+    group_ios_on_dir = 1
+    sort_ios = 0
+    parse_generate = 1
+    generate_stub = 0
+    generate_stub_z = 0
+    generate_stub_0 = 0
+    generate_stub_param = 0
+    no_gen_rtl_block = 0
 
-    # --no_ampersand_line
-    parser.add_argument(
-        "-nal",
-        "--no_ampersand_lines",
-        action="store_true",
-        default=False,
-        dest="no_ampersand_lines",
-        help="This option will generates the commented ampersand lines.",
-    )
+    found_error = 0
 
-    # --gen_package_yaml
-    parser.add_argument(
-        "-gpy",
-        "--gen_package_yaml",
-        action="store_true",
-        default=False,
-        dest="gen_package_yaml",
-        help="This option generates the package yaml file for the module.",
-    )
+    hash_define_vars = []
+    hash_define_files = []
 
-    # --no_memgen_wrapper_instantiation
-    parser.add_argument(
-        "-nmwi",
-        "--no_memgen_wrapper_instantiation",
-        action="store_true",
-        default=False,
-        dest="no_memgen_wrapper_instantiation",
-        help="This option tells memgen not to instantiate memory wrapper.",
-    )
+    stub_override_val = {}
 
-    # --beh_wrapper_only
-    parser.add_argument(
-        "-bwo",
-        "--beh_wrapper_only",
-        action="store_true",
-        default=False,
-        dest="beh_wrapper_only",
-        help="This option tells memgen to generate the mem_wrapper files with behavior module only.",
-    )
+    clock = "clk"
+    async_reset = "arst_n"
+    sync_reset = "rst_n"
+    reset_type = "ASYNC"
 
-    # --no_file_comment
-    parser.add_argument(
-        "-nfc",
-        "--no_file_comment",
-        action="store_true",
-        default=False,
-        dest="no_file_comment",
-        help="This option will not add '//FILE: <path-to-file>' comments in generated .sv files.",
-    )
-    cmdline = parser.parse_args()
+    cmdline = get_cmd_line_parser().parse_args()
 
-    if cmdline.chip is None:
-        match = re.search(RE_CWD_REGEX, os.getcwd())
-        if "FB_CHIP" in os.environ:
-            cmdline.chip = os.environ["FB_CHIP"]
-        elif match:
-            cmdline.chip = match.group("project_chip")
-        else:
-            found_error = 1
-            print("Error: FB_CHIP env variable not set.")
+    if cmdline.batch_file is not None:
+        if cmdline.positional is not None:
+            print("\nError: Input file can not be used along with -batch option\n")
+            sys.exit(1)
 
-    if cmdline.vendor is None:
-        if cmdline.chip is not None and cmdline.chip in chip2asic_vendor:
-            cmdline.vendor = chip2asic_vendor[cmdline.chip]
-        elif "ASIC_VENDOR" in os.environ:
-            cmdline.vendor = os.environ["ASIC_VENDOR"]
-        else:
-            found_error = 1
-            print("Error: ASIC_VENDOR env variable not set.")
+        sys.exit(run_batch(cmdline.batch_file, sys.argv[1:]))
+
+    found_error = resolve_chip_vendor(cmdline)
 
     in_file = cmdline.positional
     parsing_format = cmdline.format
@@ -1263,6 +1909,8 @@ if __name__ == "__main__":
     if cmdline.profiling_file != "":
         profiling = True
         profiling_file = cmdline.profiling_file
+
+        start_profiler(profiling_file, in_file, globals())
     else:
         profiling = False
         profiling_file = ""
@@ -1274,58 +1922,20 @@ if __name__ == "__main__":
         debug_file = in_file + ".debug"
         dbg_file = open(debug_file + ".write", "w")
 
-    ############################################################################
-    # Gatering all the files in the files list
-    ############################################################################
-    filelist = list()
-    list_file = list()
-    flist_lib = {}
-    for ip_type, flist in [("local", file_lists), ("third_party", file_list_deps)]:
-        for c_list in flist:
-            if os.path.isfile(c_list):  # List file doesn't exist
-                with open(c_list) as filep:
-                    for c_file in nonblank_lines(filep):
-                        lline = c_file.rstrip("\n")
-                        list_file.append(lline)
-                filep.close
-                if ip_type == "third_party":
-                    filelist = list()
-                for c_file in list_file:
-                    c_file = c_file.rstrip()
-                    c_filepath = os.path.expandvars(c_file)
-                    if re.search("^-f ", c_file):
-                        data = re.sub(r"-f ", r"", c_filepath)
-                        a = recursive_filelist(data)
-                        a.append(data)
-                        filelist.extend(a)
-                    elif re.search("filelist.txt$", c_filepath):
-                        data = re.sub(r"-f ", r"", c_filepath)
-                        a = recursive_filelist(data)
-                        filelist.extend(a)
-                    else:
-                        filelist.append(c_filepath)
-                if ip_type == "third_party":
-                    flist_lib[c_list] = filelist
-            else:
-                dbg(debug, "\nError: Unable to open file " + c_list)
-                print(("\nError: Unable to open file " + c_list))
-                sys.exit(1)
-        if ip_type == "local":
-            # files.extend(list(filelist))
-            for file in filelist:
-                if file not in files:
-                    files.append(file)
+    flist_lib = load_filelists(file_lists, file_list_deps, files, debug)
 
     ############################################################################
     # if no input file, then error out
     ############################################################################
-    try:
-        in_file
-        in_file_name = re.sub(r".*\/", r"", in_file)
-    except NameError:
+    if in_file is None:
         print("\nError: Missing input file option\n")
         sys.exit(1)
 
+    if cmdline.telemetry_file != "":
+        start_telemetry(cmdline, in_file)
+
+    in_file_name = re.sub(r".*\/", r"", in_file)
+
     ############################################################################
     # If no output file passed in command line, then outfile name is derived
     ############################################################################
@@ -1414,82 +2024,18 @@ if __name__ == "__main__":
             exec(f.read())
             f.close()
 
-    ############################################################################
-    # Step: 1
-    # =======
-    # Parse #ifdef and work on only enabled code
-    # Expand embedded python code output
-    ############################################################################
-    i_codegen = codegen(
-        in_file,
-        remove_code,
-        incl_dirs,
-        files,
-        debug,
-        debug_file,
-        gen_dependencies,
+    i_codegen, i_psv_parser = run_psv_parser(
         cmdline,
-    )
-
-    ############################################################################
-    # Loading hash define variables
-    ############################################################################
-    if hash_define_vars is not None:
-        for c_define_var in hash_define_vars:
-            i_codegen.hash_def_proc(c_define_var)
-
-    ############################################################################
-    # Loading hash define files
-    ############################################################################
-    if hash_define_files is not None:
-        for c_define_file in hash_define_files:
-            i_codegen.load_hash_include_file(c_define_file)
-
-    ############################################################################
-    # Calling code generation function
-    ############################################################################
-    i_codegen.generate_code(module_name)
-
-    stub_override_val = i_codegen.stub_override_val
-
-    parse_lines = []
-    parse_lines = list(i_codegen.lines)
-
-    # Adding empty lines to flush remaining appended code to be parsed
-    parse_lines.append("\n\n\n\n\n\n\n\n\n\n")
-
-    ############################################################################
-    # Wrting out temporary_file for debug
-    # TODO: Need to enable dumping when error or debug mode enabled
-    ###########################################################################
-    with open(temporary_file, "w") as temp_file:
-        for line in parse_lines:
-            line = line.rstrip()
-            temp_file.write(line + "\n")
-
-    ############################################################################
-    # Creating psv_parser object to parse the generated code
-    ############################################################################
-    i_psv_parser = psv_parser(
+        in_file,
         module_name,
-        parse_lines,
         incl_dirs,
         files,
         flist_lib,
-        package_files,
-        i_codegen.hash_defines,
-        parsing_format,
-        debug,
         debug_file,
-        disable_tick_ifdefs,
-        verilog_define_files,
-        i_codegen.functions_list,
-        profiling,
-        profiling_file,
-        cmdline,
+        temporary_file,
     )
 
-    i_psv_parser.parse_psv()
+    stub_override_val = i_codegen.stub_override_val
 
     dependencies = {}
     dependencies = i_psv_parser.dependencies
@@ -1580,6 +2126,7 @@ if __name__ == "__main__":
             print(("  # Successfully generated " + output_file + "\n"))
 
         out_file.close()
+        g_telemetry.stop(0)
         sys.exit(0)
 
     ############################################################################
@@ -1717,159 +2264,13 @@ if __name__ == "__main__":
     # TODO: May have to add some warnings if the register width is less
     # than the signal width
     for c_signal in signals:
-        if c_signal in list(regs.keys()):  # Keep the biggest bitdef for regs
-            # Keep the highest
-            if regs[c_signal]["mode"] != "FORCE":
-                if int(signals[c_signal]["uwidth"]) > int(regs[c_signal]["uwidth"]):
-                    regs[c_signal]["uwidth"] = signals[c_signal]["uwidth"]
-                    reg_bitdef_colon_regex = re.search(
-                        RE_COLON, regs[c_signal]["bitdef"]
-                    )
-                    signal_bitdef_colon_regex = re.search(
-                        RE_COLON, signals[c_signal]["bitdef"]
-                    )
-
-                    # Update bitdef with bitdef only if its broken with :
-                    if reg_bitdef_colon_regex and signal_bitdef_colon_regex:
-                        regs[c_signal]["bitdef"] = (
-                            signal_bitdef_colon_regex.group(1)
-                            + ":"
-                            + reg_bitdef_colon_regex.group(2)
-                        )
-                        dbg(
-                            debug,
-                            "  # Updated U_BITDEF REG: "
-                            + c_signal
-                            + " :: "
-                            + regs[c_signal]["bitdef"],
-                        )
-                    else:  # Otherwise use the uwdith and lwidth for bitdef
-                        regs[c_signal]["bitdef"] = (
-                            str(signals[c_signal]["uwidth"])
-                            + ":"
-                            + str(regs[c_signal]["lwidth"])
-                        )
-                        dbg(
-                            debug,
-                            "  # Updated U_BITDEF (NUM) REG: "
-                            + c_signal
-                            + " :: "
-                            + regs[c_signal]["bitdef"],
-                        )
-
-                # Keep the lowest
-                if int(signals[c_signal]["lwidth"]) < int(regs[c_signal]["lwidth"]):
-                    regs[c_signal]["lwidth"] = signals[c_signal]["lwidth"]
-                    reg_bitdef_colon_regex = re.search(
-                        RE_COLON, regs[c_signal]["bitdef"]
-                    )
-                    signal_bitdef_colon_regex = re.search(
-                        RE_COLON, signals[c_signal]["bitdef"]
-                    )
-
-                    if reg_bitdef_colon_regex and signal_bitdef_colon_regex:
-                        regs[c_signal]["bitdef"] = (
-                            reg_bitdef_colon_regex.group(1)
-                            + ":"
-                            + signal_bitdef_colon_regex.group(2)
-                        )
-                        dbg(
-                            debug,
-                            "  # Updated L_BITDEF REG: "
-                            + c_signal
-                            + " :: "
-                            + regs[c_signal]["bitdef"],
-                        )
-                    else:
-                        regs[c_signal]["bitdef"] = (
-                            str(regs[c_signal]["uwidth"])
-                            + ":"
-                            + str(signals[c_signal]["lwidth"])
-                        )
-                        dbg(
-                            debug,
-                            "  # Updated L_BITDEF (NUM) REG: "
-                            + c_signal
-                            + " :: "
-                            + regs[c_signal]["bitdef"],
-                        )
-
-        if c_signal in list(wires.keys()):  # Keep the biggest bitdef for wires
-            # Keep the highest
-            if wires[c_signal]["mode"] != "FORCE":
-                if int(signals[c_signal]["uwidth"]) > int(wires[c_signal]["uwidth"]):
-                    wires[c_signal]["uwidth"] = signals[c_signal]["uwidth"]
-                    wire_bitdef_colon_regex = re.search(
-                        RE_COLON, wires[c_signal]["bitdef"]
-                    )
-                    signal_bitdef_colon_regex = re.search(
-                        RE_COLON, signals[c_signal]["bitdef"]
-                    )
-
-                    # Update bitdef with bitdef only if its broken with :
-                    if wire_bitdef_colon_regex and signal_bitdef_colon_regex:
-                        wires[c_signal]["bitdef"] = (
-                            signal_bitdef_colon_regex.group(1)
-                            + ":"
-                            + wire_bitdef_colon_regex.group(2)
-                        )
-                        dbg(
-                            debug,
-                            "  # Updated U_BITDEF WIRE: "
-                            + c_signal
-                            + " :: "
-                            + wires[c_signal]["bitdef"],
-                        )
-                    else:  # Otherwise use the uwdith and lwidth for bitdef
-                        wires[c_signal]["bitdef"] = (
-                            str(signals[c_signal]["uwidth"])
-                            + ":"
-                            + str(wires[c_signal]["lwidth"])
-                        )
-                        dbg(
-                            debug,
-                            "  # Updated U_BITDEF (NUM) WIRE: "
-                            + c_signal
-                            + " :: "
-                            + wires[c_signal]["bitdef"],
-                        )
-
-                # Keep the lowest
-                if int(signals[c_signal]["lwidth"]) < int(wires[c_signal]["lwidth"]):
-                    wires[c_signal]["lwidth"] = signals[c_signal]["lwidth"]
-                    wire_bitdef_colon_regex = re.search(
-                        RE_COLON, wires[c_signal]["bitdef"]
-                    )
-                    signal_bitdef_colon_regex = re.search(
-                        RE_COLON, signals[c_signal]["bitdef"]
-                    )
+        if c_signal in regs:  # Keep the biggest bitdef for regs
+            merge_signal_bitdef(c_signal, signals[c_signal], regs[c_signal], "REG", debug)
 
-                    if wire_bitdef_colon_regex and signal_bitdef_colon_regex:
-                        wires[c_signal]["bitdef"] = (
-                            wire_bitdef_colon_regex.group(1)
-                            + ":"
-                            + signal_bitdef_colon_regex.group(2)
-                        )
-                        dbg(
-                            debug,
-                            "  # Updated L_BITDEF WIRE: "
-                            + c_signal
-                            + " :: "
-                            + wires[c_signal]["bitdef"],
-                        )
-                    else:
-                        wires[c_signal]["bitdef"] = (
-                            str(wires[c_signal]["uwidth"])
-                            + ":"
-                            + str(signals[c_signal]["lwidth"])
-                        )
-                        dbg(
-                            debug,
-                            "  # Updated L_BITDEF (NUM) WIRE: "
-                            + c_signal
-                            + " :: "
-                            + wires[c_signal]["bitdef"],
-                        )
+        if c_signal in wires:  # Keep the biggest bitdef for wires
+            merge_signal_bitdef(
+                c_signal, signals[c_signal], wires[c_signal], "WIRE", debug
+            )
 
     dbg(debug, "\n")
 
@@ -1879,6 +2280,9 @@ if __name__ == "__main__":
     dbg(debug, "##############################################################")
     dbg(debug, "# Checking all the signals with regs and wires and update ports")
     dbg(debug, "##############################################################")
+    # Module body parameters substituted in the bitdef of the inferred ports
+    local_param_bitdefs = local_param_subst(params)
+
     for c_signal in list(signals.keys()):
         dbg(
             debug,
@@ -1934,29 +2338,7 @@ if __name__ == "__main__":
                 )
             else:
                 # Move this signal to input port
-                bitdef = signals[c_signal]["bitdef"]
-                local_params = {
-                    p: params[p]
-                    for p in params
-                    if params[p]["scope"] in ["module_body", "module_body_local"]
-                }
-                for param in local_params:
-                    param_val = str(local_params[param]["val"])
-                    c_sep = "(?P<sep>\W*)"
-                    param_str = "\\b" + param + "\\b"
-                    param_search_str = c_sep + param_str
-                    mat = re.search(param_search_str, bitdef)
-                    if mat and (mat[1] == "" or mat[1] not in ["::"]):
-                        bitdef = re.sub(param_search_str, param_val, bitdef)
-                    try:
-                        mat = re.match(r"^([^:]+):([^:]+)$", bitdef)
-                        if mat:
-                            bit1 = mat[1]
-                            bit2 = mat[2]
-                            bit1_val = int(eval(bit1))
-                            bitdef = f"{str(bit1_val)}:{bit2}"
-                    except Exception:
-                        pass
+                bitdef = local_param_bitdefs.get_bitdef(signals[c_signal]["bitdef"])
 
                 ports[c_signal] = {}
                 ports[c_signal]["name"] = signals[c_signal]["name"]
@@ -2070,33 +2452,9 @@ if __name__ == "__main__":
                 ):
                     pass
                 else:
-                    bitdef = regs[c_reg]["bitdef"]
-                    local_params = {
-                        p: params[p]
-                        for p in params
-                        if params[p]["scope"] in ["module_body", "module_body_local"]
-                    }
-                    for param in local_params:
-                        param_val = str(local_params[param]["val"])
-                        c_sep = "(?P<sep>\W*)"
-                        param_str = "\\b" + param + "\\b"
-                        param_search_str = c_sep + param_str
-                        mat = re.search(param_search_str, bitdef)
-                        if mat and (
-                            mat[1] == "" or mat[1] == "][" or mat[1] not in ["::"]
-                        ):
-                            bitdef = re.sub(
-                                param_search_str, f"{mat[1]}{param_val}", bitdef
-                            )
-                        try:
-                            mat = re.match(r"^([^:]+):([^:]+)$", bitdef)
-                            if mat:
-                                bit1 = mat[1]
-                                bit2 = mat[2]
-                                bit1_val = int(eval(bit1))
-                                bitdef = f"{str(bit1_val)}:{bit2}"
-                        except Exception:
-                            pass
+                    bitdef = local_param_bitdefs.get_bitdef(
+                        regs[c_reg]["bitdef"], keep_sep=True
+                    )
 
                     ports[c_reg] = {}
                     ports[c_reg]["name"] = regs[c_reg]["name"]
@@ -2174,7 +2532,7 @@ if __name__ == "__main__":
         signal_found = 0
 
         # Check if its locally generated as a reg/logic
-        if c_wire in list(signals.keys()):
+        if c_wire in signals:
             wires[c_wire]["type"] = "LOCAL"
         else:
             if c_wire in ports:
@@ -2264,38 +2622,18 @@ if __name__ == "__main__":
     dbg(debug, "# Applying any force internal commands")
     dbg(debug, "##############################################################")
     for c_internal in force_internals:
-        c_internal = re.sub(r"[;,]", r"", c_internal)
-        c_internal = re.sub(r"\s+", r" ", c_internal)
-        c_internal = re.sub(r"\s*$", r"", c_internal)
-        c_internal = re.sub(r"^\s*", r"", c_internal)
         dbg(debug, "\n### FORCE INTERNAL: " + c_internal)
-        force_internal_slash_regex = re.search(RE_REGEX_SLASH, c_internal)
-
-        if force_internal_slash_regex:
-            regex_width = force_internal_slash_regex.group(1)
-        else:
-            regex_width = ""
 
-        RE_FORCE_REGEX = re.compile(regex_width)
+    # Rules are compiled once when recorded, each port is matched against all
+    force_internal_matcher = i_psv_parser.force_internal_matcher
 
+    if len(force_internal_matcher) > 0:
         for c_port in list(ports.keys()):
             dbg(debug, "  # PORT: " + ports[c_port]["dir"] + " :: " + c_port)
 
-            match_found = 0
-
-            if regex_width != "":
-                force_internal_slash_regex = re.search(RE_FORCE_REGEX, c_port)
-
-                if force_internal_slash_regex:
-                    if ports[c_port]["dir"] == "output":
-                        match_found = 1
-            else:
-                if c_internal == c_port:
-                    if ports[c_port]["dir"] == "output":
-                        match_found = 1
-
-            if match_found:  # move the port to reg/wire declarations
-                dbg(debug, "    # MATCHED PORT: " + c_port + " :: " + c_internal)
+            # move the port to reg/wire declarations
+            if ports[c_port]["dir"] == "output" and force_internal_matcher.match(c_port):
+                dbg(debug, "    # MATCHED PORT: " + c_port)
 
                 if ports[c_port]["typedef"] == "REG":
                     if c_port in regs:
@@ -2372,6 +2710,9 @@ if __name__ == "__main__":
     dbg(debug, "##############################################################")
     dbg(debug, "# Applying any force width commands")
     dbg(debug, "##############################################################")
+    force_names = []
+    force_rules = []
+
     for c_width in force_widths:
         c_width = re.sub(r";", r"", c_width)
         c_width = re.sub(r"\s+", r" ", c_width)
@@ -2406,29 +2747,23 @@ if __name__ == "__main__":
                 force_lwdith = 0
                 force_bitdef = force_width + "-1:0"
 
-        force_width_slash_regex = re.search(RE_REGEX_SLASH, force_name)
+        force_names.append(force_name)
+        force_rules.append((force_name, force_bitdef, force_uwdith, force_lwdith))
 
-        if force_width_slash_regex:
-            regex_width = force_width_slash_regex.group(1)
-        else:
-            regex_width = ""
+    # All the rules matching a name are applied in order, the last one wins
+    force_width_matcher = name_matcher(force_names, empty_regex=False)
 
+    if force_rules:
         # Updating ports if match found
         for c_port in list(ports.keys()):
-            match_found = 0
-
-            RE_FORCE_REGEX = re.compile(regex_width)
-            if regex_width != "":
-                force_width_slash_regex = re.search(RE_FORCE_REGEX, c_port)
+            for rule_index in force_width_matcher.matches(c_port):
+                force_name, force_bitdef, force_uwdith, force_lwdith = force_rules[
+                    rule_index
+                ]
 
-                if force_width_slash_regex:
-                    match_found = 1
-            else:
                 if force_name == c_port:
                     dbg(debug, "  # REG : " + c_port + " :: " + force_name + " :: ")
-                    match_found = 1
 
-            if match_found:
                 ports[c_port]["bitdef"] = force_bitdef
                 ports[c_port]["uwidth"] = force_uwdith
                 ports[c_port]["lwidth"] = force_lwdith
@@ -2450,21 +2785,14 @@ if __name__ == "__main__":
 
         # Updating regs if match found
         for c_reg in list(regs.keys()):
-            match_found = 0
-
-            RE_FORCE_REGEX = re.compile(regex_width)
+            for rule_index in force_width_matcher.matches(c_reg):
+                force_name, force_bitdef, force_uwdith, force_lwdith = force_rules[
+                    rule_index
+                ]
 
-            if regex_width != "":
-                force_width_slash_regex = re.search(RE_FORCE_REGEX, c_reg)
-
-                if force_width_slash_regex:
-                    match_found = 1
-            else:
                 if force_name == c_reg:
                     dbg(debug, "  # REG : " + c_reg + " :: " + force_name + " :: ")
-                    match_found = 1
 
-            if match_found:
                 regs[c_reg]["bitdef"] = force_bitdef
                 regs[c_reg]["uwidth"] = force_uwdith
                 regs[c_reg]["lwidth"] = force_lwdith
@@ -2486,21 +2814,14 @@ if __name__ == "__main__":
 
         # Updating wires if match found
         for c_wire in list(wires.keys()):
-            match_found = 0
+            for rule_index in force_width_matcher.matches(c_wire):
+                force_name, force_bitdef, force_uwdith, force_lwdith = force_rules[
+                    rule_index
+                ]
 
-            RE_FORCE_REGEX = re.compile(regex_width)
-
-            if regex_width != "":
-                force_width_slash_regex = re.search(RE_FORCE_REGEX, c_wire)
-
-                if force_width_slash_regex:
-                    match_found = 1
-            else:
                 if force_name == c_wire:
                     dbg(debug, "  # REG : " + c_wire + " :: " + force_name + " :: ")
-                    match_found = 1
 
-            if match_found:
                 wires[c_wire]["bitdef"] = force_bitdef
                 wires[c_wire]["uwidth"] = force_uwdith
                 wires[c_wire]["lwidth"] = force_lwdith
@@ -2583,6 +2904,7 @@ if __name__ == "__main__":
     # Expand post embedded python code output
     ############################################################################
     print(("  # Generating verilog/systemverilog output file " + output_file))
+    g_profiler.begin_phase("output_write")
 
     skip_auto_reset_line = 0
     remove_reset_val = 0
@@ -6135,6 +6457,7 @@ if __name__ == "__main__":
             dbg(debug, print_line)
 
     out_file.close()
+    g_profiler.end_phase("output_write")
 
     # Adding the currently generated file to filelist
     filelist.append(output_file)
@@ -6204,3 +6527,5 @@ if __name__ == "__main__":
             sub_inst_modules,
             sub_inst_ports,
         )
+
+    g_telemetry.stop(0)
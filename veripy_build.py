@@ -24,20 +24,41 @@ dependencies for a given file or set of files.
 """
 
 import argparse
+import contextlib
+import glob
+import hashlib
+import io
 import json
 import logging
 import math
 import os
 import os.path
 import re
+import shlex
 import string
 import subprocess
 import sys
 import time
+import traceback
 import warnings
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
 from os.path import getmtime, isfile
 
 import oyaml as yaml
+from src.telemetry import (
+    peak_rss_kb,
+    print_summary,
+    read_records,
+    summarize_records,
+    write_record,
+)
+
+RE_BUCK_TARGET_NAME = re.compile(r'^\s*name = "(.*)",', re.MULTILINE)
 
 _DEFAULT_INFRA_COMMON_PATH = "infra_asic_fpga/ip/infra_common/main"
 def get_common_ip_path() -> str:
@@ -203,6 +224,371 @@ def up_to_date_file_in_dict(fname, dictionary, old_dict):
         return False
 
 
+# Categories of the dependencies that record files. The depends category holds
+# build targets, not files.
+DEP_CACHE_CATEGORIES = [
+    "include_files",
+    "header_files",
+    "verilog_subs",
+    "spec_files",
+    "interface_files",
+    "module_files",
+]
+
+# Prefix of the paths under the dependency cache root in the cache entries
+DEP_CACHE_ROOT = "$DEP_CACHE_ROOT"
+
+
+def file_hash(fname, stat_index):
+    """!
+    Get the content hash of a file. The hash stored in the stat index is reused
+    as long as the size and modification time of the file are unchanged.
+
+    @param fname Filename to hash
+    @param stat_index Python dict object with the size, mtime and hash of the files hashed so far
+    """
+
+    fstat = os.stat(fname)
+
+    if fname in stat_index:
+        if (
+            stat_index[fname]["size"] == fstat.st_size
+            and stat_index[fname]["mtime"] == fstat.st_mtime
+        ):
+            return stat_index[fname]["hash"]
+
+    with open(fname, "rb") as fileh:
+        fhash = hashlib.sha256(fileh.read()).hexdigest()
+
+    stat_index[fname] = {}
+    stat_index[fname]["size"] = fstat.st_size
+    stat_index[fname]["mtime"] = fstat.st_mtime
+    stat_index[fname]["hash"] = fhash
+
+    return fhash
+
+
+def dep_cache_files(dependencies):
+    """!
+    Get all the files recorded in the dependencies of a module
+
+    @param dependencies Python dict object with the dependencies of a module
+    """
+
+    dep_files = []
+
+    for category in DEP_CACHE_CATEGORIES:
+        if category in dependencies:
+            for dep in dependencies[category]:
+                dep_files.append(next(iter(dep)))
+
+    if "veripy_subs" in dependencies:
+        for dep in dependencies["veripy_subs"]:
+            dep_files.append(dep)
+
+    return dep_files
+
+
+def dep_cache_portable_path(fname, dep_cache_root):
+    """!
+    Get the path of a file as recorded in the dependency cache. The absolute paths
+    under the dependency cache root are recorded relative to it, so that the
+    entries are shared by checkouts in different directories.
+
+    @param fname Filename or command line argument
+    @param dep_cache_root Absolute path of the dependency cache root
+    """
+
+    if fname == dep_cache_root or fname.startswith(dep_cache_root + os.sep):
+        return DEP_CACHE_ROOT + fname[len(dep_cache_root) :]
+
+    return fname
+
+
+def dep_cache_local_path(fname, dep_cache_root):
+    """!
+    Get the path of a file recorded in the dependency cache in the current checkout
+
+    @param fname Filename recorded in the dependency cache
+    @param dep_cache_root Absolute path of the dependency cache root
+    """
+
+    if fname == DEP_CACHE_ROOT or fname.startswith(DEP_CACHE_ROOT + os.sep):
+        return dep_cache_root + fname[len(DEP_CACHE_ROOT) :]
+
+    return fname
+
+
+def dep_cache_map_paths(dependencies, map_path):
+    """!
+    Get a copy of the dependencies of a module with the recorded files renamed
+
+    @param dependencies Python dict object with the dependencies of a module
+    @param map_path Function returning the new name of a file
+    """
+
+    mapped_dependencies = {}
+
+    for category in dependencies:
+        if category in DEP_CACHE_CATEGORIES:
+            mapped_dependencies[category] = [
+                {map_path(next(iter(dep))): dep[next(iter(dep))]}
+                for dep in dependencies[category]
+            ]
+        elif category == "veripy_subs":
+            mapped_dependencies[category] = {
+                map_path(dep): dependencies[category][dep]
+                for dep in dependencies[category]
+            }
+        else:
+            mapped_dependencies[category] = dependencies[category]
+
+    return mapped_dependencies
+
+
+def dep_cache_key(RUN_ARGS, tool_hash, stat_index, dep_cache_root):
+    """!
+    Get the dependency cache key of a veripy.py dependency run. The key covers the
+    effective command line arguments, the content of every file passed in the
+    command line (input file, #define files, packages, lists, ...), the working
+    directory, the chip and vendor environment and the veripy sources. The paths
+    under the dependency cache root are keyed relative to it.
+
+    @param RUN_ARGS List of veripy.py command line arguments
+    @param tool_hash Content hash of the veripy sources
+    @param stat_index Python dict object with the size, mtime and hash of the files hashed so far
+    @param dep_cache_root Absolute path of the dependency cache root
+    """
+
+    key_data = {}
+    key_data["args"] = [
+        dep_cache_portable_path(c_arg, dep_cache_root) for c_arg in RUN_ARGS
+    ]
+    key_data["files"] = {}
+    key_data["env"] = {}
+    key_data["tool"] = tool_hash
+
+    # The relative paths in the arguments and dependencies start from the cwd
+    key_data["cwd"] = dep_cache_portable_path(os.getcwd(), dep_cache_root)
+
+    for c_arg in RUN_ARGS:
+        if os.path.isfile(c_arg):
+            key_data["files"][dep_cache_portable_path(c_arg, dep_cache_root)] = (
+                file_hash(c_arg, stat_index)
+            )
+
+    for c_env in ["FB_CHIP", "ASIC_VENDOR"]:
+        key_data["env"][c_env] = os.environ.get(c_env, None)
+
+    return hashlib.sha256(json.dumps(key_data).encode()).hexdigest()
+
+
+def dep_cache_tool_hash(stat_index):
+    """!
+    Get the content hash of the veripy sources next to this script, so that a new
+    version of veripy invalidates the dependency cache.
+
+    @param stat_index Python dict object with the size, mtime and hash of the files hashed so far
+    """
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    tool_files = sorted(glob.glob(os.path.join(script_dir, "*.py")))
+    tool_files += sorted(glob.glob(os.path.join(script_dir, "src", "*.py")))
+
+    tool_hashes = [file_hash(tool_file, stat_index) for tool_file in tool_files]
+
+    return hashlib.sha256(" ".join(tool_hashes).encode()).hexdigest()
+
+
+def dep_cache_load(dep_cache_dir, key, stat_index, dep_cache_root):
+    """!
+    Load the dependencies of a module from the dependency cache. The entry is only
+    used when all the recorded dependency files have the same content as when it
+    was stored. The mtimes in the returned dependencies are refreshed from the
+    current files.
+
+    @param dep_cache_dir Dependency cache directory
+    @param key Dependency cache key from dep_cache_key
+    @param stat_index Python dict object with the size, mtime and hash of the files hashed so far
+    @param dep_cache_root Absolute path of the dependency cache root
+    """
+
+    entry_file = os.path.join(dep_cache_dir, key[:2], key + ".json")
+
+    if not os.path.isfile(entry_file):
+        return None
+
+    try:
+        with open(entry_file, "r") as fp:
+            entry = json.load(fp)
+    except (OSError, ValueError):
+        return None
+
+    for dep_file, dep_hash in entry["files"].items():
+        dep_file = dep_cache_local_path(dep_file, dep_cache_root)
+        if not os.path.isfile(dep_file):
+            return None
+        if file_hash(dep_file, stat_index) != dep_hash:
+            return None
+
+    dependencies = dep_cache_map_paths(
+        entry["dependencies"],
+        lambda fname: dep_cache_local_path(fname, dep_cache_root),
+    )
+
+    for category in DEP_CACHE_CATEGORIES:
+        if category in dependencies:
+            for dep in dependencies[category]:
+                if isfile(next(iter(dep))):
+                    dep[next(iter(dep))]["mtime"] = getmtime(next(iter(dep)))
+
+    if "veripy_subs" in dependencies:
+        for dep in dependencies["veripy_subs"]:
+            if isfile(dep):
+                dependencies["veripy_subs"][dep]["mtime"] = getmtime(dep)
+
+    return dependencies
+
+
+def dep_cache_store(dep_cache_dir, key, dependencies, stat_index, dep_cache_root):
+    """!
+    Store the dependencies of a module in the dependency cache along with the
+    content hash of all the recorded dependency files.
+
+    @param dep_cache_dir Dependency cache directory
+    @param key Dependency cache key from dep_cache_key
+    @param dependencies Python dict object with the dependencies of a module
+    @param stat_index Python dict object with the size, mtime and hash of the files hashed so far
+    @param dep_cache_root Absolute path of the dependency cache root
+    """
+
+    entry = {}
+    entry["dependencies"] = dep_cache_map_paths(
+        dependencies,
+        lambda fname: dep_cache_portable_path(fname, dep_cache_root),
+    )
+    entry["files"] = {}
+
+    for dep_file in dep_cache_files(dependencies):
+        if os.path.isfile(dep_file):
+            entry["files"][dep_cache_portable_path(dep_file, dep_cache_root)] = (
+                file_hash(dep_file, stat_index)
+            )
+
+    entry_dir = os.path.join(dep_cache_dir, key[:2])
+    os.makedirs(entry_dir, exist_ok=True)
+
+    # Write and rename, so that concurrent builds sharing the cache directory
+    # never see a partial entry
+    entry_file = os.path.join(entry_dir, key + ".json")
+    tmp_file = entry_file + "." + str(os.getpid())
+    with open(tmp_file, "w") as fp:
+        json.dump(entry, fp)
+    os.replace(tmp_file, entry_file)
+
+
+def split_buck_stanzas(text):
+    """!
+    Split the text of a BUCK file into its stanzas, keyed by the target name
+
+    @param text Content of the BUCK file
+    """
+
+    stanzas = {}
+
+    for stanza in re.split(r"\n(?=\w+\()", text):
+        name_regex = RE_BUCK_TARGET_NAME.search(stanza)
+
+        if name_regex:
+            name = name_regex.group(1)
+            if name in stanzas:
+                stanzas[name] += "\n" + stanza.strip()
+            else:
+                stanzas[name] = stanza.strip()
+
+    return stanzas
+
+
+def split_makeinc_stanzas(text):
+    """!
+    Split the text of a makefile.inc into its stanzas, keyed by the make target
+    or variable name
+
+    @param text Content of the makefile.inc
+    """
+
+    stanzas = {}
+
+    for stanza in re.split(r"\n\s*\n", text):
+        stanza = stanza.strip()
+        if stanza == "" or stanza.startswith("#"):
+            continue
+
+        name = re.split(r"\s*[:=]", stanza.split("\n")[0], 1)[0]
+        if name in stanzas:
+            stanzas[name] += "\n" + stanza
+        else:
+            stanzas[name] = stanza
+
+    return stanzas
+
+
+def update_generated_file(fname, text, split_stanzas):
+    """!
+    Incrementally update a generated file. The file is only written when its
+    content changed, and the targets whose stanzas were added, modified or
+    removed are reported.
+
+    @param fname Name of the generated file
+    @param text New content of the generated file
+    @param split_stanzas Function splitting the file content into stanzas keyed by target name
+    @return List of the changed target names
+    """
+
+    old_text = ""
+    if os.path.isfile(fname):
+        with open(fname, "r") as fileh:
+            old_text = fileh.read()
+
+    if old_text == text:
+        print("### " + fname + " is up to date")
+        return []
+
+    old_stanzas = split_stanzas(old_text)
+    new_stanzas = split_stanzas(text)
+
+    changed_targets = {}
+    changed_targets["added"] = []
+    changed_targets["modified"] = []
+    changed_targets["removed"] = []
+
+    for name in new_stanzas:
+        if name not in old_stanzas:
+            changed_targets["added"].append(name)
+        elif new_stanzas[name] != old_stanzas[name]:
+            changed_targets["modified"].append(name)
+
+    for name in old_stanzas:
+        if name not in new_stanzas:
+            changed_targets["removed"].append(name)
+
+    with open(fname, "w") as fileh:
+        fileh.write(text)
+
+    print("### Updated " + fname)
+    for category in changed_targets:
+        if len(changed_targets[category]) > 0:
+            print("  + " + category.upper() + ":")
+            for name in changed_targets[category]:
+                print("    - " + name)
+
+    return (
+        changed_targets["added"]
+        + changed_targets["modified"]
+        + changed_targets["removed"]
+    )
+
+
 def dbg(dbg_info):
     """
     Write out debug dump file.
@@ -271,6 +657,7 @@ def get_cmd_line_args():
     parser.add_argument(
         "positional",
         action="store",
+        nargs="?",
         help="Input filename with a mix of verilog|systemverilog along with embedded \
         python code. <filename>.pv - Input file with mix of verilog and embedded \
         python. <filename>.psv - Input file with mix of system verilog and embedded \
@@ -541,7 +928,8 @@ def get_cmd_line_args():
         action="store_true",
         default=False,
         dest="update_inc",
-        help="Generate makefile.inc. By default it generates BUCK file.",
+        help="Also generate makefile.inc for the first RTL target. By default \
+        only the BUCK file is generated.",
     )
 
     # -root path
@@ -625,6 +1013,36 @@ def get_cmd_line_args():
         the dictionary for dependencies.",
     )
 
+    # -incremental option
+    parser.add_argument(
+        "-incr",
+        "--incremental",
+        action="store_true",
+        default=False,
+        dest="incremental",
+        help="Incrementally regenerate the BUCK file and makefile.inc. Only the \
+        modules whose inputs changed are run through veripy.py again, using the \
+        dependency cache (./.veripy_dep_cache unless --dep_cache is given). The \
+        generated files are only written when a target changed, and the added, \
+        modified and removed targets are reported.",
+    )
+
+    # -dep_cache option
+    parser.add_argument(
+        "-dc",
+        "--dep_cache",
+        action="store",
+        default=os.environ.get("VERIPY_DEP_CACHE", ""),
+        dest="dep_cache_dir",
+        help="Optional directory for the dependency cache. The dependencies of a \
+        module are reused when the content of the module, of all its recorded \
+        dependency files and of the files passed in the command line, as well as \
+        the command line options and #defines, are unchanged. The paths under \
+        --root_path (the current directory by default) are cached relative to \
+        it, so the directory can be shared between checkouts in different \
+        directories. Defaults to $VERIPY_DEP_CACHE.",
+    )
+
     # -use_prev_dict option
     parser.add_argument(
         "-upd",
@@ -636,6 +1054,57 @@ def get_cmd_line_args():
         for subsequent runs, slower for initial run).",
     )
 
+    # -jobs option
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        type=int,
+        default=1,
+        dest="jobs",
+        help="Number of veripy.py dependency runs to launch in parallel. The run \
+        of a module is launched as soon as the run of its parent completes; the \
+        generated dependencies and targets are identical to a serial run.",
+    )
+
+    # -telemetry option
+    parser.add_argument(
+        "-tel",
+        "--telemetry",
+        action="store",
+        default="",
+        dest="telemetry_file",
+        help="By default, no telemetry file is generated. If a filename is \
+        specified, it is truncated and every veripy.py run appends a JSON line with \
+        its time per phase and peak RSS, along with the module hierarchy and the \
+        dependency cache hits of the build. A build summary is printed at the end.",
+    )
+
+    # -telemetry_summary option
+    parser.add_argument(
+        "-tels",
+        "--telemetry_summary",
+        action="store",
+        default="",
+        dest="telemetry_summary_file",
+        help="Print the build summary of a telemetry file and exit: slowest \
+        modules, time per phase, critical path through the hierarchy and cache hit \
+        rates. Use it after the make builds that appended to the file.",
+    )
+
+    # -in_process option
+    parser.add_argument(
+        "-ip",
+        "--in_process",
+        action="store_true",
+        default=False,
+        dest="in_process",
+        help="Gather the dependencies by calling veripy.py in-process instead of \
+        running a veripy.py command per module. The veripy.py next to this script \
+        is used and --veripy_path is ignored. With --jobs, the modules are \
+        gathered by a pool of long-lived worker processes.",
+    )
+
     # -prune_deps option
     parser.add_argument(
         "--prune_deps",
@@ -715,6 +1184,14 @@ def get_cmd_line_args():
 
     cmdline = parser.parse_args()
 
+    if cmdline.telemetry_summary_file != "":
+        print_telemetry_summary(cmdline.telemetry_summary_file)
+        sys.exit(0)
+
+    # Only the telemetry summary is run without an input file
+    if cmdline.positional is None:
+        parser.error("the following arguments are required: positional")
+
     if cmdline.config_file is not None:
         eval_config_file(cmdline.config_file)
 
@@ -780,6 +1257,17 @@ def get_cmd_line_args():
     prune_dep_target = cmdline.prune_dep_target
     prune_dep_target.extend(default_prune_dep_targets)
     profiling_file = cmdline.profiling_file
+    jobs = max(1, cmdline.jobs)
+    in_process = cmdline.in_process
+    dep_cache_dir = cmdline.dep_cache_dir
+    incremental = cmdline.incremental
+    telemetry_file = cmdline.telemetry_file
+    if telemetry_file != "":
+        telemetry_file = os.path.abspath(telemetry_file)
+        # One file per build, the make builds append to it afterwards
+        open(telemetry_file, "w").close()
+    if incremental and dep_cache_dir == "":
+        dep_cache_dir = ".veripy_dep_cache"
     targetdir = cmdline.targetdir
     chip = cmdline.chip
     vendor = cmdline.vendor
@@ -975,6 +1463,113 @@ def get_cmd_line_args():
         PROFILING_FILE_OPTION,
         DEST_DIR,
         rtldir_suffix,
+        jobs,
+        in_process,
+        dep_cache_dir,
+        incremental,
+        telemetry_file,
+    )
+
+
+def run_dependency_cmd(RUN_CMD, OUTPUT_FILE, keep_output=False):
+    """!
+    Run veripy.py in dependency mode and capture its output
+
+    @param RUN_CMD Command line for the veripy.py dependency run
+    @param OUTPUT_FILE The --output file the dependencies are written to
+    @param keep_output Boolean to keep the output file after loading it
+    @return Tuple of the return code, the captured stdout of the run and the
+    dependencies, None when the run failed
+    """
+
+    p = subprocess.Popen(RUN_CMD, stdout=subprocess.PIPE, shell=True)
+    out, err = p.communicate()
+
+    if p.returncode != 0:
+        return p.returncode, out, None
+
+    # Load dependency list from file generated by Veripy script
+    with open(OUTPUT_FILE, "r") as fileh:
+        fdata = fileh.read()
+
+    dependencies = yaml.load(fdata, Loader=yaml.FullLoader)
+
+    if not keep_output:
+        os.remove(OUTPUT_FILE)
+
+    return p.returncode, out, dependencies
+
+
+# Module level tables of veripy.py, taken before the first in-process run
+veripy_module_tables = None
+
+
+def run_dependency_func(RUN_ARGS):
+    """!
+    Run the veripy.py dependency extraction in the current process and capture
+    its output. veripy.py is imported on the first call, so a worker process
+    only pays for the imports once. Every run starts from the module level
+    tables veripy.py had before the first run.
+
+    @param RUN_ARGS List of veripy.py command line arguments
+    @return Tuple of the return code, the captured stdout of the run and the
+    dependencies
+    """
+
+    global veripy_module_tables
+
+    import veripy
+
+    if veripy_module_tables is None:
+        veripy_module_tables = veripy.snapshot_module_tables()
+
+    returncode = 0
+    dependencies = None
+    out = io.StringIO()
+
+    with contextlib.redirect_stdout(out):
+        try:
+            dependencies = veripy.get_dependency_list(RUN_ARGS, veripy_module_tables)
+        except SystemExit as e:
+            returncode = e.code if e.code else 1
+        except Exception:
+            traceback.print_exc()
+            returncode = 1
+
+    # Runs ended by an error are recorded with their return code
+    veripy.g_telemetry.stop(returncode)
+
+    # Same content as the JSON written out by the veripy.py --output file
+    if dependencies is not None:
+        dependencies = json.loads(json.dumps(dependencies))
+
+    return returncode, out.getvalue().encode(), dependencies
+
+
+def write_module_record(telemetry_file, in_file, parent_file, level, cached):
+    """!
+    Append the place of a module in the hierarchy to the telemetry file
+
+    @param telemetry_file JSON lines file for the telemetry of the runs
+    @param in_file Input .psv/.pv file of the module
+    @param parent_file Input file of the parent module, empty for the top module
+    @param level Level of the module in the hierarchy
+    @param cached Boolean set when the dependencies were not gathered by a veripy.py run
+    """
+
+    if parent_file != "":
+        parent_file = os.path.abspath(parent_file)
+
+    write_record(
+        telemetry_file,
+        {
+            "tool": "veripy_build",
+            "record": "module",
+            "input_file": os.path.abspath(in_file),
+            "parent": parent_file,
+            "level": level,
+            "cached": cached,
+        },
     )
 
 
@@ -1013,6 +1608,11 @@ def gen_dependencies(
     PROFILING_FILE_OPTION,
     DEST_DIR,
     use_default_mem_wrapper_name,
+    jobs=1,
+    in_process=False,
+    dep_cache_dir="",
+    dep_cache_root="",
+    telemetry_file="",
 ):
     """!
     Get dependencies for file hierarchy
@@ -1049,9 +1649,37 @@ def gen_dependencies(
     @param use_dict Boolean to turn on/off the use of a dict to store build dependencies
     @param use_prev_dict Boolean to determine whether to generate a new dict for this run or load a previous one
     @param PROFILING_FILE_OPTION Option passed to veripy.py to enable a file to store profiling data
+    @param jobs Number of veripy.py dependency runs to launch in parallel
+    @param in_process Boolean to call veripy.py in-process instead of running a veripy.py command per module
+    @param dep_cache_dir Dependency cache directory, empty to disable the dependency cache
+    @param dep_cache_root Absolute path the cached paths are relative to, the cwd when empty
+    @param telemetry_file JSON lines file for the telemetry of the runs, empty to disable the telemetry
     """
 
     hierarchical_dependencies = {}
+    start_time = time.perf_counter()
+
+    if jobs > 1 and in_process:
+        executor = ProcessPoolExecutor(max_workers=jobs)
+    elif jobs > 1:
+        executor = ThreadPoolExecutor(max_workers=jobs)
+    else:
+        executor = None
+
+    if dep_cache_dir != "":
+        stat_index_json = os.path.join(dep_cache_dir, "stat_index.json")
+        if os.path.isfile(stat_index_json):
+            with open(stat_index_json, "r") as fp:
+                stat_index = json.load(fp)
+        else:
+            stat_index = {}
+
+        tool_hash = dep_cache_tool_hash(stat_index)
+
+        if dep_cache_root == "":
+            dep_cache_root = os.getcwd()
+        dep_cache_hits = 0
+        dep_cache_misses = 0
 
     global RE_SLASH
     RE_SLASH = re.compile(r"(.*)\/(.*)")
@@ -1065,11 +1693,239 @@ def gen_dependencies(
     files_hierarchy[level][IN_FILE_OPTION] = {}
     files_hierarchy[level][IN_FILE_OPTION]["PARENT"] = ""
 
+    def get_dep_run(c_file, file_info):
+        """!
+        Create the veripy.py run gathering the dependencies of a file
+
+        @param c_file Input file of the run
+        @param file_info Entry of the file in the hierarchy, with its PARENT and
+        BUILD_CMD
+        @return Dict of the run, None when the file is not gathered by a run
+        """
+
+        if use_dict and up_to_date_file_in_dict(
+            str(c_file), build_subdirs_dict, use_prev_dict
+        ):
+            return None
+
+        # If the *.psv or *.pv is not in the current directory
+        if RE_SLASH.search(c_file):
+            return None
+
+        if "BUILD_CMD" in file_info:
+            ADDL_BUILD_CMD = " ".join(file_info["BUILD_CMD"])
+        else:
+            ADDL_BUILD_CMD = ""
+
+        IN_FILE = c_file
+
+        # The in-process runs return the dependencies without an output file
+        if in_process:
+            OUTPUT_FILE = ""
+            OUTPUT_OPTION = ""
+        else:
+            OUTPUT_FILE = c_file + ".dep_list" + str(time.time())
+            OUTPUT_OPTION = "--output " + OUTPUT_FILE
+
+        # Create run command for calling Veripy script to generate dependencies
+        RUN_CMD = VERIPY_SCRIPT
+        RUN_CMD = (
+            RUN_CMD
+            + " "
+            + IN_FILE
+            + " "
+            + FORMAT
+            + " "
+            + INCL_DIRS_OPTION
+            + " "
+            + INTERFACE_SPECS_OPTION
+            + " "
+            + INTERFACE_DEFS_OPTION
+            + " "
+            + MODULE_DEFS_OPTION
+            + " "
+            + FILES_OPTION
+            + " "
+            + LIST_OPTION
+            + " "
+            + FLIST_OPTION
+            + " "
+            + DEFINE_VARS_OPTION
+            + " "
+            + DEFINE_FILES_OPTION
+            + " "
+            + DEPENDENCIES_OPTION
+            + " "
+            + OUTPUT_OPTION
+            + " "
+            + PARSE_GENERATE_OPTION
+            + " "
+            + ADDL_BUILD_CMD
+            + " "
+            + USER_OPTIONS
+            + " "
+            + DISABLE_TICK_IFDEFS_OPTION
+            + " "
+            + DISABLE_AUTO_PACKAGE_OPTION
+            + " "
+            + PYTHON_FILES_OPTION
+            + " "
+            + use_default_mem_wrapper_name
+            + " "
+            + PROFILING_FILE_OPTION
+        )
+        run_cmd_split = re.split(r"--", RUN_CMD)
+
+        c_first_options = run_cmd_split[0]
+
+        c_cmd_count = 0
+
+        fixed_run_cmd = {}
+        for c_run_cmd in run_cmd_split:
+            if c_cmd_count > 0:
+                c_run_cmd_split = re.split(r"\s+", c_run_cmd, 1)
+
+                if c_run_cmd_split[0] in fixed_run_cmd:
+                    fixed_run_cmd[c_run_cmd_split[0]] = (
+                        fixed_run_cmd[c_run_cmd_split[0]]
+                        + " "
+                        + c_run_cmd_split[1]
+                    )
+                else:
+                    fixed_run_cmd[c_run_cmd_split[0]] = c_run_cmd_split[1]
+
+            c_cmd_count += 1
+
+        UPDATED_RUN_CMD = c_first_options
+
+        for c_key, c_value in fixed_run_cmd.items():
+            UPDATED_RUN_CMD += "--" + c_key + " " + c_value
+
+        dep_run = {}
+        dep_run["RUN_CMD"] = UPDATED_RUN_CMD
+        dep_run["OUTPUT_FILE"] = OUTPUT_FILE
+
+        # veripy.py arguments without the script and the output file
+        RUN_ARGS = shlex.split(c_first_options)[len(shlex.split(VERIPY_SCRIPT)) :]
+        for c_key, c_value in fixed_run_cmd.items():
+            if c_key != "output":
+                RUN_ARGS += ["--" + c_key] + shlex.split(c_value)
+
+        dep_run["ARGS"] = [os.path.expandvars(c_arg) for c_arg in RUN_ARGS]
+
+        if dep_cache_dir != "":
+            dep_run["CACHE_KEY"] = dep_cache_key(
+                dep_run["ARGS"], tool_hash, stat_index, dep_cache_root
+            )
+            c_dependancies = dep_cache_load(
+                dep_cache_dir, dep_run["CACHE_KEY"], stat_index, dep_cache_root
+            )
+            if c_dependancies is not None:
+                dep_run["CACHED"] = c_dependancies
+
+        # Not part of the cache key, the telemetry does not change the result
+        if telemetry_file != "":
+            dep_run["RUN_CMD"] += " -tel " + telemetry_file
+            dep_run["ARGS"] += ["-tel", telemetry_file]
+
+        return dep_run
+
+    # With a worker pool, the run of a module is launched as soon as the run of
+    # its parent completes, instead of waiting for its whole level. The results
+    # are processed below in the same order as a serial run. A module found
+    # under several parents with different flags is run again there when its
+    # flags in the serial order are not the ones it was launched with.
+    scheduled_runs = {}
+
+    if executor is not None:
+        running_runs = {}
+
+        def schedule_dep_run(c_level, c_file, file_info):
+            if (c_level, c_file) in scheduled_runs:
+                return
+
+            dep_run = get_dep_run(c_file, file_info)
+            scheduled_runs[(c_level, c_file)] = (file_info.get("BUILD_CMD"), dep_run)
+
+            if dep_run is None:
+                return
+
+            if "CACHED" in dep_run:
+                schedule_dep_subs(c_level, c_file, dep_run["CACHED"])
+                return
+
+            if in_process:
+                dep_run["FUTURE"] = executor.submit(
+                    run_dependency_func, dep_run["ARGS"]
+                )
+            else:
+                dep_run["FUTURE"] = executor.submit(
+                    run_dependency_cmd,
+                    dep_run["RUN_CMD"],
+                    dep_run["OUTPUT_FILE"],
+                    DEBUG_OPTION,
+                )
+
+            running_runs[dep_run["FUTURE"]] = (c_level, c_file)
+
+        def schedule_dep_subs(c_level, c_file, c_dependancies):
+            for veripy_sub in c_dependancies["veripy_subs"]:
+                sub_info = {"PARENT": c_file}
+
+                if c_dependancies["veripy_subs"][veripy_sub]["flags"] != "":
+                    sub_info["BUILD_CMD"] = c_dependancies["veripy_subs"][
+                        veripy_sub
+                    ]["flags"]
+
+                schedule_dep_run(c_level + 1, veripy_sub, sub_info)
+
+        schedule_dep_run(0, IN_FILE_OPTION, files_hierarchy[0][IN_FILE_OPTION])
+
+        failed_run = False
+
+        while running_runs and not failed_run:
+            done_runs, _ = wait(running_runs, return_when=FIRST_COMPLETED)
+
+            for future in done_runs:
+                c_level, c_file = running_runs.pop(future)
+
+                # Failed runs are reported below, in the serial order
+                if future.exception() is not None:
+                    failed_run = True
+                    continue
+
+                returncode, out, c_dependancies = future.result()
+
+                if returncode == 0:
+                    schedule_dep_subs(c_level, c_file, c_dependancies)
+                else:
+                    failed_run = True
+
+        # After a failed run, no more runs are launched. The runs before it in
+        # the serial order still complete, and the runs still queued are
+        # cancelled when the failure is reported.
+
     while not exit_loop:
         next_level = level + 1
 
         files_hierarchy[next_level] = {}
 
+        # Create the veripy.py runs for all the files in this level, reusing the
+        # runs launched on the worker pool with the same flags
+        dep_runs = {}
+        for c_file in files_hierarchy[level]:
+            file_info = files_hierarchy[level][c_file]
+
+            if (level, c_file) in scheduled_runs and scheduled_runs[(level, c_file)][
+                0
+            ] == file_info.get("BUILD_CMD"):
+                dep_run = scheduled_runs[(level, c_file)][1]
+            else:
+                dep_run = get_dep_run(c_file, file_info)
+
+            if dep_run is not None:
+                dep_runs[c_file] = dep_run
+
         for c_file in files_hierarchy[level]:
             if DEBUG_OPTION:
                 print(json.dumps(files_hierarchy[level], indent=2))
@@ -1080,24 +1936,22 @@ def gen_dependencies(
                 hierarchical_dependencies.update(build_subdirs_dict[str(c_file)])
                 print("### Dependencies found for " + str(c_file))
 
+                if telemetry_file != "":
+                    write_module_record(
+                        telemetry_file,
+                        c_file,
+                        files_hierarchy[level][c_file]["PARENT"],
+                        level,
+                        True,
+                    )
+
             else:
                 parent_file = files_hierarchy[level][c_file]["PARENT"]
 
-                if "BUILD_CMD" in files_hierarchy[level][c_file]:
-                    ADDL_BUILD_CMD = " ".join(
-                        files_hierarchy[level][c_file]["BUILD_CMD"]
-                    )
-                else:
-                    ADDL_BUILD_CMD = ""
-
                 IN_FILE = c_file
-                OUTPUT_FILE = c_file + ".dep_list" + str(time.time())
-                RUN_LOG = c_file + ".run.log"
-
-                c_file_slash_regex = RE_SLASH.search(c_file)
 
                 # If the *.psv or *.pv is not in the current directory
-                if c_file_slash_regex:
+                if c_file not in dep_runs:
                     hierarchical_dependencies[IN_FILE] = {}
 
                     if top_module:
@@ -1107,103 +1961,58 @@ def gen_dependencies(
 
                     continue
 
-                # Create run command for calling Veripy script to generate dependencies
-                RUN_CMD = VERIPY_SCRIPT
-                RUN_CMD = (
-                    RUN_CMD
-                    + " "
-                    + IN_FILE
-                    + " "
-                    + FORMAT
-                    + " "
-                    + INCL_DIRS_OPTION
-                    + " "
-                    + INTERFACE_SPECS_OPTION
-                    + " "
-                    + INTERFACE_DEFS_OPTION
-                    + " "
-                    + MODULE_DEFS_OPTION
-                    + " "
-                    + FILES_OPTION
-                    + " "
-                    + LIST_OPTION
-                    + " "
-                    + FLIST_OPTION
-                    + " "
-                    + DEFINE_VARS_OPTION
-                    + " "
-                    + DEFINE_FILES_OPTION
-                    + " "
-                    + DEPENDENCIES_OPTION
-                    + " "
-                    + "--output "
-                    + OUTPUT_FILE
-                    + " "
-                    + PARSE_GENERATE_OPTION
-                    + " "
-                    + ADDL_BUILD_CMD
-                    + " "
-                    + USER_OPTIONS
-                    + " "
-                    + DISABLE_TICK_IFDEFS_OPTION
-                    + " "
-                    + DISABLE_AUTO_PACKAGE_OPTION
-                    + " "
-                    + PYTHON_FILES_OPTION
-                    + " "
-                    + use_default_mem_wrapper_name
-                    + " "
-                    + PROFILING_FILE_OPTION
-                )
-                run_cmd_split = re.split(r"--", RUN_CMD)
-
-                c_first_options = run_cmd_split[0]
-
-                c_cmd_count = 0
-
-                fixed_run_cmd = {}
-                for c_run_cmd in run_cmd_split:
-                    if c_cmd_count > 0:
-                        c_run_cmd_split = re.split(r"\s+", c_run_cmd, 1)
-
-                        if c_run_cmd_split[0] in fixed_run_cmd:
-                            fixed_run_cmd[c_run_cmd_split[0]] = (
-                                fixed_run_cmd[c_run_cmd_split[0]]
-                                + " "
-                                + c_run_cmd_split[1]
-                            )
-                        else:
-                            fixed_run_cmd[c_run_cmd_split[0]] = c_run_cmd_split[1]
-
-                    c_cmd_count += 1
-
-                UPDATED_RUN_CMD = c_first_options
-
-                for c_key, c_value in fixed_run_cmd.items():
-                    UPDATED_RUN_CMD += "--" + c_key + " " + c_value
+                RUN_CMD = dep_runs[c_file]["RUN_CMD"]
+                OUTPUT_FILE = dep_runs[c_file]["OUTPUT_FILE"]
 
-                RUN_CMD = UPDATED_RUN_CMD
-
-                print("### Gathering Dependencies for " + IN_FILE)
+                if "CACHED" in dep_runs[c_file]:
+                    print("### Dependencies found in cache for " + IN_FILE)
+                    dep_cache_hits += 1
+                else:
+                    print("### Gathering Dependencies for " + IN_FILE)
 
-                if True:
-                    print("  # RUN COMMAND: " + RUN_CMD)
+                    if True:
+                        print("  # RUN COMMAND: " + RUN_CMD)
 
                 # Run veripy.py to generate dependency list
-                p = subprocess.Popen(RUN_CMD, stdout=subprocess.PIPE, shell=True)
-                out, err = p.communicate()
-                if p.returncode != 0:
+                if "CACHED" in dep_runs[c_file]:
+                    returncode, out, c_dependancies = 0, b"", dep_runs[c_file]["CACHED"]
+                elif "FUTURE" in dep_runs[c_file]:
+                    try:
+                        returncode, out, c_dependancies = dep_runs[c_file][
+                            "FUTURE"
+                        ].result()
+                    except Exception:
+                        # A run that raised, or a worker that died, is reported
+                        # as a build error of the file
+                        returncode = 1
+                        out = traceback.format_exc().encode()
+                        c_dependancies = None
+                elif in_process:
+                    returncode, out, c_dependancies = run_dependency_func(
+                        dep_runs[c_file]["ARGS"]
+                    )
+                else:
+                    returncode, out, c_dependancies = run_dependency_cmd(
+                        RUN_CMD, OUTPUT_FILE, DEBUG_OPTION
+                    )
+
+                if returncode != 0:
                     print(out.decode())
                     print("\n\nError: Please fix the build error for " + IN_FILE + "\n")
                     print("RUN COMMAND:\n" + RUN_CMD + "\n")
+                    if executor is not None:
+                        executor.shutdown(wait=True, cancel_futures=True)
                     sys.exit(1)
 
-                # Load dependency list from file generated by Veripy script
-                with open(OUTPUT_FILE, "r") as fileh:
-                    fdata = fileh.read()
-
-                c_dependancies = {}
-                c_dependancies = yaml.load(fdata, Loader=yaml.FullLoader)
+                if dep_cache_dir != "" and "CACHED" not in dep_runs[c_file]:
+                    dep_cache_store(
+                        dep_cache_dir,
+                        dep_runs[c_file]["CACHE_KEY"],
+                        c_dependancies,
+                        stat_index,
+                        dep_cache_root,
+                    )
+                    dep_cache_misses += 1
 
                 if level > 0:
                     c_dependancies["build_cmd"] = files_hierarchy[level][IN_FILE][
@@ -1237,6 +2046,15 @@ def gen_dependencies(
 
                 hierarchical_dependencies[IN_FILE] = c_dependancies
 
+                if telemetry_file != "":
+                    write_module_record(
+                        telemetry_file,
+                        IN_FILE,
+                        parent_file,
+                        level,
+                        "CACHED" in dep_runs[c_file],
+                    )
+
                 if top_module:
                     hierarchical_dependencies[IN_FILE]["topmodule"] = "NONE"
                 else:
@@ -1248,9 +2066,6 @@ def gen_dependencies(
 
                 print()
 
-                if not DEBUG_OPTION:
-                    os.remove(OUTPUT_FILE)
-
         if files_hierarchy[next_level] is not None:
             if len(files_hierarchy[next_level]) == 0:
                 del files_hierarchy[next_level]
@@ -1260,6 +2075,43 @@ def gen_dependencies(
         top_module = 0
         level += 1
 
+    if executor is not None:
+        executor.shutdown()
+
+    if telemetry_file != "":
+        write_record(
+            telemetry_file,
+            {
+                "tool": "veripy_build",
+                "record": "build",
+                "input_file": os.path.abspath(IN_FILE_OPTION),
+                "wall_time": time.perf_counter() - start_time,
+                "max_rss_kb": max(peak_rss_kb(), peak_rss_kb("children")),
+                "jobs": jobs,
+                "dep_cache": {
+                    "hits": dep_cache_hits if dep_cache_dir != "" else 0,
+                    "misses": dep_cache_misses if dep_cache_dir != "" else 0,
+                },
+            },
+        )
+
+    if dep_cache_dir != "":
+        print(
+            "### Dependency cache: "
+            + str(dep_cache_hits)
+            + " hits, "
+            + str(dep_cache_misses)
+            + " misses"
+        )
+
+        # Write and rename, so that concurrent builds sharing the cache
+        # directory never see a partial stat index
+        os.makedirs(dep_cache_dir, exist_ok=True)
+        tmp_file = stat_index_json + "." + str(os.getpid())
+        with open(tmp_file, "w") as fp:
+            json.dump(stat_index, fp)
+        os.replace(tmp_file, stat_index_json)
+
     if use_dict:
         with open(build_subdirs_dict_json, "w") as fp:
             json.dump(build_subdirs_dict, fp)
@@ -1293,6 +2145,7 @@ def gen_makeinc(
     UPDATE_TARGETS_OPTION,
     DEST_DIR,
     prune_deps=True,
+    incremental=False,
 ):
     """
     Generating makefile.inc
@@ -1305,7 +2158,7 @@ def gen_makeinc(
     if update_inc:
         root_path = re.sub(r"\?", r"\\?", root_path)
 
-        with open("makefile.inc", "w") as makeinc:
+        with io.StringIO() as makeinc:
             makeinc.write("# @" + "generated\n")
 
             for c_mod in hierarchical_dependencies:
@@ -1411,6 +2264,15 @@ def gen_makeinc(
 
             makeinc.writelines(module_lines)
 
+            makeinc_text = makeinc.getvalue()
+
+        if incremental:
+            update_generated_file("makefile.inc", makeinc_text, split_makeinc_stanzas)
+        else:
+            with open("makefile.inc", "w") as fileh:
+                fileh.write(makeinc_text)
+
+
 def gen_targets(
     UPDATE_TARGETS_OPTION,
     DEBUG_OPTION,
@@ -1422,6 +2284,7 @@ def gen_targets(
     prune_deps,
     prune_dep_target,
     rtldir_suffix,
+    incremental=False,
 ):
     """
     Generating BUCK file for Buck Build
@@ -1452,7 +2315,7 @@ def gen_targets(
     current_dir = os.getcwd()
 
     if UPDATE_TARGETS_OPTION:
-        with open("../BUCK", "w") as targets_file:
+        with io.StringIO() as targets_file:
 
             print_line = "# @generated"
             targets_file.write(print_line + "\n\n")
@@ -1881,6 +2744,14 @@ def gen_targets(
                     targets_file.write(print_line + "\n")
                     dbg(print_line + "\n")
 
+            targets_text = targets_file.getvalue()
+
+        if incremental:
+            update_generated_file("../BUCK", targets_text, split_buck_stanzas)
+        else:
+            with open("../BUCK", "w") as fileh:
+                fileh.write(targets_text)
+
 
 def get_source_directory_target() :
     infra_root = os.environ.get("INFRA_ASIC_FPGA_ROOT", None) 
@@ -1912,6 +2783,21 @@ source_directory(
 """ % extn_str
     return ret_str
 
+
+def print_telemetry_summary(telemetry_file):
+    """!
+    Print the build summary of a telemetry file
+
+    @param telemetry_file JSON lines file written by veripy.py and veripy_build.py
+    """
+
+    if not os.path.isfile(telemetry_file):
+        print("Error: Unable to open telemetry file " + telemetry_file)
+        sys.exit(1)
+
+    print_summary(summarize_records(read_records(telemetry_file)), telemetry_file)
+
+
 def main():
     """
     Main function to run in script.
@@ -1957,6 +2843,11 @@ def main():
         PROFILING_FILE_OPTION,
         DEST_DIR,
         rtldir_suffix,
+        jobs,
+        in_process,
+        dep_cache_dir,
+        incremental,
+        telemetry_file,
     ) = get_cmd_line_args()
 
     rtl_target_hierarchical_dependencies = {}
@@ -2004,6 +2895,11 @@ def main():
             PROFILING_FILE_OPTION,
             "../rtl_" + rtldir_suffix,
             use_default_mem_wrapper_option,
+            jobs,
+            in_process,
+            dep_cache_dir,
+            root_path,
+            telemetry_file,
         )
         rtl_target_hierarchical_dependencies[(chip, vendor, rtldir_suffix, user_options)] = hierarchical_dependencies
 
@@ -2018,8 +2914,25 @@ def main():
         prune_deps,
         prune_dep_target,
         rtldir_suffix,
+        incremental,
     )
 
+    # makefile.inc builds a single $(TARGET), the first RTL target
+    if update_inc:
+        gen_makeinc(
+            update_inc,
+            root_path,
+            next(iter(rtl_target_hierarchical_dependencies.values())),
+            UPDATE_TARGETS_OPTION,
+            DEST_DIR,
+            prune_deps,
+            incremental,
+        )
+
+    if telemetry_file != "":
+        print()
+        print_telemetry_summary(telemetry_file)
+
 
 if __name__ == "__main__":
     main()
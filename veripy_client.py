@@ -0,0 +1,130 @@
+#!/usr/local/bin/asicpy
+####################################################################################
+#   Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved.
+#   The following information is considered proprietary and confidential to Facebook,
+#   and may not be disclosed to any third party nor be used for any purpose other
+#   than to full fill service obligations to Facebook
+####################################################################################
+
+"""
+!@package veripy_client
+veripy_client.py runs veripy through a running veripy_server.py. It takes the same
+arguments as veripy.py and falls back to running veripy.py directly when no server
+is running.
+"""
+
+import json
+import os
+import os.path
+import socket
+import stat
+import sys
+import tempfile
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def get_socket_path():
+    """!
+    Get the unix socket path of the veripy server. VERIPY_SERVER_SOCKET overrides
+    the per-user default, in $XDG_RUNTIME_DIR or in a private directory of the
+    temp directory.
+    """
+    socket_path = os.environ.get("VERIPY_SERVER_SOCKET", "")
+
+    if socket_path == "":
+        socket_dir = os.environ.get("XDG_RUNTIME_DIR", "")
+
+        if socket_dir == "":
+            socket_dir = os.path.join(
+                tempfile.gettempdir(), "veripy_server." + str(os.getuid())
+            )
+
+        socket_path = os.path.join(socket_dir, "veripy_server.sock")
+
+    return socket_path
+
+
+def is_own_socket(socket_path):
+    """!
+    Check that the socket path is a unix socket of the current user, so the
+    runs and their environment are only sent to a server of the same user.
+
+    @param socket_path Unix socket path of the veripy server
+    """
+    try:
+        st = os.lstat(socket_path)
+    except OSError:
+        return False
+
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+def send_request(socket_path, request):
+    """!
+    Send a request to the veripy server and stream back the output. Returns the
+    exit code of the run, or None if no server is running.
+
+    @param socket_path Unix socket path of the veripy server
+    @param request Python dict object with the arguments, directory and environment of the run
+    """
+    if not os.path.exists(socket_path):
+        return None
+
+    if not is_own_socket(socket_path):
+        print(
+            "Warning: Ignoring the veripy server socket "
+            + socket_path
+            + ", not a socket of the current user",
+            file=sys.stderr,
+        )
+        return None
+
+    try:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(socket_path)
+    except OSError:
+        return None
+
+    rc = 1
+
+    with client:
+        client.sendall((json.dumps(request) + "\n").encode())
+
+        for line in client.makefile("rb"):
+            reply = json.loads(line)
+
+            if "out" in reply:
+                sys.stdout.write(reply["out"])
+                sys.stdout.flush()
+            elif "err" in reply:
+                sys.stderr.write(reply["err"])
+                sys.stderr.flush()
+            elif "rc" in reply:
+                rc = reply["rc"]
+
+    return rc
+
+
+def main():
+    """
+    Main function to run in script.
+    """
+
+    request = {
+        "args": sys.argv[1:],
+        "cwd": os.getcwd(),
+        "env": dict(os.environ),
+    }
+
+    rc = send_request(get_socket_path(), request)
+
+    if rc is None:
+        veripy_script = os.path.join(SCRIPT_DIR, "veripy.py")
+        os.execv(sys.executable, [sys.executable, veripy_script] + sys.argv[1:])
+
+    sys.exit(rc)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,426 @@
+#!/usr/local/bin/asicpy
+####################################################################################
+#   Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved.
+#   The following information is considered proprietary and confidential to Facebook,
+#   and may not be disclosed to any third party nor be used for any purpose other
+#   than to full fill service obligations to Facebook
+####################################################################################
+
+"""
+!@package veripy_server
+veripy_server.py is a compile server for veripy. It keeps the python modules, the
+compiled regular expressions, the parser grammar and the loaded SV packages warm
+between runs. Runs are requested with veripy_client.py, in the directory and
+environment of the client. Each run is done by a worker process forked from the
+warm server, so the runs are concurrent and inherit the warm state copy-on-write.
+The workers share the parsed packages through the on-disk package store. The
+server is to be started in the same build environment, as modules read it once
+at import. Only the user running the server can connect to it: the socket is
+created 0600 in a private directory and the peers of other users are refused.
+"""
+
+import argparse
+import json
+import logging
+import os
+import os.path
+import socket
+import stat
+import struct
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(SCRIPT_DIR)
+
+from veripy_client import get_socket_path, is_own_socket, send_request
+
+# Seconds given to a client to send its request once connected
+REQUEST_TIMEOUT = 5
+
+class socket_channel:
+    """
+    Ordered stream of the stdout/stderr output of a run to the client
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.buffer = []
+        self.buffer_len = 0
+        self.closed = False
+
+    def write(self, stream, text):
+        self.buffer.append((stream, text))
+        self.buffer_len += len(text)
+
+        if self.buffer_len > 65536:
+            self.flush()
+
+    def flush(self):
+        chunks = []
+
+        for stream, text in self.buffer:
+            if chunks and chunks[-1][0] == stream:
+                chunks[-1][1].append(text)
+            else:
+                chunks.append((stream, [text]))
+
+        self.buffer = []
+        self.buffer_len = 0
+
+        for stream, texts in chunks:
+            self.send({stream: "".join(texts)})
+
+    def send(self, reply):
+        # The client is gone, the run is completed without output
+        if self.closed:
+            return
+
+        try:
+            self.conn.sendall((json.dumps(reply) + "\n").encode())
+        except OSError:
+            self.closed = True
+
+
+class socket_writer:
+    """
+    File like object for sys.stdout/sys.stderr during a run
+    """
+
+    def __init__(self, channel, stream):
+        self.channel = channel
+        self.stream = stream
+
+    def write(self, text):
+        self.channel.write(self.stream, text)
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+def get_cmd_line_args():
+    """!
+    Parse the command line arguments of the server.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Compile server keeping veripy warm between runs. Runs are \
+            requested with veripy_client.py, which takes the same arguments as \
+            veripy.py."
+    )
+
+    # -socket option
+    parser.add_argument(
+        "-s",
+        "--socket",
+        default=get_socket_path(),
+        dest="socket_path",
+        help="Unix socket path of the server. Defaults to \
+            $VERIPY_SERVER_SOCKET, or veripy_server.sock in $XDG_RUNTIME_DIR or \
+            in a private per-user directory of the temp directory.",
+    )
+
+    # -jobs option
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        type=int,
+        default=os.cpu_count(),
+        dest="jobs",
+        help="Maximum number of runs served concurrently. Defaults to the number \
+            of CPUs.",
+    )
+
+    # -package_cache option
+    parser.add_argument(
+        "-pkc",
+        "--package_cache",
+        default=os.environ.get("VERIPY_PACKAGE_CACHE", ""),
+        dest="package_cache_dir",
+        help="Package store directory of the runs that do not set \
+            $VERIPY_PACKAGE_CACHE. Defaults to $VERIPY_PACKAGE_CACHE or the \
+            socket path with a .package_cache suffix.",
+    )
+
+    # -stop option
+    parser.add_argument(
+        "-stop",
+        "--stop",
+        action="store_true",
+        default=False,
+        dest="stop",
+        help="Option to stop the server running on the socket.",
+    )
+
+    return parser.parse_args()
+
+
+def run_veripy(veripy, code, request, conn, tables, package_cache_dir):
+    """!
+    Run veripy in the server process with the arguments, directory and
+    environment of the client.
+
+    @param veripy veripy.py module
+    @param code Compiled veripy.py script
+    @param request Python dict object with the arguments, directory and environment of the run
+    @param conn Client connection to stream the output to
+    @param tables List of module level tables to reset before the run
+    @param package_cache_dir Package store directory shared by the runs
+    """
+
+    saved_cwd = os.getcwd()
+    saved_env = dict(os.environ)
+    saved_stdout = sys.stdout
+    saved_stderr = sys.stderr
+
+    channel = socket_channel(conn)
+    stdout = socket_writer(channel, "out")
+    stderr = socket_writer(channel, "err")
+
+    # memgen configures logging at import time, its handler follows the run
+    handlers = [
+        handler
+        for handler in logging.getLogger().handlers
+        if isinstance(handler, logging.StreamHandler)
+        and handler.stream is sys.__stderr__
+    ]
+
+    rc = 1
+
+    try:
+        sys.stdout = stdout
+        sys.stderr = stderr
+
+        for handler in handlers:
+            handler.setStream(stderr)
+
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+        os.environ.setdefault("VERIPY_PACKAGE_CACHE", package_cache_dir)
+
+        rc = veripy.run_main(code, request["args"], tables)
+    except OSError as e:
+        print("\nError: " + str(e), file=sys.stderr)
+    finally:
+        for handler in handlers:
+            handler.setStream(sys.__stderr__)
+
+        sys.stdout = saved_stdout
+        sys.stderr = saved_stderr
+        os.environ.clear()
+        os.environ.update(saved_env)
+        os.chdir(saved_cwd)
+
+    channel.flush()
+    channel.send({"rc": rc})
+
+    return rc
+
+
+def is_private_dir(dir_path):
+    """!
+    Check that a directory is owned by the current user and that no other user
+    can access it.
+
+    @param dir_path Directory path
+    """
+
+    st = os.stat(dir_path)
+
+    return st.st_uid == os.getuid() and not st.st_mode & (stat.S_IRWXG | stat.S_IRWXO)
+
+
+def get_peer_uid(conn):
+    """!
+    Get the user id of the process at the other end of a unix socket connection,
+    or None when the platform does not report it (the peer is then refused).
+
+    @param conn Client connection
+    """
+
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+
+    creds = conn.getsockopt(
+        socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+    )
+    pid, uid, gid = struct.unpack("3i", creds)
+
+    return uid
+
+
+def read_request(conn):
+    """!
+    Read the request of a client, or None if it sends none in time or an
+    invalid one.
+
+    @param conn Client connection
+    """
+
+    conn.settimeout(REQUEST_TIMEOUT)
+
+    try:
+        line = conn.makefile("rb").readline()
+        request = json.loads(line)
+    except (OSError, ValueError):
+        return None
+
+    conn.settimeout(None)
+
+    if not isinstance(request, dict):
+        return None
+
+    return request
+
+
+def reap_workers(workers, block=False):
+    """!
+    Reap the worker processes that completed their run.
+
+    @param workers Set of the pids of the running workers
+    @param block Boolean to wait for at least one worker to complete
+    """
+
+    while workers:
+        pid, status = os.waitpid(-1, 0 if block else os.WNOHANG)
+
+        if pid == 0:
+            break
+
+        workers.discard(pid)
+        block = False
+
+
+def serve(socket_path, jobs=1, package_cache_dir=""):
+    """!
+    Serve veripy runs on a unix socket until a stop request. Each run is done by
+    a worker process forked from the warm server.
+
+    @param socket_path Unix socket path of the server
+    @param jobs Maximum number of runs served concurrently
+    @param package_cache_dir Package store directory shared by the runs
+    """
+
+    # The runs are done as the user of the server, so only it may connect
+    socket_dir = os.path.dirname(os.path.abspath(socket_path))
+    os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+
+    if not is_private_dir(socket_dir):
+        print(
+            "Error: The directory of the socket "
+            + socket_path
+            + " is to be owned by the current user and private to it"
+        )
+        sys.exit(1)
+
+    # The parsed packages of a worker end with it, the next ones read them back
+    if package_cache_dir == "":
+        package_cache_dir = socket_path + ".package_cache"
+
+    package_cache_dir = os.path.abspath(package_cache_dir)
+    os.makedirs(package_cache_dir, mode=0o700, exist_ok=True)
+
+    if os.path.lexists(socket_path):
+        if not is_own_socket(socket_path):
+            print("Error: " + socket_path + " is not a socket of the current user")
+            sys.exit(1)
+
+        if send_request(socket_path, {"ping": True}) is not None:
+            print("Error: veripy server already running on " + socket_path)
+            sys.exit(1)
+
+        os.unlink(socket_path)
+
+    # Warm up the modules, regular expressions and grammar once
+    import veripy
+
+    code = veripy.load_main_code()
+    tables = veripy.snapshot_module_tables()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    saved_umask = os.umask(0o177)
+
+    try:
+        server.bind(socket_path)
+    finally:
+        os.umask(saved_umask)
+
+    os.chmod(socket_path, 0o600)
+    server.listen(16)
+
+    print("### veripy server listening on " + socket_path)
+    sys.stdout.flush()
+
+    workers = set()
+
+    try:
+        while True:
+            conn, addr = server.accept()
+            reap_workers(workers)
+
+            with conn:
+                if get_peer_uid(conn) != os.getuid():
+                    continue
+
+                request = read_request(conn)
+
+                if request is None:
+                    continue
+                elif request.get("ping"):
+                    conn.sendall((json.dumps({"rc": 0}) + "\n").encode())
+                elif request.get("stop"):
+                    conn.sendall((json.dumps({"rc": 0}) + "\n").encode())
+                    break
+                else:
+                    while len(workers) >= jobs:
+                        reap_workers(workers, block=True)
+
+                    pid = os.fork()
+
+                    if pid == 0:
+                        # The worker inherits the warm state copy-on-write and
+                        # its changes to it end with the run
+                        try:
+                            server.close()
+                            run_veripy(
+                                veripy, code, request, conn, tables, package_cache_dir
+                            )
+                        finally:
+                            sys.stdout.flush()
+                            os._exit(0)
+
+                    workers.add(pid)
+    finally:
+        server.close()
+        os.unlink(socket_path)
+
+        while workers:
+            reap_workers(workers, block=True)
+
+    print("### veripy server stopped")
+
+
+def main():
+    """
+    Main function to run in script.
+    """
+
+    cmdline = get_cmd_line_args()
+
+    if cmdline.stop:
+        if send_request(cmdline.socket_path, {"stop": True}) is None:
+            print("Error: No veripy server running on " + cmdline.socket_path)
+            sys.exit(1)
+
+        sys.exit(0)
+
+    serve(cmdline.socket_path, max(1, cmdline.jobs), cmdline.package_cache_dir)
+
+
+if __name__ == "__main__":
+    main()